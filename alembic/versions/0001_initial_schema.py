@@ -0,0 +1,239 @@
+"""initial schema
+
+Baseline of the schema previously created by ``Base.metadata.create_all``.
+Databases bootstrapped that way should be stamped at this revision
+(``alembic stamp 0001``) before upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# create_all stores enum member names, not values
+user_role = postgresql.ENUM(
+    'STUDENT', 'CREATOR', 'BUSINESS', 'CLUB', 'FACULTY', 'ADMIN',
+    name='userrole', create_type=False,
+)
+college = postgresql.ENUM(
+    'COE', 'CST', 'CMSS', 'CLDS', 'GLOBAL',
+    name='college', create_type=False,
+)
+community_type = postgresql.ENUM(
+    'ACADEMIC', 'INTEREST', 'OFFICIAL',
+    name='communitytype', create_type=False,
+)
+post_type = postgresql.ENUM(
+    'OPPORTUNITY', 'IDEA', 'LINK', 'EVENT', 'CASUAL', 'MARKETPLACE',
+    'LOST_AND_FOUND', 'NEWS', 'CLUB', 'BOUNTY',
+    name='posttype', create_type=False,
+)
+post_status = postgresql.ENUM(
+    'ACTIVE', 'PENDING', 'SOLD',
+    name='poststatus', create_type=False,
+)
+notification_type = postgresql.ENUM(
+    'REPLY', 'SYSTEM', 'REMINDER', 'UPVOTE', 'NEW_POST', 'COMMUNITY_INVITE',
+    name='notificationtype', create_type=False,
+)
+
+ENUMS = (user_role, college, community_type, post_type, post_status, notification_type)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for enum in ENUMS:
+        enum.create(bind, checkfirst=True)
+
+    op.create_table(
+        'users',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('display_name', sa.String(length=100), nullable=False),
+        sa.Column('role', user_role, nullable=True),
+        sa.Column('avatar_url', sa.String(length=500), nullable=True),
+        sa.Column('college', college, nullable=False),
+        sa.Column('department', sa.String(length=100), nullable=False),
+        sa.Column('bio', sa.String(length=500), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=False),
+        sa.Column('interests', sa.JSON(), nullable=False),
+        sa.Column('hashed_password', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'communities',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.String(length=500), nullable=False),
+        sa.Column('member_count', sa.Integer(), nullable=False),
+        sa.Column('type', community_type, nullable=False),
+        sa.Column('image_url', sa.String(length=500), nullable=True),
+        sa.Column('college', sa.String(length=50), nullable=True),
+        sa.Column('creator_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_communities_name', 'communities', ['name'], unique=True)
+
+    op.create_table(
+        'community_members',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('community_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('is_admin', sa.Boolean(), nullable=False),
+        sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['community_id'], ['communities.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('community_id', 'user_id', name='unique_community_member'),
+    )
+
+    op.create_table(
+        'posts',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', post_type, nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('image_url', sa.String(length=500), nullable=True),
+        sa.Column('author_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('tags', postgresql.JSONB(), nullable=False),
+        sa.Column('target_colleges', postgresql.JSONB(), nullable=False),
+        sa.Column('target_departments', postgresql.JSONB(), nullable=False),
+        sa.Column('event_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('event_time', sa.String(length=50), nullable=True),
+        sa.Column('location', sa.String(length=200), nullable=True),
+        sa.Column('price', sa.String(length=50), nullable=True),
+        sa.Column('condition', sa.String(length=100), nullable=True),
+        sa.Column('contact_info', sa.String(length=200), nullable=True),
+        sa.Column('link_url', sa.String(length=500), nullable=True),
+        sa.Column('deadline', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('views', sa.Integer(), nullable=False),
+        sa.Column('saves_count', sa.Integer(), nullable=False),
+        sa.Column('comments_count', sa.Integer(), nullable=False),
+        sa.Column('upvotes_count', sa.Integer(), nullable=False),
+        sa.Column('community_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('status', post_status, nullable=False),
+        sa.Column('is_pinned', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['author_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['community_id'], ['communities.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'post_upvotes',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('post_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('post_id', 'user_id', name='unique_post_upvote'),
+    )
+
+    op.create_table(
+        'post_saves',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('post_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('post_id', 'user_id', name='unique_post_save'),
+    )
+
+    op.create_table(
+        'comments',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('post_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('author_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('parent_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id']),
+        sa.ForeignKeyConstraint(['author_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['parent_id'], ['comments.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'notifications',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', notification_type, nullable=False),
+        sa.Column('message', sa.String(length=500), nullable=False),
+        sa.Column('read', sa.Boolean(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('post_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('comment_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('community_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('meta', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id']),
+        sa.ForeignKeyConstraint(['comment_id'], ['comments.id']),
+        sa.ForeignKeyConstraint(['community_id'], ['communities.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', notification_type, nullable=False),
+        sa.Column('message', sa.String(length=500), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('post_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('comment_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('community_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('meta', sa.JSON(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_notification_outbox_created_at', 'notification_outbox', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_outbox_created_at', table_name='notification_outbox')
+    op.drop_table('notification_outbox')
+    op.drop_table('notifications')
+    op.drop_table('comments')
+    op.drop_table('post_saves')
+    op.drop_table('post_upvotes')
+    op.drop_table('posts')
+    op.drop_table('community_members')
+    op.drop_index('ix_communities_name', table_name='communities')
+    op.drop_table('communities')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_index('ix_users_username', table_name='users')
+    op.drop_table('users')
+
+    bind = op.get_bind()
+    for enum in reversed(ENUMS):
+        enum.drop(bind, checkfirst=True)
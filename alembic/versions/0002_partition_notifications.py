@@ -0,0 +1,122 @@
+"""partition notifications by month
+
+Rebuilds ``notifications`` as a table range-partitioned on ``created_at``
+with one partition per month plus a DEFAULT partition, and copies existing
+rows across. Later partitions are created ahead of time by
+``app.services.notification_partitions``.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 2
+
+COLUMNS = "id, type, message, read, user_id, post_id, comment_id, community_id, meta, created_at"
+
+
+def _add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def _create_month_partition(start: date) -> None:
+    end = _add_months(start, 1)
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS notifications_p{start:%Y_%m} "
+        f"PARTITION OF notifications FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Databases bootstrapped by create_all after this change already have a
+    # partitioned parent; only the partitions need to be added.
+    relkind = bind.execute(sa.text("SELECT relkind FROM pg_class WHERE oid = 'notifications'::regclass")).scalar()
+    already_partitioned = relkind == 'p'
+
+    if not already_partitioned:
+        op.execute("ALTER TABLE notifications RENAME TO notifications_legacy")
+        op.execute("ALTER TABLE notifications_legacy RENAME CONSTRAINT notifications_pkey TO notifications_legacy_pkey")
+
+        op.execute(
+            """
+            CREATE TABLE notifications (
+                id UUID NOT NULL,
+                type notificationtype NOT NULL,
+                message VARCHAR(500) NOT NULL,
+                read BOOLEAN NOT NULL DEFAULT false,
+                user_id UUID NOT NULL REFERENCES users (id),
+                post_id UUID REFERENCES posts (id),
+                comment_id UUID REFERENCES comments (id),
+                community_id UUID REFERENCES communities (id),
+                meta JSON,
+                created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+                CONSTRAINT notifications_pkey PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+            """
+        )
+        op.execute("CREATE INDEX IF NOT EXISTS ix_notifications_user_created ON notifications (user_id, created_at DESC)")
+
+    op.execute("CREATE TABLE IF NOT EXISTS notifications_default PARTITION OF notifications DEFAULT")
+
+    first_month = date.today().replace(day=1)
+    if not already_partitioned:
+        oldest = bind.execute(sa.text("SELECT min(created_at) FROM notifications_legacy")).scalar()
+        if oldest is not None:
+            first_month = min(first_month, oldest.date().replace(day=1))
+
+    month = first_month
+    last_month = _add_months(date.today().replace(day=1), MONTHS_AHEAD)
+    while month <= last_month:
+        _create_month_partition(month)
+        month = _add_months(month, 1)
+
+    if not already_partitioned:
+        op.execute(
+            f"INSERT INTO notifications ({COLUMNS}) "
+            f"SELECT id, type, message, coalesce(read, false), user_id, post_id, comment_id, community_id, meta, "
+            f"coalesce(created_at, now()) FROM notifications_legacy"
+        )
+        op.execute("DROP TABLE notifications_legacy")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_partitioned")
+    op.execute("ALTER TABLE notifications_partitioned RENAME CONSTRAINT notifications_pkey TO notifications_partitioned_pkey")
+    op.execute("ALTER INDEX ix_notifications_user_created RENAME TO ix_notifications_partitioned_user_created")
+
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            id UUID NOT NULL,
+            type notificationtype NOT NULL,
+            message VARCHAR(500) NOT NULL,
+            read BOOLEAN NOT NULL,
+            user_id UUID NOT NULL REFERENCES users (id),
+            post_id UUID REFERENCES posts (id),
+            comment_id UUID REFERENCES comments (id),
+            community_id UUID REFERENCES communities (id),
+            meta JSON,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT notifications_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_partitioned")
+    op.execute("DROP TABLE notifications_partitioned CASCADE")
@@ -0,0 +1,70 @@
+"""community notification fan-out jobs and per-member mute
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+fanout_status = postgresql.ENUM(
+    'PENDING', 'RUNNING', 'DONE', 'FAILED',
+    name='fanoutstatus', create_type=False,
+)
+notification_type = postgresql.ENUM(name='notificationtype', create_type=False)
+
+
+def upgrade() -> None:
+    fanout_status.create(op.get_bind(), checkfirst=True)
+
+    op.add_column(
+        'community_members',
+        sa.Column('notifications_muted', sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.create_index('ix_community_members_community_id_id', 'community_members', ['community_id', 'id'])
+
+    op.create_table(
+        'notification_fanouts',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', notification_type, nullable=False),
+        sa.Column('message', sa.String(length=500), nullable=False),
+        sa.Column('meta', sa.JSON(), nullable=True),
+        sa.Column('community_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('post_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('actor_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', fanout_status, nullable=False),
+        sa.Column('cursor', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('total_members', sa.Integer(), nullable=True),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('notified', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['community_id'], ['communities.id']),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['actor_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_notification_fanouts_post_id', 'notification_fanouts', ['post_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_fanouts_post_id', table_name='notification_fanouts')
+    op.drop_table('notification_fanouts')
+    op.drop_index('ix_community_members_community_id_id', table_name='community_members')
+    op.drop_column('community_members', 'notifications_muted')
+    fanout_status.drop(op.get_bind(), checkfirst=True)
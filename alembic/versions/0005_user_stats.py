@@ -0,0 +1,64 @@
+"""user stats
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('post_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('saved_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('upvotes_received', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+    # Reconciliation counts per user, and post deletion groups a post's
+    # comments by author
+    op.create_index('ix_posts_author_id', 'posts', ['author_id'])
+    op.create_index('ix_comments_author_id', 'comments', ['author_id'])
+    op.create_index('ix_comments_post_id', 'comments', ['post_id'])
+    op.create_index('ix_post_saves_user_id', 'post_saves', ['user_id'])
+
+    # Backfill from the source tables, only for users with any activity
+    op.execute(
+        """
+        INSERT INTO user_stats (user_id, post_count, comment_count, saved_count, upvotes_received)
+        SELECT u.id,
+               (SELECT count(*) FROM posts p WHERE p.author_id = u.id),
+               (SELECT count(*) FROM comments c WHERE c.author_id = u.id),
+               (SELECT count(*) FROM post_saves s WHERE s.user_id = u.id),
+               (SELECT count(*) FROM post_upvotes v JOIN posts p ON p.id = v.post_id WHERE p.author_id = u.id)
+        FROM users u
+        WHERE EXISTS (SELECT 1 FROM posts p WHERE p.author_id = u.id)
+           OR EXISTS (SELECT 1 FROM comments c WHERE c.author_id = u.id)
+           OR EXISTS (SELECT 1 FROM post_saves s WHERE s.user_id = u.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
+    op.drop_index('ix_post_saves_user_id', table_name='post_saves')
+    op.drop_index('ix_comments_post_id', table_name='comments')
+    op.drop_index('ix_comments_author_id', table_name='comments')
+    op.drop_index('ix_posts_author_id', table_name='posts')
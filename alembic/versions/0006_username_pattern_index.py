@@ -0,0 +1,32 @@
+"""username pattern index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The unique index uses the database collation, which can't serve
+    # LIKE 'prefix%'; text_pattern_ops compares bytewise and can
+    op.create_index(
+        'ix_users_username_pattern',
+        'users',
+        ['username'],
+        postgresql_ops={'username': 'text_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_username_pattern', table_name='users')
@@ -0,0 +1,37 @@
+"""ai usage
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_usage',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('requests', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('upstream_calls', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tokens', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('day', 'user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ai_usage')
@@ -0,0 +1,27 @@
+"""revoked_at clock timestamp
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # now() is the transaction start; the sync cursor needs the insert time
+    op.alter_column('revoked_tokens', 'revoked_at', server_default=sa.text('clock_timestamp()'))
+
+
+def downgrade() -> None:
+    op.alter_column('revoked_tokens', 'revoked_at', server_default=sa.text('now()'))
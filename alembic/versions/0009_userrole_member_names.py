@@ -0,0 +1,54 @@
+"""userrole member names
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# value -> member name; SQLAlchemy reads and writes the names
+ROLES = {
+    'Student': 'STUDENT',
+    'Creator': 'CREATOR',
+    'Business': 'BUSINESS',
+    'Club': 'CLUB',
+    'Faculty': 'FACULTY',
+    'Admin': 'ADMIN',
+}
+
+
+def _rename(mapping: dict) -> None:
+    # Databases created by 0001 before it was corrected have the values;
+    # those bootstrapped by create_all already have the names
+    for old, new in mapping.items():
+        op.execute(
+            f"""
+            DO $$ BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM pg_enum e JOIN pg_type t ON t.oid = e.enumtypid
+                    WHERE t.typname = 'userrole' AND e.enumlabel = '{old}'
+                ) THEN
+                    ALTER TYPE userrole RENAME VALUE '{old}' TO '{new}';
+                END IF;
+            END $$
+            """
+        )
+
+
+def upgrade() -> None:
+    _rename(ROLES)
+
+
+def downgrade() -> None:
+    # 0001 now creates the names too, so there is nothing to restore
+    pass
@@ -0,0 +1,53 @@
+"""notification fk cascade
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# column -> referenced table
+FOREIGN_KEYS = {'post_id': 'posts', 'comment_id': 'comments'}
+
+
+# The names Postgres picked vary (0002 built the table while the legacy
+# one still held the default names), so look the constraints up by column
+FK_NAMES_SQL = sa.text(
+    """
+    SELECT c.conname FROM pg_constraint c
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY (c.conkey)
+    WHERE c.conrelid = 'notifications'::regclass AND c.contype = 'f' AND a.attname = :column
+    """
+)
+
+
+def _recreate(on_delete: str) -> None:
+    bind = op.get_bind()
+    # Constraints on the partitioned parent apply to every partition
+    for column, table in FOREIGN_KEYS.items():
+        for name in bind.execute(FK_NAMES_SQL, {"column": column}).scalars().all():
+            op.execute(f'ALTER TABLE notifications DROP CONSTRAINT "{name}"')
+        op.execute(
+            f"ALTER TABLE notifications ADD CONSTRAINT notifications_{column}_fkey "
+            f"FOREIGN KEY ({column}) REFERENCES {table} (id){on_delete}"
+        )
+
+
+def upgrade() -> None:
+    # Notifications about a deleted post or comment go with it, as fan-outs do
+    _recreate(" ON DELETE CASCADE")
+
+
+def downgrade() -> None:
+    _recreate("")
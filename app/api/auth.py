@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
+from typing import Optional
 import uuid
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..crud.user import get_user_crud
-from ..core.security import create_access_token, create_refresh_token, verify_token
-from ..schemas.auth import LoginRequest, RegisterRequest, Token
-from ..schemas.user import UserResponse, UserCreate
+from ..core.security import create_access_token, create_refresh_token, build_token_data
+from ..schemas.auth import LoginRequest, RegisterRequest, Token, AvailabilityResponse
+from ..schemas.user import UserResponse
 from ..core.errors import APIError, ValidationError, UnauthorizedError
 from ..models.user import UserRole
-from .dependencies import get_current_user
+from ..services.auth import AuthService
+from ..services.availability import availability_service
+from .dependencies import get_current_user, get_token_payload
 
 router = APIRouter()
 security = HTTPBearer()
@@ -22,45 +25,19 @@ async def register(
     register_data: RegisterRequest,
     db: AsyncSession = Depends(get_db),
 ):
-    user_crud = get_user_crud()
-    
-    # Check if email already exists
-    existing_user = await user_crud.get_by_email(db, register_data.email)
-    if existing_user:
+    try:
+        user = await AuthService.create_account(
+            db, register_data, role=register_data.role or UserRole.STUDENT
+        )
+    except ValueError:
         raise APIError(
             code="EMAIL_EXISTS",
             message="Email already registered",
             status_code=status.HTTP_409_CONFLICT,
         )
     
-    # Generate username from email
-    username = register_data.email.split("@")[0]
-    
-    # Check if username exists
-    existing_username = await user_crud.get_by_username(db, username)
-    if existing_username:
-        # Add random suffix
-        import random
-        username = f"{username}{random.randint(100, 999)}"
-    
-    # Create user
-    user_create = UserCreate(
-        username=username,
-        email=register_data.email,
-        display_name=register_data.display_name,
-        password=register_data.password,
-        college=register_data.college,
-        department=register_data.department,
-        interests=register_data.interests or [],
-        role=register_data.role if register_data.role else UserRole.STUDENT,
-        avatar_url=register_data.avatar_url,
-        bio=register_data.bio,
-    )
-    
-    user = await user_crud.create(db, obj_in=user_create)
-    
     # Create tokens
-    token_data = {"user_id": str(user.id), "username": user.username}
+    token_data = build_token_data(user)
     access_token = create_access_token(token_data)
     refresh_token = create_refresh_token(token_data)
     
@@ -71,6 +48,25 @@ async def register(
     }
 
 
+# Check whether a username and/or email is free, e.g. while the user types
+@router.get("/availability", response_model=AvailabilityResponse)
+async def check_availability(
+    username: Optional[str] = Query(None, min_length=1, max_length=50),
+    email: Optional[str] = Query(None, min_length=3, max_length=255),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if not username and not email:
+        raise ValidationError("Provide a username or an email to check")
+    
+    response = {}
+    if username:
+        response["username"] = await availability_service.check_username(db, username)
+    if email:
+        response["email"] = await availability_service.check_email(db, email)
+    
+    return response
+
+
 @router.post("/login", response_model=Token)
 async def login(
     login_data: LoginRequest,
@@ -92,7 +88,7 @@ async def login(
         raise ValidationError("Email domain not allowed")
     
     # Create tokens
-    token_data = {"user_id": str(user.id), "username": user.username}
+    token_data = build_token_data(user)
     access_token = create_access_token(token_data)
     refresh_token = create_refresh_token(token_data)
     
@@ -111,41 +107,24 @@ async def refresh_token(
     refresh_token: str,
     db: AsyncSession = Depends(get_db),
 ):
-    # Verify refresh token
-    payload = verify_token(refresh_token, token_type="refresh")
-    if not payload:
-        raise UnauthorizedError("Invalid refresh token")
-    
-    user_crud = get_user_crud()
-    user = await user_crud.get(db, uuid.UUID(payload["user_id"]))
-    
-    if not user:
-        raise UnauthorizedError("User not found")
-    
-    # Create new tokens
-    token_data = {"user_id": str(user.id), "username": user.username}
-    new_access_token = create_access_token(token_data)
-    new_refresh_token = create_refresh_token(token_data)
-    
-    return {
-        "access_token": new_access_token,
-        "refresh_token": new_refresh_token,
-        "token_type": "bearer",
-    }
+    # Rotate: the presented refresh token is revoked and a reused one
+    # revokes the whole login
+    return await AuthService.rotate_refresh_token(db, refresh_token)
 
 
 @router.post("/logout")
 async def logout(
-    current_user: dict = Depends(get_current_user),
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db),
 ):
-    # In a real app, you might want to blacklist the token
+    await AuthService.logout(db, payload)
     return {"message": "Successfully logged out"}
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_me(
     current_user: dict = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_crud = get_user_crud()
     user = await user_crud.get(db, uuid.UUID(current_user["id"]))
@@ -5,7 +5,8 @@ from uuid import UUID
 from fastapi import Path, Depends, HTTPException
 import uuid
 
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..core.serialization import serialize
 from ..crud.community import get_community_crud
 from ..crud.post import get_post_crud
 from ..schemas.community import CommunityCreate, CommunityUpdate, CommunityResponse
@@ -25,7 +26,7 @@ async def get_communities(
     type_filter: Optional[CommunityType] = Query(None),
     query: Optional[str] = Query(None),
     current_user: Optional[dict] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_id = uuid.UUID(current_user["id"]) if current_user else None
     
@@ -48,7 +49,7 @@ async def get_communities(
                 community.is_member = detailed.is_member
                 community.is_admin = detailed.is_admin
     
-    return communities
+    return serialize(List[CommunityResponse], communities)
 
 # Create a new community
 @router.post("/", response_model=CommunityResponse, status_code=status.HTTP_201_CREATED)
@@ -87,7 +88,7 @@ async def create_community(
 async def get_community(
     community_id: str = Path(...),
     current_user: Optional[dict] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_id = uuid.UUID(current_user["id"]) if current_user else None
     
@@ -145,13 +146,55 @@ async def leave_community(
 
     return result
 
+# Mute notifications from a community
+@router.post("/{community_id}/mute")
+async def mute_community(
+    community_id: UUID = Path(...),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    community_crud = get_community_crud()
+
+    member = await community_crud.set_notifications_muted(
+        db,
+        community_id=community_id,
+        user_id=UUID(current_user["id"]),
+        muted=True,
+    )
+
+    if not member:
+        raise NotFoundError("Community membership", str(community_id))
+
+    return {"muted": True}
+
+# Unmute notifications from a community
+@router.post("/{community_id}/unmute")
+async def unmute_community(
+    community_id: UUID = Path(...),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    community_crud = get_community_crud()
+
+    member = await community_crud.set_notifications_muted(
+        db,
+        community_id=community_id,
+        user_id=UUID(current_user["id"]),
+        muted=False,
+    )
+
+    if not member:
+        raise NotFoundError("Community membership", str(community_id))
+
+    return {"muted": False}
+
 # Get members of a community
 @router.get("/{community_id}/members", response_model=List[CommunityMemberOut])
 async def get_community_members(
     community_id: UUID = Path(...),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     community_crud = get_community_crud()
 
@@ -166,15 +209,15 @@ async def get_community_members(
         limit=limit,
     )
 
-    return [
-        CommunityMemberOut(
-            user_id=m.user.id,
-            username=m.user.username,
-            is_admin=m.is_admin,
-            joined_at=m.joined_at,
-        )
+    return serialize(List[CommunityMemberOut], [
+        {
+            "user_id": m.user.id,
+            "username": m.user.username,
+            "is_admin": m.is_admin,
+            "joined_at": m.joined_at,
+        }
         for m in members
-    ]
+    ])
 
 
 # Get posts within a community
@@ -184,7 +227,7 @@ async def get_community_posts(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     current_user: Optional[dict] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     # In a real implementation, posts would be tagged with community_id
     # For now, we'll filter by community name in tags
@@ -213,7 +256,7 @@ async def get_community_posts(
         query=community.name,
     )
 
-    return {
+    return serialize(PostListResponse, {
         "data": posts,
         "pagination": {
             "page": (skip // limit) + 1,
@@ -222,4 +265,4 @@ async def get_community_posts(
             "hasNext": skip + limit < total,
             "hasPrev": skip > 0,
         }
-    }
\ No newline at end of file
+    })
\ No newline at end of file
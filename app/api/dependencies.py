@@ -4,38 +4,52 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
+from ..config import settings
 from ..database import get_db
 from ..core.security import verify_token
+from ..core.principal import principal_cache, principal_from_claims, principal_from_user
 from ..crud.user import get_user_crud
+from ..services.ai_usage import ai_usage_meter
 from ..core.errors import UnauthorizedError, ForbiddenError
 
 security = HTTPBearer()
 
 
-async def get_current_user(
+async def get_token_payload(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
 ) -> dict:
-    token = credentials.credentials
-    
-    payload = verify_token(token)
+    payload = verify_token(credentials.credentials)
     if not payload:
         raise UnauthorizedError("Invalid authentication credentials")
     
-    user_crud = get_user_crud()
-    user = await user_crud.get(db, uuid.UUID(payload["user_id"]))
+    return payload
+
+
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    # Tokens that carry the principal need no lookup at all
+    if settings.jwt_embed_principal:
+        principal = principal_from_claims(payload)
+        if principal:
+            return principal
+    
+    user_id = payload["user_id"]
+    principal = principal_cache.get(user_id)
     
-    if not user:
-        raise UnauthorizedError("User not found")
+    if principal is None:
+        user_crud = get_user_crud()
+        user = await user_crud.get(db, uuid.UUID(user_id))
+        
+        if not user:
+            raise UnauthorizedError("User not found")
+        
+        principal = principal_from_user(user)
+        principal_cache.set(user_id, principal)
     
-    return {
-        "id": str(user.id),
-        "username": user.username,
-        "email": user.email,
-        "role": user.role,
-        "college": user.college,
-        "department": user.department,
-    }
+    # Copy so handlers can't mutate the cached entry
+    return dict(principal)
 
 
 async def get_current_active_user(
@@ -49,4 +63,14 @@ async def require_admin(
 ) -> dict:
     if current_user["role"] != "Admin":
         raise ForbiddenError("Admin privileges required")
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def require_ai_quota(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    # Rejected here, before the body reaches the model; calls made while
+    # serving the request are charged to this user
+    await ai_usage_meter.admit(db, current_user["id"])
+    return current_user
@@ -1,36 +1,233 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+import time
+from typing import Awaitable, TypeVar
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.gemini import (
     RefinePostRequest,
     RefinePostResponse,
     GenerateTitleRequest,
     GenerateTitleResponse,
+    BatchDraft,
+    BatchRefineRequest,
+    AIUsageReport,
 )
+from app.config import settings
+from app.database import get_db
+from app.api.dependencies import get_current_user, require_admin, require_ai_quota
+from app.core.errors import APIError, ValidationError
+from app.services.ai_usage import ai_usage_meter
 from app.services.gemini_service import gemini_service
 
 router = APIRouter()
 
+T = TypeVar("T")
+
+# How often a pending AI call checks whether its client is still there
+DISCONNECT_POLL_INTERVAL = 0.25
+
+# nginx's "client closed request"; nobody reads it, but it shows in logs
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+async def run_cancellable(request: Request, awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable``, cancelling it (and its upstream call) if the
+    client disconnects first."""
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 # Refine post content endpoint
 @router.post("/refine", response_model=RefinePostResponse)
-async def refine_post(payload: RefinePostRequest):
+async def refine_post(
+    payload: RefinePostRequest,
+    request: Request,
+    current_user: dict = Depends(require_ai_quota),
+):
     try:
-        refined = await gemini_service.refine_post_content(
+        refined = await run_cancellable(request, gemini_service.refine_post_content(
             text=payload.text,
             post_type=payload.post_type,
-        )
+        ))
         return {"refined_text": refined}
 
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except APIError:
+        raise
     except Exception:
         raise HTTPException(status_code=500, detail="Post refinement failed")
 
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+# Stream refined post content as server-sent events
+@router.post("/refine/stream")
+async def refine_post_stream(
+    payload: RefinePostRequest,
+    current_user: dict = Depends(require_ai_quota),
+):
+    async def events():
+        # Each send waits for the client to take the previous one, so a slow
+        # reader slows how fast we pull from the model; when the client
+        # disconnects Starlette cancels this generator and the stream with it
+        parts = []
+        try:
+            async for piece in gemini_service.stream_refine(payload.text, payload.post_type):
+                parts.append(piece)
+                yield sse_event("token", {"text": piece})
+        except APIError as e:
+            # Headers are already sent, so errors travel as an event
+            yield sse_event("error", {"code": e.code, "message": e.message})
+            return
+
+        yield sse_event("done", {"refined_text": "".join(parts).strip()})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _process_draft(index: int, draft: BatchDraft, payload: BatchRefineRequest) -> dict:
+    result = {"index": index, "id": draft.id}
+
+    jobs = {}
+    if payload.refine:
+        jobs["refined_text"] = gemini_service.refine_post_content(text=draft.text, post_type=draft.post_type)
+    if payload.title:
+        jobs["title"] = gemini_service.generate_post_title(content=draft.text, post_type=draft.post_type)
+
+    # Refine and title for one draft run side by side
+    outputs = await asyncio.gather(*jobs.values(), return_exceptions=True)
+
+    errors = []
+    for field, output in zip(jobs, outputs):
+        if isinstance(output, Exception):
+            errors.append(f"{field}: {output}")
+            result[field] = None
+        else:
+            result[field] = output
+
+    result["error"] = "; ".join(errors) or None
+    return result
+
+
+# Refine and title many drafts at once, streaming NDJSON results as each finishes
+@router.post("/batch")
+async def refine_batch(
+    payload: BatchRefineRequest,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    if len(payload.drafts) > settings.ai_batch_max_drafts:
+        raise ValidationError(f"At most {settings.ai_batch_max_drafts} drafts per batch")
+
+    # Every draft counts against the daily request budget
+    await ai_usage_meter.admit(db, current_user["id"], requests=len(payload.drafts))
+
+    slots = asyncio.Semaphore(settings.ai_batch_concurrency)
+
+    async def bounded(index: int, draft: BatchDraft) -> dict:
+        async with slots:
+            try:
+                return await _process_draft(index, draft, payload)
+            except Exception as e:
+                return {"index": index, "id": draft.id, "error": str(e)}
+
+    async def results():
+        start = time.perf_counter()
+        tasks = [asyncio.ensure_future(bounded(i, d)) for i, d in enumerate(payload.drafts)]
+        failed = 0
+        try:
+            # Completion order, so the slowest draft holds back nothing but itself
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                failed += result["error"] is not None
+                yield json.dumps(result) + "\n"
+        finally:
+            # Client went away: stop the remaining drafts and their upstream calls
+            for task in tasks:
+                task.cancel()
+
+        yield json.dumps({
+            "done": True,
+            "succeeded": len(tasks) - failed,
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000),
+        }) + "\n"
+
+    return StreamingResponse(
+        results(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # Generate post title endpoint
 @router.post("/title", response_model=GenerateTitleResponse)
-async def generate_title(payload: GenerateTitleRequest):
+async def generate_title(
+    payload: GenerateTitleRequest,
+    request: Request,
+    current_user: dict = Depends(require_ai_quota),
+):
     try:
-        title = await gemini_service.generate_post_title(
+        title = await run_cancellable(request, gemini_service.generate_post_title(
             content=payload.content,
             post_type=payload.post_type,
-        )
+        ))
         return {"title": title}
 
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except APIError:
+        raise
     except Exception:
         raise HTTPException(status_code=500, detail="Title generation failed")
+
+# Hit ratio and upstream time saved by the AI result cache
+@router.get("/cache")
+async def get_cache_stats(current_user: dict = Depends(require_admin)):
+    stats = {"inflight": gemini_service.inflight.stats()}
+    if gemini_service.cache is None:
+        return {"enabled": False, **stats}
+
+    return {"enabled": True, **gemini_service.cache.stats(), **stats}
+
+# Health of the AI dependency: circuit state, outcome counters, latency histograms
+@router.get("/metrics")
+async def get_ai_metrics(current_user: dict = Depends(require_admin)):
+    return {
+        "enabled": gemini_service.enabled,
+        "circuit": gemini_service.breaker.stats(),
+        **gemini_service.metrics.snapshot(),
+        "inflight": gemini_service.inflight.stats(),
+        "cache": gemini_service.cache.stats() if gemini_service.cache is not None else None,
+    }
+
+# The caller's AI usage today against their budget; admins also see the global budget
+@router.get("/usage", response_model=AIUsageReport)
+async def get_ai_usage(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    report = {"user": await ai_usage_meter.report(db, current_user["id"])}
+    if current_user["role"] == "Admin":
+        report["global_usage"] = ai_usage_meter.global_report()
+    return report
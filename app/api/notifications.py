@@ -3,7 +3,8 @@ from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..core.serialization import serialize
 from ..crud.notification import get_notification_crud
 from ..schemas.notification import NotificationResponse
 from ..core.errors import NotFoundError, ForbiddenError
@@ -18,7 +19,7 @@ async def get_notifications(
     limit: int = Query(50, ge=1, le=100),
     unread_only: bool = Query(False),
     current_user: dict = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     notification_crud = get_notification_crud()
     notifications = await notification_crud.get_user_notifications(
@@ -29,7 +30,7 @@ async def get_notifications(
         unread_only=unread_only,
     )
 
-    return notifications
+    return serialize(List[NotificationResponse], notifications)
 
 # Mark a notification as read
 @router.post("/{notification_id}/read")
@@ -7,16 +7,20 @@ from sqlalchemy.orm import selectinload
 import uuid
 from uuid import UUID
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..crud.post import get_post_crud
 from ..crud.comment import get_comment_crud
 from ..crud.notification import get_notification_crud
+from ..crud.community import get_community_crud
 from ..schemas.post import PostCreate, PostUpdate, PostResponse, PostListResponse
 from ..schemas.comment import CommentCreate, CommentResponse
+from ..schemas.notification import NotificationFanoutResponse
 from ..models import Post
 from ..models.post import PostType, College
 from ..models.notification import NotificationType
 from ..core.errors import NotFoundError, ForbiddenError
+from ..core.serialization import serialize
+from ..services.notification_dispatcher import notification_dispatcher
 from .dependencies import get_current_user, get_current_active_user
 
 router = APIRouter()
@@ -32,7 +36,7 @@ async def get_posts(
     query: Optional[str] = Query(None),
     only_pinned: bool = Query(False),
     current_user: Optional[dict] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_id = uuid.UUID(current_user["id"]) if current_user else None
     
@@ -52,7 +56,7 @@ async def get_posts(
     # Get total count for pagination
     total = len(posts)  # Simplified - in real app, get count from query
     
-    return {
+    return serialize(PostListResponse, {
         "data": posts,
         "pagination": {
             "page": (skip // limit) + 1,
@@ -61,21 +65,21 @@ async def get_posts(
             "hasNext": len(posts) == limit,
             "hasPrev": skip > 0,
         }
-    }
+    })
 
 # Get trending posts
 @router.get("/trending", response_model=List[PostResponse])
 async def get_trending_posts(
     limit: int = Query(10, ge=1, le=50),
     current_user: Optional[dict] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_id = uuid.UUID(current_user["id"]) if current_user else None
     
     post_crud = get_post_crud()
     posts = await post_crud.get_trending(db, limit=limit, user_id=user_id)
     
-    return posts
+    return serialize(List[PostResponse], posts)
 
 
 
@@ -89,13 +93,50 @@ async def create_post(
 ):
     post_crud = get_post_crud()
 
+    # Only members can post into a community
+    if post_data.community_id:
+        community_crud = get_community_crud()
+        community = await community_crud.get(db, post_data.community_id)
+        if not community:
+            raise NotFoundError("Community", str(post_data.community_id))
+
+        member = await community_crud.get_member(
+            db, community_id=community.id, user_id=UUID(current_user["id"])
+        )
+        if not member:
+            raise ForbiddenError("You must be a member of the community to post in it")
+
     # 1️ Create the post with the current user as author
     post = await post_crud.create_with_author(
         db,
         obj_in=post_data,
         author_id=UUID(current_user["id"]),
+        commit=False,
     )
 
+    # Notify the community's members in the background; the fan-out job
+    # commits atomically with the post
+    if post_data.community_id:
+        notification_crud = get_notification_crud()
+        await notification_crud.enqueue_fanout(
+            db,
+            community_id=community.id,
+            actor_id=UUID(current_user["id"]),
+            type=NotificationType.NEW_POST,
+            message=f"New post in {community.name}: {post.title}"[:500],
+            post_id=post.id,
+            meta={"author_id": current_user["id"]},
+        )
+
+    try:
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    if post_data.community_id:
+        notification_dispatcher.wake()
+
     # 2 Refresh the post to populate scalar fields
     await db.refresh(post)
 
@@ -107,14 +148,33 @@ async def create_post(
     )
     post = result.scalar_one()
 
-    # 4 Convert to Pydantic response using model_validate
-    response = PostResponse.model_validate(post)
+    # 4 Validate and render in one pass; is_saved / is_upvoted default to False
+    return serialize(PostResponse, post, status_code=status.HTTP_201_CREATED)
+
+
+# Get delivery progress of the community notification fan-out for a post
+@router.get("/{post_id}/fanout", response_model=NotificationFanoutResponse)
+async def get_post_fanout(
+    post_id: UUID = Path(...),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    post_crud = get_post_crud()
+    post = await post_crud.get(db, post_id)
+
+    if not post:
+        raise NotFoundError("Post", str(post_id))
+
+    if str(post.author_id) != current_user["id"] and current_user["role"] != "Admin":
+        raise ForbiddenError("You can only view fan-out progress for your own posts")
 
-    # 5 Populate dynamic user-specific fields
-    response.is_saved = False    # implement your logic if needed
-    response.is_upvoted = False  # implement your logic if needed
+    notification_crud = get_notification_crud()
+    fanout = await notification_crud.get_fanout_for_post(db, post_id)
 
-    return response
+    if not fanout:
+        raise NotFoundError("Fan-out for post", str(post_id))
+
+    return fanout
 
 
 # GET a single post by ID
@@ -257,13 +317,15 @@ async def create_comment(
         obj_in=comment_data,
         author_id=uuid.UUID(current_user["id"]),
         post_id=post_id,
+        commit=False,
     )
 
-    full_comment = await comment_crud.get_with_replies(db, comment.id)
-
-    if str(post.author_id) != current_user["id"]:
+    # Queue the notification in the comment's transaction; the dispatcher
+    # delivers it after the response has gone out
+    notify = str(post.author_id) != current_user["id"]
+    if notify:
         notification_crud = get_notification_crud()
-        await notification_crud.create_notification(
+        await notification_crud.enqueue_notification(
             db,
             user_id=post.author_id,
             type=NotificationType.REPLY,
@@ -273,6 +335,17 @@ async def create_comment(
             meta={"commenter_id": current_user["id"]},
         )
 
+    try:
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    if notify:
+        notification_dispatcher.wake()
+
+    full_comment = await comment_crud.get_with_replies(db, comment.id)
+
     return full_comment
 
 # Get comments for a post
@@ -282,7 +355,7 @@ async def get_post_comments(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     current_user: Optional[dict] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     post_crud = get_post_crud()
     post = await post_crud.get(db, post_id)
@@ -298,7 +371,7 @@ async def get_post_comments(
         limit=limit,
     )
     
-    return comments
+    return serialize(List[CommentResponse], comments)
 
 
 # Get saved posts for current user
@@ -307,7 +380,7 @@ async def get_saved_posts(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     current_user: dict = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_id = uuid.UUID(current_user["id"])
 
@@ -320,4 +393,15 @@ async def get_saved_posts(
     )
 
     # Get total count for pagination
-    total = await post_crud.get_count_filtered(db, saved_by=user_id)
\ No newline at end of file
+    total = await post_crud.get_count_filtered(db, saved_by=user_id)
+
+    return serialize(PostListResponse, {
+        "data": posts,
+        "pagination": {
+            "page": (skip // limit) + 1,
+            "limit": limit,
+            "total": total,
+            "hasNext": skip + limit < total,
+            "hasPrev": skip > 0,
+        }
+    })
@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, Query, Path, status
+from fastapi import APIRouter, Depends, File, Query, Path, UploadFile, status
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..core.serialization import serialize
 from ..crud.user import get_user_crud
 from ..crud.post import get_post_crud
-from ..schemas.user import UserResponse, UserUpdate, UserStats
+from ..crud.stats import get_user_stats_crud
+from ..config import settings
+from ..schemas.user import UserResponse, UserUpdate, UserStats, ProvisioningReport
 from ..schemas.post import PostResponse, PostListResponse
-from ..core.errors import NotFoundError, ForbiddenError
-from .dependencies import get_current_user, get_current_active_user
+from ..core.errors import NotFoundError, ForbiddenError, ValidationError
+from ..core.principal import invalidate_principal
+from ..services.provisioning import parse_csv, user_provisioner
+from .dependencies import get_current_user, get_current_active_user, require_admin
 
 router = APIRouter()
 
@@ -17,7 +22,7 @@ router = APIRouter()
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
     current_user: dict = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_crud = get_user_crud()
     user = await user_crud.get(db, uuid.UUID(current_user["id"]))
@@ -42,14 +47,38 @@ async def update_current_user(
     
     updated_user = await user_crud.update(db, db_obj=user, obj_in=user_data)
     
+    # Drop the cached principal so the next request sees the new profile
+    invalidate_principal(current_user["id"])
+    
     return updated_user
 
+# Bulk-create users from a CSV (admin only)
+@router.post("/provision", response_model=ProvisioningReport)
+async def provision_users(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    content = await file.read(settings.max_upload_size + 1)
+    if len(content) > settings.max_upload_size:
+        raise ValidationError("CSV file is too large")
+    
+    try:
+        rows, errors = parse_csv(content.decode("utf-8-sig"), max_rows=settings.provisioning_max_rows)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValidationError(f"Invalid CSV: {e}")
+    
+    report = await user_provisioner.provision(db, rows)
+    report["errors"] = errors + report["errors"]
+    
+    return report
+
 # Get another user's profile by username
 @router.get("/{username}", response_model=UserResponse)
 async def get_user_profile(
     username: str = Path(...),
     current_user: Optional[dict] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_crud = get_user_crud()
     user = await user_crud.get_by_username(db, username)
@@ -66,7 +95,7 @@ async def get_user_posts(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     current_user: Optional[dict] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_crud = get_user_crud()
     user = await user_crud.get_by_username(db, username)
@@ -87,7 +116,7 @@ async def get_user_posts(
     
     total = len(posts)  # Simplified
     
-    return {
+    return serialize(PostListResponse, {
         "data": posts,
         "pagination": {
             "page": (skip // limit) + 1,
@@ -96,7 +125,7 @@ async def get_user_posts(
             "hasNext": len(posts) == limit,
             "hasPrev": skip > 0,
         }
-    }
+    })
 
 # Get saved posts of the current user
 @router.get("/me/saved", response_model=PostListResponse)
@@ -104,7 +133,7 @@ async def get_saved_posts(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     current_user: dict = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user_id = uuid.UUID(current_user["id"])
     
@@ -119,7 +148,7 @@ async def get_saved_posts(
     
     total = len(posts)  # Simplified
     
-    return {
+    return serialize(PostListResponse, {
         "data": posts,
         "pagination": {
             "page": (skip // limit) + 1,
@@ -128,41 +157,25 @@ async def get_saved_posts(
             "hasNext": len(posts) == limit,
             "hasPrev": skip > 0,
         }
-    }
+    })
 
 # Get user statistics
 @router.get("/me/stats", response_model=UserStats)
 async def get_user_stats(
     current_user: dict = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    # This would be more efficient with a dedicated query
-    # For now, we'll count from existing data
-    
-    post_crud = get_post_crud()
-    user_posts = await post_crud.get_multi_filtered(
-        db,
-        author_id=uuid.UUID(current_user["id"]),
-        limit=1000,  # Large limit to get all
-    )
-    
-    saved_posts = await post_crud.get_multi_filtered(
-        db,
-        saved_by=uuid.UUID(current_user["id"]),
-        limit=1000,
-    )
-    
-    # Calculate stats
-    post_count = len(user_posts)
-    upvote_count = sum(post.upvotes_count for post in user_posts)
-    saved_count = len(saved_posts)
+    # Counters are maintained on write, so this is a primary-key lookup
+    user_stats_crud = get_user_stats_crud()
+    stats = await user_stats_crud.get(db, uuid.UUID(current_user["id"]))
     
-    # Comment count would need separate query
-    comment_count = 0  # Placeholder
+    if not stats:
+        # No activity recorded yet
+        return {"post_count": 0, "upvote_count": 0, "comment_count": 0, "saved_count": 0}
     
     return {
-        "post_count": post_count,
-        "upvote_count": upvote_count,
-        "comment_count": comment_count,
-        "saved_count": saved_count,
-    }
\ No newline at end of file
+        "post_count": stats.post_count,
+        "upvote_count": stats.upvotes_received,
+        "comment_count": stats.comment_count,
+        "saved_count": stats.saved_count,
+    }
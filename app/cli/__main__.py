@@ -0,0 +1,25 @@
+import argparse
+import sys
+
+from . import bench_auth, bench_serialization, calibrate_argon2, provision, reconcile_user_stats, startup_profile
+
+# Each module exposes register(subparsers) and sets ``func`` on its parser
+COMMANDS = [calibrate_argon2, bench_auth, reconcile_user_stats, provision, startup_profile, bench_serialization]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Relay operational commands",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command in COMMANDS:
+        command.register(subparsers)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Measure the CPU cost of authenticating a request.
+
+Times the work ``get_current_user`` does before any database access:
+verifying the bearer token (``core.security.verify_token``) and, for
+tokens issued with ``jwt_embed_principal``, building the principal from
+its claims. Each scenario runs with the decoded-token cache bypassed
+(every request pays for ``jwt.decode``) and with it warm (``--sessions``
+distinct tokens presented round-robin, as a busy worker sees them).
+"""
+import json
+import math
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+from ..config import settings
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _make_tokens(sessions: int, embed_principal: bool) -> List[str]:
+    from ..core.security import create_access_token
+
+    tokens = []
+    for i in range(sessions):
+        data = {
+            "user_id": str(uuid.uuid4()),
+            "username": f"bench_user_{i}",
+            "fam": str(uuid.uuid4()),
+        }
+        if embed_principal:
+            data.update({
+                "email": f"bench_user_{i}@example.com",
+                "display_name": f"Bench User {i}",
+                "role": "student",
+                "college": "engineering",
+                "department": "Computer Science",
+            })
+        tokens.append(create_access_token(data))
+    return tokens
+
+
+def _time_requests(authenticate: Callable[[str], Any], tokens: List[str], requests: int) -> Dict[str, float]:
+    samples = []
+    start = time.perf_counter()
+    for i in range(requests):
+        token = tokens[i % len(tokens)]
+        t0 = time.perf_counter_ns()
+        authenticate(token)
+        samples.append((time.perf_counter_ns() - t0) / 1000)
+    wall = time.perf_counter() - start
+
+    return {
+        "mean_us": sum(samples) / len(samples),
+        "p50_us": _percentile(samples, 50),
+        "p99_us": _percentile(samples, 99),
+        "requests_per_s": requests / wall if wall else 0.0,
+    }
+
+
+def benchmark(requests: int, sessions: int, embed_principal: bool) -> Dict[str, Any]:
+    from ..core import security
+    from ..core.principal import principal_from_claims
+
+    tokens = _make_tokens(sessions, embed_principal)
+
+    def authenticate(token: str):
+        payload = security.verify_token(token)
+        if payload is None:
+            raise RuntimeError("benchmark token failed verification")
+        return principal_from_claims(payload)
+
+    def uncached(token: str):
+        security.token_cache.clear()
+        return authenticate(token)
+
+    # Warm up both paths (imports, first decode)
+    for token in tokens:
+        authenticate(token)
+
+    before = _time_requests(uncached, tokens, requests)
+
+    security.token_cache.clear()
+    for token in tokens:
+        authenticate(token)
+    after = _time_requests(authenticate, tokens, requests)
+
+    return {
+        "requests": requests,
+        "sessions": sessions,
+        "embed_principal": embed_principal,
+        "uncached": before,
+        "cached": after,
+        "speedup": before["mean_us"] / after["mean_us"] if after["mean_us"] else 0.0,
+    }
+
+
+def run(args) -> int:
+    if settings.jwt_decode_cache_size < args.sessions:
+        print(
+            f"warning: jwt_decode_cache_size={settings.jwt_decode_cache_size} is smaller than "
+            f"--sessions={args.sessions}; the cached run will mostly miss"
+        )
+
+    results = [
+        benchmark(args.requests, args.sessions, embed_principal=False),
+        benchmark(args.requests, args.sessions, embed_principal=True),
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    header = f"{'scenario':<18} {'mode':<9} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'req/s':>11}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        scenario = "embedded principal" if r["embed_principal"] else "claims only"
+        for mode in ("uncached", "cached"):
+            m = r[mode]
+            print(
+                f"{scenario:<18} {mode:<9} {m['mean_us']:>9.1f} {m['p50_us']:>9.1f} "
+                f"{m['p99_us']:>9.1f} {m['requests_per_s']:>11.0f}"
+            )
+        print(f"{'':<18} speedup   {r['speedup']:>8.1f}x")
+    return 0
+
+
+def register(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "bench-auth",
+        help="measure per-request token verification overhead",
+        description=__doc__,
+    )
+    parser.add_argument("--requests", type=int, default=20000, help="authenticated requests to simulate")
+    parser.add_argument("--sessions", type=int, default=100, help="distinct tokens presented round-robin")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.set_defaults(func=run)
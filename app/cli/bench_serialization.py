@@ -0,0 +1,180 @@
+"""Measure the CPU cost of rendering a page of posts to JSON.
+
+Builds ``--page-size`` posts shaped like the ORM rows the list endpoints
+return and renders them as a ``PostListResponse`` three ways:
+
+  default      FastAPI's own handling of a returned object: validate
+               against ``response_model``, ``jsonable_encoder``, then
+               ``json.dumps`` in ``JSONResponse``
+  prevalidated the same, after the route already built the model itself
+               (what ``create_post`` did with ``model_validate``), so every
+               post is validated twice
+  fast         ``core.serialization.serialize``: one validation and the
+               JSON rendering both inside pydantic-core
+
+and checks that all three produce the same document.
+"""
+import asyncio
+import json
+import math
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+
+from ..models.enums import College, PostStatus, PostType
+from ..models.user import UserRole
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _make_posts(count: int) -> List[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    author = SimpleNamespace(
+        id=uuid.uuid4(),
+        username="bench_user",
+        display_name="Bench User",
+        role=UserRole.STUDENT,
+        avatar_url="https://example.com/avatar.png",
+        college=College.CST,
+        department="Computer Science",
+        bio="Builds things on weekends.",
+        is_verified=True,
+        interests=["robotics", "music"],
+        created_at=now - timedelta(days=90),
+        updated_at=None,
+    )
+
+    posts = []
+    for i in range(count):
+        posts.append(SimpleNamespace(
+            id=uuid.uuid4(),
+            title=f"Study group for algorithms, session {i}",
+            content="Meeting in the library to work through past papers. " * 4,
+            type=PostType.EVENT,
+            tags=["study", "algorithms", "library"],
+            target_colleges=[College.CST, College.COE],
+            target_departments=["Computer Science"],
+            image_url=None,
+            author=author,
+            stats=SimpleNamespace(views=120 + i, comments=i % 7, upvotes=i % 13),
+            status=PostStatus.ACTIVE,
+            is_pinned=False,
+            is_saved=False,
+            is_upvoted=False,
+            community_id=None,
+            event_date=(now + timedelta(days=3)).date(),
+            event_time="16:00",
+            location="Main library, room 2",
+            price=None,
+            condition=None,
+            contact_info=None,
+            link_url=None,
+            deadline=None,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+        ))
+    return posts
+
+
+async def _time_pages(render: Callable[[], Awaitable[bytes]], pages: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(pages):
+        t0 = time.perf_counter_ns()
+        await render()
+        samples.append((time.perf_counter_ns() - t0) / 1000)
+
+    return {
+        "mean_us": sum(samples) / len(samples),
+        "p50_us": _percentile(samples, 50),
+        "p99_us": _percentile(samples, 99),
+    }
+
+
+async def benchmark(pages: int, page_size: int) -> Dict[str, Any]:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    from ..config import settings
+    from ..core.serialization import serialize
+    from ..schemas.post import PostListResponse, PostResponse
+
+    posts = _make_posts(page_size)
+    pagination = {"page": 1, "limit": page_size, "total": page_size * 10, "hasNext": True, "hasPrev": False}
+    field = create_response_field(name="Response_bench", type_=PostListResponse)
+
+    async def default() -> bytes:
+        content = await serialize_response(field=field, response_content={"data": posts, "pagination": pagination})
+        return JSONResponse(content).body
+
+    async def prevalidated() -> bytes:
+        data = [PostResponse.model_validate(p) for p in posts]
+        content = await serialize_response(field=field, response_content={"data": data, "pagination": pagination})
+        return JSONResponse(content).body
+
+    async def fast() -> bytes:
+        return serialize(PostListResponse, {"data": posts, "pagination": pagination}).body
+
+    enabled, settings.fast_json_responses = settings.fast_json_responses, True
+    try:
+        documents = [json.loads(await render()) for render in (default, prevalidated, fast)]
+        if any(doc != documents[0] for doc in documents[1:]):
+            raise RuntimeError("serialization paths rendered different documents")
+
+        # Warm up (adapter build, first validation)
+        for render in (default, prevalidated, fast):
+            for _ in range(min(pages, 20)):
+                await render()
+
+        results = {
+            "pages": pages,
+            "page_size": page_size,
+            "bytes": len(await fast()),
+            "default": await _time_pages(default, pages),
+            "prevalidated": await _time_pages(prevalidated, pages),
+            "fast": await _time_pages(fast, pages),
+        }
+    finally:
+        settings.fast_json_responses = enabled
+
+    fast_us = results["fast"]["mean_us"]
+    for path in ("default", "prevalidated"):
+        results[path]["saved_us"] = results[path]["mean_us"] - fast_us
+        results[path]["speedup"] = results[path]["mean_us"] / fast_us if fast_us else 0.0
+    return results
+
+
+def run(args) -> int:
+    results = asyncio.run(benchmark(args.pages, args.page_size))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{results['page_size']} posts per page, {results['bytes']} bytes, {results['pages']} pages")
+    header = f"{'path':<13} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'saved us':>9} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for path in ("default", "prevalidated", "fast"):
+        m = results[path]
+        saved = f"{m['saved_us']:>9.0f} {m['speedup']:>7.1f}x" if "saved_us" in m else ""
+        print(f"{path:<13} {m['mean_us']:>9.0f} {m['p50_us']:>9.0f} {m['p99_us']:>9.0f} {saved}")
+    return 0
+
+
+def register(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "bench-serialization",
+        help="measure the CPU cost of rendering a post list page",
+        description=__doc__,
+    )
+    parser.add_argument("--pages", type=int, default=500, help="pages to render per path")
+    parser.add_argument("--page-size", type=int, default=100, help="posts per page")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.set_defaults(func=run)
@@ -0,0 +1,165 @@
+"""Benchmark Argon2 parameters on this host and recommend settings.
+
+Every combination of the requested time/memory/parallelism costs is timed
+single-threaded (hash and verify) and under ``--concurrency`` parallel
+verifications, which is what a login burst looks like to one worker. The
+strongest combination whose loaded p95 stays within ``--target-p95-ms``
+and whose peak memory fits ``--memory-budget-mb`` is recommended.
+
+Stored hashes that don't match the configured parameters are rehashed on
+the user's next login (see ``core.security.password_needs_rehash``).
+"""
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+
+SAMPLE_PASSWORD = "correct horse battery staple"
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def benchmark(
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+    samples: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    from passlib.hash import argon2
+
+    hasher = argon2.using(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        digest_size=32,
+        salt_len=16,
+    )
+
+    hash_ms = [_timed(hasher.hash, SAMPLE_PASSWORD) for _ in range(samples)]
+    stored = hasher.hash(SAMPLE_PASSWORD)
+    verify_ms = [_timed(hasher.verify, SAMPLE_PASSWORD, stored) for _ in range(samples)]
+
+    # Saturate a pool the size of password_hash_workers
+    tasks = samples * concurrency
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        loaded_ms = list(pool.map(lambda _: _timed(hasher.verify, SAMPLE_PASSWORD, stored), range(tasks)))
+        wall = time.perf_counter() - start
+
+    return {
+        "time_cost": time_cost,
+        "memory_cost": memory_cost,
+        "parallelism": parallelism,
+        "hash_p50_ms": _percentile(hash_ms, 50),
+        "hash_p95_ms": _percentile(hash_ms, 95),
+        "verify_p50_ms": _percentile(verify_ms, 50),
+        "verify_p95_ms": _percentile(verify_ms, 95),
+        "loaded_p95_ms": _percentile(loaded_ms, 95),
+        "throughput_per_s": tasks / wall if wall else 0.0,
+        "peak_memory_mb": memory_cost * concurrency / 1024,
+    }
+
+
+def recommend(
+    results: List[Dict[str, Any]], target_p95_ms: float, memory_budget_mb: float
+) -> Optional[Dict[str, Any]]:
+    feasible = [
+        r for r in results
+        if r["loaded_p95_ms"] <= target_p95_ms and r["peak_memory_mb"] <= memory_budget_mb
+    ]
+    if not feasible:
+        return None
+
+    # Strongest = most memory-hard work per guess, then fewest lanes
+    return max(
+        feasible,
+        key=lambda r: (r["memory_cost"] * r["time_cost"], r["memory_cost"], -r["parallelism"]),
+    )
+
+
+def _print_table(results: List[Dict[str, Any]], target_p95_ms: float, memory_budget_mb: float) -> None:
+    header = f"{'t':>2} {'m(MiB)':>7} {'p':>2} {'hash p95':>9} {'verify p95':>11} {'loaded p95':>11} {'ops/s':>8} {'mem(MiB)':>9}  ok"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        ok = r["loaded_p95_ms"] <= target_p95_ms and r["peak_memory_mb"] <= memory_budget_mb
+        print(
+            f"{r['time_cost']:>2} {r['memory_cost'] / 1024:>7.0f} {r['parallelism']:>2} "
+            f"{r['hash_p95_ms']:>9.1f} {r['verify_p95_ms']:>11.1f} {r['loaded_p95_ms']:>11.1f} "
+            f"{r['throughput_per_s']:>8.1f} {r['peak_memory_mb']:>9.0f}  {'yes' if ok else 'no'}"
+        )
+
+
+def run(args) -> int:
+    results = []
+    for time_cost in _int_list(args.time_costs):
+        for memory_cost in _int_list(args.memory_costs):
+            for parallelism in _int_list(args.parallelism):
+                results.append(benchmark(time_cost, memory_cost, parallelism, args.samples, args.concurrency))
+
+    best = recommend(results, args.target_p95_ms, args.memory_budget_mb)
+
+    if args.json:
+        print(json.dumps({"results": results, "recommended": best}, indent=2))
+        return 0 if best else 1
+
+    _print_table(results, args.target_p95_ms, args.memory_budget_mb)
+    print()
+
+    current = (settings.argon2_time_cost, settings.argon2_memory_cost, settings.argon2_parallelism)
+    print(f"Current settings: time_cost={current[0]} memory_cost={current[1]} parallelism={current[2]}")
+
+    if not best:
+        print(
+            f"No combination meets p95 <= {args.target_p95_ms:.0f} ms at concurrency {args.concurrency} "
+            f"within {args.memory_budget_mb:.0f} MiB; lower the concurrency or relax the target."
+        )
+        return 1
+
+    print("Recommended settings:")
+    print(f"  ARGON2_TIME_COST={best['time_cost']}")
+    print(f"  ARGON2_MEMORY_COST={best['memory_cost']}")
+    print(f"  ARGON2_PARALLELISM={best['parallelism']}")
+    print(f"  PASSWORD_HASH_WORKERS={args.concurrency}")
+    print(
+        f"Expected: {best['loaded_p95_ms']:.0f} ms p95 under load, "
+        f"{best['throughput_per_s']:.1f} verifications/s per worker process"
+    )
+    if (best["time_cost"], best["memory_cost"], best["parallelism"]) != current:
+        print("Existing hashes will be upgraded on each user's next successful login.")
+    return 0
+
+
+def register(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "calibrate-argon2",
+        help="benchmark Argon2 parameters and recommend settings",
+        description=__doc__,
+    )
+    parser.add_argument("--time-costs", default="1,2,3", help="comma-separated time_cost values")
+    parser.add_argument("--memory-costs", default="19456,32768,65536,131072", help="comma-separated memory_cost values (KiB)")
+    parser.add_argument("--parallelism", default="1,2", help="comma-separated parallelism values")
+    parser.add_argument("--samples", type=int, default=10, help="timed operations per combination")
+    parser.add_argument("--concurrency", type=int, default=settings.password_hash_workers, help="parallel verifications (password_hash_workers)")
+    parser.add_argument("--target-p95-ms", type=float, default=250.0, help="latency budget for a verification under load")
+    parser.add_argument("--memory-budget-mb", type=float, default=512.0, help="memory available for concurrent hashes")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.set_defaults(func=run)
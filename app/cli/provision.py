@@ -0,0 +1,88 @@
+"""Create user accounts in bulk from a CSV file.
+
+Required columns: email, display_name, college, department. Optional:
+username (derived from the email when empty), password (a temporary one is
+generated when empty) and role. Existing emails are skipped, so a partially
+processed file can simply be re-run.
+
+The report is written as CSV with one line per input row, including the
+generated temporary passwords; store it accordingly.
+"""
+import asyncio
+import csv
+import sys
+import time
+
+from ..config import settings
+
+REPORT_COLUMNS = ("line", "status", "email", "username", "temporary_password", "message")
+
+
+async def provision(text: str, batch_size: int, hash_processes: int) -> dict:
+    from ..database import AsyncSessionLocal, engine
+    from ..services.provisioning import UserProvisioner, parse_csv
+
+    rows, errors = parse_csv(text)
+    provisioner = UserProvisioner(batch_size=batch_size, hash_processes=hash_processes)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            report = await provisioner.provision(db, rows)
+    finally:
+        provisioner.shutdown()
+        await engine.dispose()
+
+    report["errors"] = errors + report["errors"]
+    return report
+
+
+def _write_report(report: dict, out) -> None:
+    writer = csv.DictWriter(out, fieldnames=REPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+
+    entries = (
+        [dict(e, status="created") for e in report["created"]]
+        + [dict(e, status="skipped") for e in report["skipped"]]
+        + [dict(e, status="error") for e in report["errors"]]
+    )
+    for entry in sorted(entries, key=lambda e: e["line"]):
+        writer.writerow(entry)
+
+
+def run(args) -> int:
+    with open(args.csv, encoding="utf-8-sig", newline="") as f:
+        text = f.read()
+
+    start = time.perf_counter()
+    try:
+        report = asyncio.run(provision(text, args.batch_size, args.hash_processes))
+    except ValueError as e:
+        print(f"Invalid CSV: {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+
+    if args.output == "-":
+        _write_report(report, sys.stdout)
+    else:
+        with open(args.output, "w", newline="") as out:
+            _write_report(report, out)
+
+    print(
+        f"Created {len(report['created'])}, skipped {len(report['skipped'])}, "
+        f"rejected {len(report['errors'])} in {elapsed:.1f}s",
+        file=sys.stderr,
+    )
+    return 1 if report["errors"] else 0
+
+
+def register(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "provision",
+        help="create user accounts in bulk from a CSV file",
+        description=__doc__,
+    )
+    parser.add_argument("csv", help="path to the provisioning CSV")
+    parser.add_argument("--output", default="-", help="where to write the report CSV (default: stdout)")
+    parser.add_argument("--batch-size", type=int, default=settings.provisioning_batch_size, help="users per transaction")
+    parser.add_argument("--hash-processes", type=int, default=settings.provisioning_hash_processes, help="parallel Argon2 processes")
+    parser.set_defaults(func=run)
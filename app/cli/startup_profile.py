@@ -0,0 +1,142 @@
+"""Profile worker startup: how long importing the app takes, and where.
+
+Imports ``--module`` (``app.main`` by default, which also builds the app and
+its routes) in fresh interpreters under ``-X importtime`` and reports the
+median of ``--runs`` runs: total import time, the top-level packages and
+the individual modules with the largest cumulative and self times. It also
+lists heavy optional dependencies that should load on first use but were
+imported at startup, and exits non-zero when there are any, so it can
+guard cold starts in CI.
+"""
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Loaded on first use; importing any of these at startup is a regression
+LAZY_MODULES = ("google.generativeai", "passlib.context", "redis.asyncio", "argon2")
+
+_CHILD = (
+    "import sys, time; start = time.perf_counter(); "
+    "__import__(sys.argv[1]); print(time.perf_counter() - start)"
+)
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self us, cumulative us) for each ``-X importtime`` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        rows.append((module, depth, int(fields[0]), int(fields[1])))
+    return rows
+
+
+def _profile_once(module: str) -> Dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD, module],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = _parse_importtime(result.stderr)
+    # Self times add up without double counting nested imports
+    packages: Dict[str, int] = {}
+    for name, _, self_us, _ in rows:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    return {
+        "wall_s": float(result.stdout.strip().splitlines()[-1]),
+        "modules": {name: (self_us, cumulative) for name, _, self_us, cumulative in rows},
+        "packages": packages,
+    }
+
+
+def profile(module: str, runs: int) -> Dict[str, Any]:
+    samples = [_profile_once(module) for _ in range(runs)]
+
+    def median_of(key: str, name: str, index: int = None) -> float:
+        values = []
+        for sample in samples:
+            value = sample[key].get(name)
+            if value is not None:
+                values.append(value[index] if index is not None else value)
+        return statistics.median(values) if values else 0
+
+    modules = set().union(*(s["modules"] for s in samples))
+    packages = set().union(*(s["packages"] for s in samples))
+
+    return {
+        "module": module,
+        "runs": runs,
+        "wall_ms": statistics.median(s["wall_s"] for s in samples) * 1000,
+        "modules_imported": len(modules),
+        "packages": {p: median_of("packages", p) / 1000 for p in packages},
+        "cumulative_ms": {m: median_of("modules", m, 1) / 1000 for m in modules},
+        "self_ms": {m: median_of("modules", m, 0) / 1000 for m in modules},
+        "eager_lazy_modules": sorted(m for m in LAZY_MODULES if m in modules),
+    }
+
+
+def _top(values: Dict[str, float], n: int) -> List[Tuple[str, float]]:
+    return sorted(values.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+def run(args) -> int:
+    results = profile(args.module, args.runs)
+    failed = 1 if results["eager_lazy_modules"] else 0
+
+    if args.json:
+        print(json.dumps({
+            **{k: v for k, v in results.items() if k not in ("cumulative_ms", "self_ms")},
+            "top_cumulative_ms": dict(_top(results["cumulative_ms"], args.top)),
+            "top_self_ms": dict(_top(results["self_ms"], args.top)),
+        }, indent=2))
+        return failed
+
+    print(
+        f"import {results['module']}: {results['wall_ms']:.0f} ms "
+        f"(median of {results['runs']}), {results['modules_imported']} modules"
+    )
+
+    for title, values in (
+        ("by top-level package, self", results["packages"]),
+        ("by module, cumulative", results["cumulative_ms"]),
+        ("by module, self", results["self_ms"]),
+    ):
+        print(f"\n{title}")
+        for name, ms in _top(values, args.top):
+            print(f"  {ms:>8.1f} ms  {name}")
+
+    if failed:
+        print("\nimported at startup but meant to load on first use:")
+        for name in results["eager_lazy_modules"]:
+            print(f"  {name}")
+    return failed
+
+
+def register(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "startup-profile",
+        help="show where worker startup time goes",
+        description=__doc__,
+    )
+    parser.add_argument("--module", default="app.main", help="module a worker imports at boot")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to sample; the median is shown")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.set_defaults(func=run)
@@ -1,8 +1,12 @@
-from .security import create_access_token, create_refresh_token, verify_token, get_password_hash, verify_password
+from .security import (
+    create_access_token, create_refresh_token, verify_token, get_password_hash, verify_password, build_token_data,
+    hash_password_async, verify_password_async,
+)
 from .errors import APIError, ValidationError, NotFoundError, UnauthorizedError, ForbiddenError
 
 __all__ = [
     "create_access_token", "create_refresh_token", "verify_token",
-    "get_password_hash", "verify_password", 
+    "get_password_hash", "verify_password", "build_token_data",
+    "hash_password_async", "verify_password_async",
     "APIError", "ValidationError", "NotFoundError", "UnauthorizedError", "ForbiddenError"
 ]
\ No newline at end of file
@@ -0,0 +1,88 @@
+import enum
+import time
+from typing import Optional
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"        # calls go through
+    OPEN = "open"            # calls are refused until reset_timeout passes
+    HALF_OPEN = "half_open"  # one probe call decides whether to close again
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for a remote dependency.
+
+    ``failure_threshold`` failed calls in a row open the circuit; a call
+    that succeeds but takes longer than ``slow_call_threshold`` counts as a
+    failure too. While open, ``allow()`` is False so callers can use their
+    fallback immediately instead of waiting on a sick dependency. After
+    ``reset_timeout`` a single probe is let through: success closes the
+    circuit, failure re-opens it.
+
+    Not thread-safe; it is meant to be used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call_threshold: Optional[float] = None,
+        reset_timeout: float = 30.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = CircuitState.HALF_OPEN
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+
+        return True
+
+    def record_success(self, latency: float) -> None:
+        if self.slow_call_threshold is not None and latency > self.slow_call_threshold:
+            self.record_failure()
+            return
+
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.state = CircuitState.CLOSED
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.consecutive_failures += 1
+
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                self.times_opened += 1
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def record_abandoned(self) -> None:
+        """The call was cancelled by its caller; it tells us nothing."""
+        self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "open_for_seconds": round(time.monotonic() - self.opened_at, 1) if self.opened_at else None,
+        }
@@ -2,6 +2,7 @@ from uuid import UUID
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from typing import Any, Dict, List, Optional, Union
 import logging
 from datetime import datetime
@@ -61,6 +62,16 @@ class ForbiddenError(APIError):
         )
 
 
+class QuotaExceededError(APIError):
+    def __init__(self, message: str, details: Optional[List[Dict[str, Any]]] = None):
+        super().__init__(
+            code="QUOTA_EXCEEDED",
+            message=message,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            details=details,
+        )
+
+
 async def api_error_handler(request: Request, exc: APIError):
     logger.error(f"API Error: {exc.code} - {exc.message}")
     
@@ -100,6 +111,24 @@ async def validation_error_handler(request: Request, exc: RequestValidationError
     )
 
 
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # No connection within the lane's budget: shed the request rather than queue it
+    logger.warning(f"Database pool exhausted: {exc}")
+    
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+        content={
+            "error": {
+                "code": "DB_BUSY",
+                "message": "The service is busy, please retry",
+                "details": [],
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+            }
+        },
+    )
+
+
 async def generic_exception_handler(request: Request, exc: Exception):
     logger.exception(f"Unhandled exception: {exc}")
     
@@ -118,4 +147,5 @@ async def generic_exception_handler(request: Request, exc: Exception):
 def setup_exception_handlers(app: FastAPI):
     app.add_exception_handler(APIError, api_error_handler)
     app.add_exception_handler(RequestValidationError, validation_error_handler)
+    app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
     app.add_exception_handler(Exception, generic_exception_handler)
\ No newline at end of file
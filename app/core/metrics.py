@@ -0,0 +1,76 @@
+import bisect
+from typing import Dict, Optional, Sequence
+
+# Upper bounds in seconds; the last bucket is open-ended
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed buckets, cheap enough to
+    update on every call. Percentiles are estimated from bucket bounds.
+
+    Not thread-safe; it is meant to be used from the event loop only.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``pct``th percentile."""
+        if not self.count:
+            return None
+
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{b:g}" for b in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean_seconds": self.sum / self.count if self.count else None,
+            "p50_seconds": self.percentile(50),
+            "p95_seconds": self.percentile(95),
+            "p99_seconds": self.percentile(99),
+            "max_seconds": self.max if self.count else None,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class Metrics:
+    """Named histograms and counters for one dependency."""
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        if name not in self.histograms:
+            self.histograms[name] = LatencyHistogram()
+        return self.histograms[name]
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.histogram(name).observe(seconds)
+
+    def incr(self, name: str, by: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + by
+
+    def snapshot(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "latency": {name: h.snapshot() for name, h in self.histograms.items()},
+        }
@@ -0,0 +1,46 @@
+from typing import Any, Dict, Optional
+
+from ..config import settings
+from .cache import TTLCache
+
+# Fields of the ``current_user`` dict handed to route handlers
+PRINCIPAL_FIELDS = ("id", "username", "email", "display_name", "role", "college", "department")
+
+# Per-worker cache of principals keyed by user id. Entries written by
+# another worker can be stale for at most ``principal_cache_ttl`` seconds.
+principal_cache = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+)
+
+
+def _value(v: Any) -> Any:
+    return v.value if hasattr(v, "value") else v
+
+
+def principal_from_user(user) -> Dict[str, Any]:
+    return {
+        "id": str(user.id),
+        "username": user.username,
+        "email": user.email,
+        "display_name": user.display_name,
+        "role": _value(user.role),
+        "college": _value(user.college),
+        "department": user.department,
+    }
+
+
+def principal_from_claims(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Tokens issued with jwt_embed_principal carry every field; older or
+    # slimmer tokens fall back to the cache/database.
+    if "role" not in payload or "college" not in payload:
+        return None
+
+    principal = {"id": payload["user_id"]}
+    for field in PRINCIPAL_FIELDS[1:]:
+        principal[field] = payload.get(field)
+    return principal
+
+
+def invalidate_principal(user_id: str) -> None:
+    principal_cache.invalidate(str(user_id))
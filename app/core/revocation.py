@@ -0,0 +1,43 @@
+import time
+from typing import Dict, Optional
+
+
+class RevocationList:
+    """In-process mirror of ``revoked_tokens`` so verify_token can reject a
+    revoked token with a set lookup instead of a database round trip.
+
+    Each entry remembers when the tokens it covers expire, so the mirror
+    only ever holds revocations that can still matter.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[str, float] = {}
+        self._families: Dict[str, float] = {}
+
+    def add_token(self, jti: str, expires_at: float) -> None:
+        self._tokens[jti] = max(expires_at, self._tokens.get(jti, 0))
+
+    def add_family(self, family: str, expires_at: float) -> None:
+        self._families[family] = max(expires_at, self._families.get(family, 0))
+
+    def is_revoked(self, jti: Optional[str], family: Optional[str] = None) -> bool:
+        return (jti is not None and jti in self._tokens) or (
+            family is not None and family in self._families
+        )
+
+    def prune(self) -> int:
+        now = time.time()
+        removed = 0
+        for entries in (self._tokens, self._families):
+            expired = [key for key, expires_at in entries.items() if expires_at <= now]
+            for key in expired:
+                del entries[key]
+            removed += len(expired)
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._families)
+
+
+# singleton instance, kept in sync by services.token_revocation
+revocation_list = RevocationList()
@@ -1,22 +1,43 @@
 # app/core/security.py - ARGON2 VERSION
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+from fastapi import status
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from ..config import settings
+from .cache import TTLCache
+from .errors import APIError
+from .principal import principal_from_user
+from .revocation import revocation_list
+import asyncio
+import hashlib
 import uuid
 
-# Use Argon2 instead of bcrypt - no 72-byte limit and more secure
-pwd_context = CryptContext(
-    schemes=["argon2"],  # Changed from "bcrypt" to "argon2"
-    deprecated="auto",
-    # Optional: Customize Argon2 parameters (good defaults already)
-    argon2__time_cost=2,      # Number of iterations
-    argon2__memory_cost=65536,  # 64MB memory usage
-    argon2__parallelism=2,    # Number of parallel threads
-    argon2__hash_len=32,      # Hash length in bytes
-    argon2__salt_len=16,      # Salt length in bytes
-)
+# Use Argon2 instead of bcrypt - no 72-byte limit and more secure.
+# Parameters come from settings; run `python -m app.cli calibrate-argon2`
+# to pick values for the current hardware. Built on first use so workers
+# don't pay for passlib at import time.
+_pwd_context = None
+
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(
+            schemes=["argon2"],  # Changed from "bcrypt" to "argon2"
+            deprecated="auto",
+            argon2__time_cost=settings.argon2_time_cost,      # Number of iterations
+            argon2__memory_cost=settings.argon2_memory_cost,  # KiB of memory per hash
+            argon2__parallelism=settings.argon2_parallelism,  # Number of parallel threads
+            argon2__hash_len=32,      # Hash length in bytes
+            argon2__salt_len=16,      # Salt length in bytes
+            # Pin time_cost so needs_update() flags hashes made with other values
+            argon2__min_rounds=settings.argon2_time_cost,
+            argon2__max_rounds=settings.argon2_time_cost,
+        )
+    return _pwd_context
 
 
 def get_password_hash(password: str) -> str:
@@ -24,14 +45,99 @@ def get_password_hash(password: str) -> str:
     Hash password using Argon2.
     Argon2 doesn't have the 72-byte limit that bcrypt has.
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its Argon2 hash.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    True when a stored hash was made with different Argon2 parameters than
+    the configured ones and should be replaced on the next successful login.
+    """
+    return get_pwd_context().needs_update(hashed_password)
+
+
+# Argon2 (via argon2-cffi) releases the GIL, so a small thread pool keeps
+# hashing off the event loop. The pool size caps concurrent hashes and
+# therefore Argon2 memory (workers x memory_cost); the semaphore bounds how
+# many callers may queue behind it before we shed load.
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_slots = asyncio.Semaphore(settings.password_hash_max_pending)
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=settings.password_hash_workers,
+            thread_name_prefix="argon2",
+        )
+    return _hash_executor
+
+
+async def _run_hash(func, *args):
+    try:
+        await asyncio.wait_for(_hash_slots.acquire(), timeout=settings.password_hash_queue_timeout)
+    except asyncio.TimeoutError:
+        raise APIError(
+            code="AUTH_BUSY",
+            message="Authentication is temporarily overloaded, please retry",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Async variant of get_password_hash that runs on the bounded hash pool.
+    """
+    return await _run_hash(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Async variant of verify_password that runs on the bounded hash pool.
+    """
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+def build_token_data(user, family: Optional[str] = None) -> dict:
+    """
+    Claims shared by access and refresh tokens. ``fam`` ties every token
+    issued from one login together so they can be revoked as a unit; pass
+    the existing family when rotating. With jwt_embed_principal the token
+    also carries the principal so get_current_user can skip the DB.
+    """
+    token_data = {
+        "user_id": str(user.id),
+        "username": user.username,
+        "fam": family or str(uuid.uuid4()),
+    }
+
+    if settings.jwt_embed_principal:
+        principal = principal_from_user(user)
+        principal.pop("id")
+        token_data.update(principal)
+
+    return token_data
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -68,13 +174,38 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
-def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
-    try:
+# Verified payloads keyed by a digest of the token. The same token is
+# presented on every request of a session, so this skips the HMAC check and
+# JSON parsing after the first one. Entries expire at the token's ``exp``.
+token_cache = TTLCache(maxsize=settings.jwt_decode_cache_size)
+
+
+def _decode_token(token: str) -> Optional[dict]:
+    if settings.jwt_decode_cache_size <= 0:
+        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        token_cache.set(key, payload, expires_at=payload.get("exp"))
+    
+    # Callers may mutate the payload; keep the cached one intact
+    return dict(payload)
+
+
+def verify_token(token: str, token_type: str = "access", check_revoked: bool = True) -> Optional[dict]:
+    try:
+        payload = _decode_token(token)
         
         if payload.get("type") != token_type:
             return None
+        
+        # Membership check against the in-memory mirror, no DB round trip.
+        # Runs on cache hits too, so a revoked token is never served.
+        if check_revoked and revocation_list.is_revoked(payload.get("jti"), payload.get("fam")):
+            return None
             
         return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,50 @@
+import json
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from ..config import settings
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _adapter(tp) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+def serialize(tp, content: Any, status_code: int = 200):
+    """Validate ``content`` as ``tp`` (ORM objects are read by attribute)
+    and render it to JSON in one pass inside pydantic-core.
+
+    Returning a Response skips FastAPI's own handling of the return value
+    (validation against ``response_model``, ``jsonable_encoder``, then
+    ``json.dumps``), so routes keep ``response_model`` for the OpenAPI
+    schema only. With ``fast_json_responses`` off, ``content`` is returned
+    as is and takes the default path.
+    """
+    if not settings.fast_json_responses:
+        return content
+
+    adapter = _adapter(tp)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+    return Response(body, status_code=status_code, media_type="application/json")
@@ -0,0 +1,66 @@
+import logging
+from typing import Optional
+
+from ..config import settings
+from .cache import TTLCache
+from .security import verify_token
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryWriteTracker:
+    """Per-process record of which users wrote within the read-your-writes
+    window; correct for a single worker only."""
+
+    def __init__(self, window: int, max_users: int = 100_000):
+        self.window = window
+        self._wrote = TTLCache(maxsize=max_users, ttl=window)
+
+    async def mark(self, user_id: str) -> None:
+        self._wrote.set(user_id, True)
+
+    async def wrote_recently(self, user_id: str) -> bool:
+        return self._wrote.get(user_id, False)
+
+
+class RedisWriteTracker:
+    """Write marks shared by every gunicorn worker through Redis."""
+
+    def __init__(self, url: str, window: int):
+        import redis.asyncio as redis
+
+        self.window = window
+        self._redis = redis.from_url(url)
+
+    async def mark(self, user_id: str) -> None:
+        try:
+            await self._redis.set(f"ryw:{user_id}", 1, ex=self.window)
+        except Exception as e:
+            logger.warning(f"Write tracker unavailable: {e}")
+
+    async def wrote_recently(self, user_id: str) -> bool:
+        try:
+            return bool(await self._redis.exists(f"ryw:{user_id}"))
+        except Exception as e:
+            # Fail towards the primary: slower reads beat stale ones
+            logger.warning(f"Write tracker unavailable: {e}")
+            return True
+
+
+def principal_id(authorization: Optional[str]) -> Optional[str]:
+    """User id of a verified bearer token, or None for anonymous clients.
+    verify_token caches decoded tokens, so this is cheap per request."""
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    payload = verify_token(authorization[7:].strip())
+    return payload.get("user_id") if payload else None
+
+
+def create_write_tracker():
+    if settings.read_your_writes_backend == "redis":
+        return RedisWriteTracker(settings.redis_url, settings.read_your_writes_window)
+    return InMemoryWriteTracker(settings.read_your_writes_window)
+
+
+# singleton instance
+write_tracker = create_write_tracker()
@@ -3,6 +3,8 @@ from .post import CRUDPost, get_post_crud
 from .comment import CRUDComment, get_comment_crud
 from .community import CRUDCommunity, get_community_crud
 from .notification import CRUDNotification, get_notification_crud
+from .stats import CRUDUserStats, get_user_stats_crud
+from .ai_usage import CRUDAIUsage, get_ai_usage_crud
 
 __all__ = [
     "CRUDUser", "get_user_crud",
@@ -10,4 +12,6 @@ __all__ = [
     "CRUDComment", "get_comment_crud",
     "CRUDCommunity", "get_community_crud",
     "CRUDNotification", "get_notification_crud",
+    "CRUDUserStats", "get_user_stats_crud",
+    "CRUDAIUsage", "get_ai_usage_crud",
 ]
\ No newline at end of file
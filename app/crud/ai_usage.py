@@ -0,0 +1,69 @@
+from typing import Dict, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import func
+from datetime import date
+import uuid
+
+from ..models.ai_usage import AIUsage
+
+COUNTERS = ("requests", "upstream_calls", "tokens")
+
+
+class CRUDAIUsage:
+    async def get(self, db: AsyncSession, day: date, user_id: uuid.UUID) -> Tuple[int, int, int]:
+        row = await db.get(AIUsage, (day, user_id))
+        if row is None:
+            return 0, 0, 0
+        return row.requests, row.upstream_calls, row.tokens
+
+    async def get_many(
+        self, db: AsyncSession, day: date, user_ids: Sequence[uuid.UUID]
+    ) -> Dict[uuid.UUID, Tuple[int, int, int]]:
+        if not user_ids:
+            return {}
+
+        result = await db.execute(
+            select(AIUsage.user_id, AIUsage.requests, AIUsage.upstream_calls, AIUsage.tokens)
+            .where(AIUsage.day == day, AIUsage.user_id.in_(user_ids))
+        )
+        return {row.user_id: (row.requests, row.upstream_calls, row.tokens) for row in result}
+
+    async def totals(self, db: AsyncSession, day: date) -> Tuple[int, int, int]:
+        result = await db.execute(
+            select(
+                func.coalesce(func.sum(AIUsage.requests), 0),
+                func.coalesce(func.sum(AIUsage.upstream_calls), 0),
+                func.coalesce(func.sum(AIUsage.tokens), 0),
+            ).where(AIUsage.day == day)
+        )
+        requests, upstream_calls, tokens = result.one()
+        return int(requests), int(upstream_calls), int(tokens)
+
+    async def add_many(
+        self, db: AsyncSession, deltas: Dict[Tuple[date, uuid.UUID], Tuple[int, int, int]]
+    ) -> None:
+        """Add counter deltas to many (day, user) rows in one upsert.
+        Caller commits."""
+        if not deltas:
+            return
+
+        # Rows are touched in a stable order so concurrent flushes can't deadlock
+        rows = [
+            {"day": day, "user_id": user_id, **dict(zip(COUNTERS, counts))}
+            for (day, user_id), counts in sorted(deltas.items(), key=lambda item: (item[0][0], str(item[0][1])))
+        ]
+        stmt = insert(AIUsage).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AIUsage.day, AIUsage.user_id],
+            set_={
+                **{k: getattr(AIUsage, k) + getattr(stmt.excluded, k) for k in COUNTERS},
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+
+def get_ai_usage_crud():
+    return CRUDAIUsage()
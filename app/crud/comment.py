@@ -12,6 +12,7 @@ from ..models.user import User
 from ..models.post import Post
 from ..schemas.comment import CommentCreate
 from .base import CRUDBase
+from .stats import get_user_stats_crud
 
 
 class CRUDComment(CRUDBase[Comment, CommentCreate, BaseModel]):
@@ -22,6 +23,7 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, BaseModel]):
         obj_in: CommentCreate,
         author_id: UUID,
         post_id: UUID,
+        commit: bool = True,
     ) -> Comment:
             db_obj = Comment(
                 content=obj_in.content,
@@ -31,6 +33,13 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, BaseModel]):
             )
     
             db.add(db_obj)
+            await get_user_stats_crud().increment(db, author_id, comment_count=1)
+    
+            # Let the caller add related rows (e.g. notification outbox)
+            # and commit them in the same transaction
+            if not commit:
+                await db.flush()
+                return db_obj
     
             try:
                 await db.commit()
@@ -189,6 +189,33 @@ class CRUDCommunity(CRUDBase[Community, CommunityCreate, CommunityUpdate]):
         }
 
     
+    async def get_member(
+        self, db: AsyncSession, *, community_id: uuid.UUID, user_id: uuid.UUID
+    ) -> Optional[CommunityMember]:
+        result = await db.execute(
+            select(CommunityMember).where(
+                CommunityMember.community_id == community_id,
+                CommunityMember.user_id == user_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def set_notifications_muted(
+        self,
+        db: AsyncSession,
+        *,
+        community_id: uuid.UUID,
+        user_id: uuid.UUID,
+        muted: bool,
+    ) -> Optional[CommunityMember]:
+        member = await self.get_member(db, community_id=community_id, user_id=user_id)
+
+        if member:
+            member.notifications_muted = muted
+            await db.commit()
+
+        return member
+
     async def get_members(
         self,
         db: AsyncSession,
@@ -1,21 +1,74 @@
-from typing import Optional, Dict, Sequence
+from typing import Any, Optional, Dict, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from pydantic import BaseModel
-from sqlalchemy import desc
+from sqlalchemy import case, desc, delete, insert, literal, update, func, text
+import json
 import uuid
+from datetime import datetime, timedelta, timezone
 
-from ..models.notification import Notification, NotificationType
+from ..config import settings
+from ..models.community import CommunityMember
+from ..models.notification import (
+    Notification,
+    NotificationOutbox,
+    NotificationFanout,
+    NotificationType,
+    FanoutStatus,
+)
 from ..schemas.notification import NotificationCreate
 from .base import CRUDBase
 
 
+# One keyset-paginated chunk of a community fan-out: a single
+# INSERT ... SELECT from community_members instead of a row per commit.
+FANOUT_CHUNK_SQL = text(
+    """
+    WITH batch AS (
+        SELECT id, user_id, notifications_muted
+        FROM community_members
+        WHERE community_id = :community_id
+          AND (CAST(:cursor AS uuid) IS NULL OR id > CAST(:cursor AS uuid))
+        ORDER BY id
+        LIMIT :chunk_size
+    ),
+    inserted AS (
+        INSERT INTO notifications (id, type, message, read, user_id, post_id, community_id, meta)
+        SELECT gen_random_uuid(), CAST(:type AS notificationtype), :message, false,
+               user_id, CAST(:post_id AS uuid), :community_id, CAST(:meta AS json)
+        FROM batch
+        WHERE NOT notifications_muted AND user_id <> :actor_id
+        RETURNING 1
+    )
+    SELECT
+        (SELECT count(*) FROM batch) AS scanned,
+        (SELECT count(*) FROM inserted) AS notified,
+        (SELECT id FROM batch ORDER BY id DESC LIMIT 1) AS last_id
+    """
+)
+
+
+def visible_since() -> datetime:
+    # Bounding created_at lets Postgres prune all but the recent partitions
+    return datetime.now(timezone.utc) - timedelta(days=settings.notification_visible_days)
+
+
 class CRUDNotification(CRUDBase[Notification, NotificationCreate, BaseModel]):
+    async def get(self, db: AsyncSession, id: Any) -> Optional[Notification]:
+        result = await db.execute(
+            select(Notification).filter(
+                Notification.id == id,
+                Notification.created_at >= visible_since(),
+            )
+        )
+        return result.scalar_one_or_none()
+
     async def get_user_notifications(
         self, db: AsyncSession, user_id: uuid.UUID, skip: int = 0, limit: int = 50, unread_only: bool = False
     ) -> Sequence[Notification]:
         query = select(Notification).filter(
-            Notification.user_id == user_id
+            Notification.user_id == user_id,
+            Notification.created_at >= visible_since(),
         )
 
         if unread_only:
@@ -54,7 +107,188 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, BaseModel]):
         db.add(db_obj)
         await db.commit()
         return db_obj
-    
+
+    async def enqueue_notification(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        type: NotificationType,
+        message: str,
+        post_id: Optional[uuid.UUID] = None,
+        comment_id: Optional[uuid.UUID] = None,
+        community_id: Optional[uuid.UUID] = None,
+        meta: Optional[Dict] = None,
+    ) -> NotificationOutbox:
+        # Only stages the outbox row; it is committed together with the
+        # caller's own write and delivered later by the dispatcher.
+        db_obj = NotificationOutbox(
+            user_id=user_id,
+            type=type,
+            message=message,
+            post_id=post_id,
+            comment_id=comment_id,
+            community_id=community_id,
+            meta=meta or {},
+        )
+
+        db.add(db_obj)
+        return db_obj
+
+    async def claim_outbox_batch(
+        self, db: AsyncSession, *, limit: int, max_attempts: int
+    ) -> Sequence[NotificationOutbox]:
+        # SKIP LOCKED lets several workers drain the outbox concurrently
+        # without delivering the same row twice.
+        result = await db.execute(
+            select(NotificationOutbox)
+            .filter(NotificationOutbox.attempts < max_attempts)
+            .order_by(NotificationOutbox.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
+
+    async def deliver_outbox_batch(
+        self, db: AsyncSession, *, entries: Sequence[NotificationOutbox]
+    ) -> int:
+        if not entries:
+            return 0
+
+        await db.execute(
+            insert(Notification),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": entry.user_id,
+                    "type": entry.type,
+                    "message": entry.message,
+                    "post_id": entry.post_id,
+                    "comment_id": entry.comment_id,
+                    "community_id": entry.community_id,
+                    "meta": entry.meta or {},
+                    "read": False,
+                }
+                for entry in entries
+            ],
+        )
+        await db.execute(
+            delete(NotificationOutbox).where(
+                NotificationOutbox.id.in_([entry.id for entry in entries])
+            )
+        )
+        return len(entries)
+
+    async def enqueue_fanout(
+        self,
+        db: AsyncSession,
+        *,
+        community_id: uuid.UUID,
+        actor_id: uuid.UUID,
+        type: NotificationType,
+        message: str,
+        post_id: Optional[uuid.UUID] = None,
+        meta: Optional[Dict] = None,
+    ) -> NotificationFanout:
+        # Staged in the caller's transaction like enqueue_notification
+        db_obj = NotificationFanout(
+            community_id=community_id,
+            actor_id=actor_id,
+            type=type,
+            message=message,
+            post_id=post_id,
+            meta=meta or {},
+        )
+
+        db.add(db_obj)
+        return db_obj
+
+    async def claim_fanout_job(
+        self, db: AsyncSession, *, max_attempts: int
+    ) -> Optional[NotificationFanout]:
+        result = await db.execute(
+            select(NotificationFanout)
+            .filter(
+                NotificationFanout.status.in_([FanoutStatus.PENDING, FanoutStatus.RUNNING]),
+                NotificationFanout.attempts < max_attempts,
+            )
+            .order_by(NotificationFanout.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def fan_out_chunk(
+        self, db: AsyncSession, *, job: NotificationFanout, chunk_size: int
+    ) -> int:
+        if job.total_members is None:
+            count_result = await db.execute(
+                select(func.count(CommunityMember.id)).filter(
+                    CommunityMember.community_id == job.community_id
+                )
+            )
+            job.total_members = count_result.scalar_one()
+            job.status = FanoutStatus.RUNNING
+
+        result = await db.execute(
+            FANOUT_CHUNK_SQL,
+            {
+                "community_id": job.community_id,
+                "cursor": job.cursor,
+                "chunk_size": chunk_size,
+                "type": job.type.value,
+                "message": job.message,
+                "post_id": job.post_id,
+                "meta": json.dumps(job.meta or {}),
+                "actor_id": job.actor_id,
+            },
+        )
+        scanned, notified, last_id = result.one()
+
+        job.processed += scanned
+        job.notified += notified
+        if last_id is not None:
+            job.cursor = last_id
+
+        if scanned < chunk_size:
+            job.status = FanoutStatus.DONE
+            job.finished_at = datetime.now(timezone.utc)
+
+        return notified
+
+    async def record_fanout_failure(
+        self, db: AsyncSession, *, job_id: uuid.UUID, error: str, max_attempts: int
+    ) -> None:
+        # A Core update: after a failed chunk the job instance is expired by
+        # the savepoint rollback and can't be lazy-loaded on an AsyncSession
+        await db.execute(
+            update(NotificationFanout)
+            .where(NotificationFanout.id == job_id)
+            .values(
+                attempts=NotificationFanout.attempts + 1,
+                last_error=error[:500],
+                status=case(
+                    (
+                        NotificationFanout.attempts + 1 >= max_attempts,
+                        literal(FanoutStatus.FAILED, NotificationFanout.status.type),
+                    ),
+                    else_=NotificationFanout.status,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_fanout_for_post(
+        self, db: AsyncSession, post_id: uuid.UUID
+    ) -> Optional[NotificationFanout]:
+        result = await db.execute(
+            select(NotificationFanout)
+            .filter(NotificationFanout.post_id == post_id)
+            .order_by(desc(NotificationFanout.created_at))
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
     async def mark_as_read(
         self, db: AsyncSession, notification_id: uuid.UUID, user_id: uuid.UUID
     ) -> Optional[Notification]:
@@ -71,24 +305,17 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, BaseModel]):
         self, db: AsyncSession, user_id: uuid.UUID
     ) -> int:
         result = await db.execute(
-            select(Notification).filter(
+            update(Notification)
+            .where(
                 Notification.user_id == user_id,
-                Notification.read == False
+                Notification.read == False,
+                Notification.created_at >= visible_since(),
             )
+            .values(read=True)
+            .execution_options(synchronize_session=False)
         )
         
-        notifications = result.scalars().all()
-        count = 0
-        
-        for notification in notifications:
-            notification.read = True
-            db.add(notification)
-            count += 1
-        
-        if count > 0:
-            await db.flush()
-        
-        return count
+        return result.rowcount or 0
 
 
 def get_notification_crud():
@@ -6,8 +6,10 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 from ..models.post import Post, PostUpvote, PostSave, PostType, PostStatus, College
+from ..models.comment import Comment
 from ..schemas.post import PostCreate, PostUpdate
 from .base import CRUDBase
+from .stats import get_user_stats_crud
 
 
 class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
@@ -40,7 +42,7 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         return post
     
     async def create_with_author(
-        self, db: AsyncSession, *, obj_in: PostCreate, author_id: uuid.UUID
+        self, db: AsyncSession, *, obj_in: PostCreate, author_id: uuid.UUID, commit: bool = True
     ) -> Post:
         db_obj = Post(
             **obj_in.model_dump(exclude={"event_date", "event_time", "deadline"}),
@@ -56,6 +58,14 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
             db_obj.deadline = obj_in.deadline.replace(tzinfo=timezone.utc) if obj_in.deadline.tzinfo is None else obj_in.deadline
 
         db.add(db_obj)
+        await get_user_stats_crud().increment(db, author_id, post_count=1)
+
+        # Let the caller stage related rows (e.g. a notification fan-out)
+        # and commit them in the same transaction
+        if not commit:
+            await db.flush()
+            return db_obj
+
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -184,6 +194,8 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
     async def toggle_upvote(
         self, db: AsyncSession, *, post_id: uuid.UUID, user_id: uuid.UUID
     ) -> Dict[str, Any]:
+        user_stats_crud = get_user_stats_crud()
+
         # Check if already upvoted
         existing = await db.execute(
             select(PostUpvote).filter(
@@ -199,13 +211,15 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
             await db.flush()
 
             # Decrement count
-            await db.execute(
+            result = await db.execute(
                 update(Post).where(Post.id == post_id).values(
                     upvotes_count=func.greatest(Post.upvotes_count - 1, 0)
-                )
+                ).returning(Post.upvotes_count, Post.author_id)
             )
-            result = await db.execute(select(Post.upvotes_count).where(Post.id == post_id))
-            count = result.scalar_one()
+            count, author_id = result.one()
+            await user_stats_crud.increment(db, author_id, upvotes_received=-1)
+
+            await db.commit()
 
             return {"upvoted": False, "count": count}
         else:
@@ -215,22 +229,23 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
             await db.flush()
 
             # Increment count
-            await db.execute(
+            result = await db.execute(
                 update(Post).where(Post.id == post_id).values(
                     upvotes_count=Post.upvotes_count + 1
-                )
+                ).returning(Post.upvotes_count, Post.author_id)
             )
+            count, author_id = result.one()
+            await user_stats_crud.increment(db, author_id, upvotes_received=1)
             
             await db.commit()
-            
-            result = await db.execute(select(Post.upvotes_count).where(Post.id == post_id))
-            count = result.scalar_one()
 
             return {"upvoted": True, "count": count}
     
     async def toggle_save(
         self, db: AsyncSession, *, post_id: uuid.UUID, user_id: uuid.UUID
     ) -> Dict[str, Any]:
+        user_stats_crud = get_user_stats_crud()
+
         # Check if already saved
         existing = await db.execute(
             select(PostSave).filter(
@@ -246,13 +261,15 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
             await db.flush()
 
             # Decrement count
-            await db.execute(
+            result = await db.execute(
                 update(Post).where(Post.id == post_id).values(
                     saves_count=func.greatest(Post.saves_count - 1, 0)
-                )
+                ).returning(Post.saves_count)
             )
-            result = await db.execute(select(Post.saves_count).where(Post.id == post_id))
             count = result.scalar_one()
+            await user_stats_crud.increment(db, user_id, saved_count=-1)
+
+            await db.commit()
 
             return {"saved": False, "count": count}
         else:
@@ -262,15 +279,15 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
             await db.flush()
 
             # Increment count
-            await db.execute(
+            result = await db.execute(
                 update(Post).where(Post.id == post_id).values(
                     saves_count=Post.saves_count + 1
-                )
+                ).returning(Post.saves_count)
             )
+            count = result.scalar_one()
+            await user_stats_crud.increment(db, user_id, saved_count=1)
             
             await db.commit()
-            result = await db.execute(select(Post.saves_count).where(Post.id == post_id))
-            count = result.scalar_one()
 
             return {"saved": True, "count": count}
     
@@ -323,6 +340,39 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         result = await db.execute(query_builder)
         return result.scalar_one() or 0
 
+    async def remove(self, db: AsyncSession, *, id: Any) -> Optional[Post]:
+        post = await self.get(db, id)
+        if not post:
+            return None
+
+        user_stats_crud = get_user_stats_crud()
+
+        # The post's comments, upvotes and saves go with it; take them off
+        # the counters of everyone they were credited to
+        comment_counts = await db.execute(
+            select(Comment.author_id, func.count()).filter(Comment.post_id == id).group_by(Comment.author_id)
+        )
+        save_counts = await db.execute(
+            select(PostSave.user_id, func.count()).filter(PostSave.post_id == id).group_by(PostSave.user_id)
+        )
+        upvotes = await db.execute(
+            select(func.count()).select_from(PostUpvote).filter(PostUpvote.post_id == id)
+        )
+
+        await user_stats_crud.increment(
+            db, post.author_id, post_count=-1, upvotes_received=-upvotes.scalar_one()
+        )
+        await user_stats_crud.increment_many(
+            db, "comment_count", {user_id: -n for user_id, n in comment_counts.all()}
+        )
+        await user_stats_crud.increment_many(
+            db, "saved_count", {user_id: -n for user_id, n in save_counts.all()}
+        )
+
+        await db.delete(post)
+        await db.commit()
+        return post
+
     async def increment_views(self, db: AsyncSession, post_id: uuid.UUID) -> None:
         await db.execute(
             update(Post).where(Post.id == post_id).values(views=Post.views + 1)
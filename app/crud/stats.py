@@ -0,0 +1,83 @@
+from typing import Dict, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import func, text
+import uuid
+
+from ..models.stats import UserStats
+
+COUNTERS = ("post_count", "comment_count", "saved_count", "upvotes_received")
+
+# Recount a batch of users from the source tables and fix rows that drifted
+RECONCILE_SQL = text(
+    """
+    INSERT INTO user_stats (user_id, post_count, comment_count, saved_count, upvotes_received, updated_at)
+    SELECT u.id,
+           (SELECT count(*) FROM posts p WHERE p.author_id = u.id),
+           (SELECT count(*) FROM comments c WHERE c.author_id = u.id),
+           (SELECT count(*) FROM post_saves s WHERE s.user_id = u.id),
+           (SELECT count(*) FROM post_upvotes v JOIN posts p ON p.id = v.post_id WHERE p.author_id = u.id),
+           now()
+    FROM users u
+    WHERE u.id = ANY(:user_ids)
+    ON CONFLICT (user_id) DO UPDATE SET
+        post_count = EXCLUDED.post_count,
+        comment_count = EXCLUDED.comment_count,
+        saved_count = EXCLUDED.saved_count,
+        upvotes_received = EXCLUDED.upvotes_received,
+        updated_at = now()
+    WHERE (user_stats.post_count, user_stats.comment_count, user_stats.saved_count, user_stats.upvotes_received)
+          IS DISTINCT FROM
+          (EXCLUDED.post_count, EXCLUDED.comment_count, EXCLUDED.saved_count, EXCLUDED.upvotes_received)
+    RETURNING user_id
+    """
+)
+
+
+class CRUDUserStats:
+    async def get(self, db: AsyncSession, user_id: uuid.UUID) -> Optional[UserStats]:
+        return await db.get(UserStats, user_id)
+
+    async def increment(self, db: AsyncSession, user_id: uuid.UUID, **deltas: int) -> None:
+        """Add ``deltas`` (e.g. ``post_count=1``) to a user's counters in
+        the caller's transaction. Caller commits."""
+        deltas = {k: v for k, v in deltas.items() if v}
+        if not deltas:
+            return
+
+        unknown = set(deltas) - set(COUNTERS)
+        if unknown:
+            raise ValueError(f"Unknown user stats counters: {sorted(unknown)}")
+
+        stmt = insert(UserStats).values(
+            user_id=user_id, **{k: max(v, 0) for k, v in deltas.items()}
+        )
+        # One atomic upsert; counters never go below zero
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                **{k: func.greatest(getattr(UserStats, k) + v, 0) for k, v in deltas.items()},
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+    async def increment_many(
+        self, db: AsyncSession, counter: str, deltas: Dict[uuid.UUID, int]
+    ) -> None:
+        # Rows are touched in a stable order so concurrent callers can't deadlock
+        for user_id in sorted(deltas, key=str):
+            await self.increment(db, user_id, **{counter: deltas[user_id]})
+
+    async def reconcile(self, db: AsyncSession, user_ids: Sequence[uuid.UUID]) -> int:
+        """Recompute the given users' counters; returns how many drifted.
+        Caller commits."""
+        if not user_ids:
+            return 0
+
+        result = await db.execute(RECONCILE_SQL, {"user_ids": list(user_ids)})
+        return len(result.all())
+
+
+def get_user_stats_crud():
+    return CRUDUserStats()
@@ -0,0 +1,69 @@
+from typing import Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import delete, func
+from datetime import datetime
+import uuid
+
+from ..models.token import RevokedToken, RevocationScope
+
+
+class CRUDRevokedToken:
+    async def revoke(
+        self,
+        db: AsyncSession,
+        *,
+        jti: str,
+        scope: RevocationScope,
+        expires_at: datetime,
+        user_id: Optional[uuid.UUID] = None,
+        reason: Optional[str] = None,
+    ) -> bool:
+        """Record a revocation; returns False if it was already revoked.
+
+        The insert is atomic, which is what makes refresh rotation safe
+        against two concurrent uses of the same token.
+        """
+        result = await db.execute(
+            insert(RevokedToken)
+            .values(
+                jti=jti,
+                scope=scope.value,
+                expires_at=expires_at,
+                user_id=user_id,
+                reason=reason,
+            )
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+            .returning(RevokedToken.jti)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def get_revoked(
+        self, db: AsyncSession, *, jti: str, family: Optional[str] = None
+    ) -> Sequence[RevokedToken]:
+        keys = [jti] + ([family] if family else [])
+        result = await db.execute(
+            select(RevokedToken).filter(RevokedToken.jti.in_(keys))
+        )
+        return result.scalars().all()
+
+    async def get_revoked_since(
+        self, db: AsyncSession, since: Optional[datetime] = None
+    ) -> Sequence[RevokedToken]:
+        query = select(RevokedToken).filter(RevokedToken.expires_at > func.now())
+        if since is not None:
+            query = query.filter(RevokedToken.revoked_at >= since)
+
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        result = await db.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= func.now())
+        )
+        return result.rowcount or 0
+
+
+def get_revoked_token_crud():
+    return CRUDRevokedToken()
@@ -1,11 +1,37 @@
-from typing import Optional, Sequence
+from typing import AsyncIterator, Iterable, Optional, Sequence, Set, Tuple
+import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_
+from sqlalchemy import or_, text
 from ..models.user import User
 from ..schemas.user import UserCreate, UserUpdate
 from .base import CRUDBase
-from ..core.security import get_password_hash
+from ..utils.helpers import USERNAME_MAX_LENGTH, escape_like
+from ..core.security import hash_password_async, verify_password_async, password_needs_rehash
+
+logger = logging.getLogger(__name__)
+
+MAX_SUFFIX_DIGITS = 6  # longer numeric tails aren't treated as suffixes
+
+# Email check plus the username's state in one round trip: whether ``base``
+# itself is taken and the next numeric suffix after the highest one in use.
+# Suffixed names are trimmed to fit the column (see suffixed_username), so a
+# k-digit suffix follows the first max_length - k characters of ``base``.
+# The LIKE prefix is served by ix_users_username_pattern.
+AVAILABILITY_SQL = text(
+    """
+    SELECT
+        EXISTS (SELECT 1 FROM users WHERE email = :email) AS email_taken,
+        EXISTS (SELECT 1 FROM users WHERE username = :base) AS username_taken,
+        coalesce((
+            SELECT max(CAST(right(username, k) AS integer))
+            FROM users CROSS JOIN generate_series(1, :max_digits) AS k
+            WHERE username LIKE :pattern ESCAPE '\\'
+              AND right(username, k) ~ '^[0-9]+$'
+              AND left(username, -k) = left(:base, :max_length - k)
+        ), 0) + 1 AS next_suffix
+    """
+)
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
@@ -21,9 +47,56 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         )
         return result.scalar_one_or_none()
     
+    async def get_existing_emails(self, db: AsyncSession, emails: Iterable[str]) -> Set[str]:
+        emails = list(set(emails))
+        if not emails:
+            return set()
+        
+        result = await db.execute(select(User.email).filter(User.email.in_(emails)))
+        return set(result.scalars().all())
+    
+    async def get_taken_usernames(self, db: AsyncSession, bases: Iterable[str]) -> Set[str]:
+        """Every username that starts with one of ``bases``, in one query,
+        so suffixes can be allocated without a lookup per candidate."""
+        bases = sorted(set(bases))
+        if not bases:
+            return set()
+        
+        result = await db.execute(
+            select(User.username).filter(
+                or_(*[User.username.like(escape_like(base) + "%", escape="\\") for base in bases])
+            )
+        )
+        return set(result.scalars().all())
+    
+    async def get_availability(
+        self, db: AsyncSession, *, base: str, email: Optional[str] = None
+    ) -> Tuple[bool, bool, int]:
+        """Returns ``(email_taken, username_taken, next_suffix)``."""
+        result = await db.execute(
+            AVAILABILITY_SQL,
+            {
+                "email": email,
+                "base": base,
+                "max_length": USERNAME_MAX_LENGTH,
+                "max_digits": MAX_SUFFIX_DIGITS,
+                # Shortest form ``base`` can take once a suffix is added
+                "pattern": escape_like(base[:USERNAME_MAX_LENGTH - MAX_SUFFIX_DIGITS]) + "%",
+            },
+        )
+        email_taken, username_taken, next_suffix = result.one()
+        return email_taken, username_taken, next_suffix
+    
+    async def stream_identities(self, db: AsyncSession, batch_size: int = 5000) -> AsyncIterator[Tuple[str, str]]:
+        result = await db.stream(
+            select(User.username, User.email).execution_options(yield_per=batch_size)
+        )
+        async for username, email in result:
+            yield username, email
+    
     async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
-        # Hash password
-        hashed_password = get_password_hash(obj_in.password)
+        # Hash password off the event loop
+        hashed_password = await hash_password_async(obj_in.password)
         
         # Create user object
         db_obj = User(
@@ -48,10 +121,22 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         if not user:
             return None
         
-        from ..core.security import verify_password
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         
+        # Transparently upgrade hashes made with old Argon2 parameters
+        if password_needs_rehash(user.hashed_password):
+            user_id = user.id
+            try:
+                user.hashed_password = await hash_password_async(password)
+                await db.commit()
+            except Exception as e:
+                logger.warning(f"Password rehash failed for user {user_id}: {e}")
+                # The rollback expires the user; reload it so the login
+                # still succeeds with the old hash in place
+                await db.rollback()
+                await db.refresh(user)
+        
         return user
     
     async def search(
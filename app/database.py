@@ -1,16 +1,73 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import itertools
+import logging
+import time
+from pathlib import Path
+from typing import List, Optional, Set
+
+from fastapi import Request
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
+from .core.metrics import Metrics
+from .core.write_tracker import principal_id, write_tracker
+
+logger = logging.getLogger(__name__)
+
+# Checkout waits and timeouts per pool, labelled by lane
+pool_metrics = Metrics()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+    label = "default"
+    capacity = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.incr(f"{self.label}_timeouts")
+            raise
+        finally:
+            pool_metrics.observe(self.label, time.perf_counter() - start)
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.environment == "dev",
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_pre_ping=True,
-)
+
+def create_lane_engine(url: str, lane: str, label: Optional[str] = None) -> AsyncEngine:
+    """An engine whose pool is sized by the ``db_pool_<lane>_*`` settings.
+
+    ``pool_timeout`` is the lane's latency budget for getting a connection;
+    past it the checkout raises and the request gets a 503 instead of
+    queueing behind everyone else.
+    """
+    size = getattr(settings, f"db_pool_{lane}_size")
+    overflow = getattr(settings, f"db_pool_{lane}_overflow")
+    # A subclass per pool keeps the label across pool.recreate()
+    poolclass = type(f"{lane.title()}Pool", (InstrumentedPool,), {
+        "label": label or lane,
+        "capacity": size + overflow,
+    })
+
+    return create_async_engine(
+        url,
+        echo=settings.environment == "dev",
+        poolclass=poolclass,
+        pool_size=size,
+        max_overflow=overflow,
+        pool_timeout=getattr(settings, f"db_pool_{lane}_timeout"),
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,
+    )
+
+
+# One pool per workload on the primary, so slow background writes can't
+# starve interactive requests. ``engine`` is the write lane.
+engine = create_lane_engine(settings.database_url, "write")
+read_engine = create_lane_engine(settings.database_url, "read")
+background_engine = create_lane_engine(settings.database_url, "background")
 
 
 # Create session factory
@@ -20,10 +77,218 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Sessions for loops and jobs that run outside a request
+BackgroundSessionLocal = async_sessionmaker(
+    background_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 # Create declarative base
 Base = declarative_base()
 
 
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
+
+class SchemaOutOfDateError(RuntimeError):
+    pass
+
+
+def migration_heads() -> Set[str]:
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory(str(MIGRATIONS_DIR)).get_heads())
+
+
+async def check_schema_revision() -> None:
+    """Raise SchemaOutOfDateError unless the database is migrated to the
+    Alembic head. One small query; the schema itself is never introspected."""
+    heads = migration_heads()
+    async with engine.connect() as conn:
+        # No alembic_version table means the database was never migrated
+        if (await conn.execute(text("SELECT to_regclass('alembic_version')"))).scalar() is None:
+            current = set()
+        else:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = {row[0] for row in result}
+
+    if current != heads:
+        raise SchemaOutOfDateError(
+            f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+            f"expected {', '.join(sorted(heads))}; run `alembic upgrade head`"
+        )
+
+
+def read_only(bind):
+    # READ ONLY lets Postgres skip write bookkeeping; DEFERRABLE only takes
+    # effect under SERIALIZABLE, which hot standbys refuse, so it is a no-op
+    # at the default isolation level but keeps reads off the write path.
+    return bind.execution_options(postgresql_readonly=True, postgresql_deferrable=True)
+
+
+# Read-only sessions on the primary, used when no replica is healthy
+ReadSessionLocal = async_sessionmaker(
+    read_only(read_engine),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# Seconds a replica is behind; 0 when it has replayed everything it received
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class Replica:
+    def __init__(self, url: str, label: str):
+        self.label = label
+        self.engine = create_lane_engine(url, "read", label=label)
+        self.sessions = async_sessionmaker(
+            read_only(self.engine),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        # Unhealthy until the first check passes
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+
+class ReplicaRouter:
+    """Hands out read-only sessions on replicas, round robin over those that
+    passed their last health check, and on the primary when none did.
+
+    A replica is healthy when it answers within the check timeout and is at
+    most ``replica_max_lag`` seconds behind the primary.
+    """
+
+    def __init__(self, urls: List[str], interval: Optional[float] = None):
+        self.replicas = [Replica(url, f"replica{i}") for i, url in enumerate(urls)]
+        self.interval = interval or settings.replica_health_check_interval
+        self._next = itertools.count()
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def session_factory(self, primary: bool = False):
+        healthy = [r for r in self.replicas if r.healthy]
+        if primary or not healthy:
+            return ReadSessionLocal
+        return healthy[next(self._next) % len(healthy)].sessions
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                lag = float((await conn.execute(REPLICA_LAG_SQL)).scalar())
+        except Exception as e:
+            replica.healthy, replica.lag, replica.last_error = False, None, str(e)
+            return
+
+        replica.lag, replica.last_error = lag, None
+        replica.healthy = lag <= settings.replica_max_lag
+
+    async def run_once(self) -> int:
+        """Check every replica; returns how many are healthy."""
+        results = await asyncio.gather(*(
+            asyncio.wait_for(self._check(r), timeout=self.interval) for r in self.replicas
+        ), return_exceptions=True)
+
+        for replica, result in zip(self.replicas, results):
+            if isinstance(result, asyncio.TimeoutError):
+                replica.healthy, replica.lag, replica.last_error = False, None, "health check timed out"
+        return sum(r.healthy for r in self.replicas)
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Replica health check failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> Optional[asyncio.Task]:
+        if not self.replicas:
+            return None
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping.set()
+
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+            self._task = None
+
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> List[dict]:
+        return [
+            {"replica": i, "healthy": r.healthy, "lag_seconds": r.lag, "error": r.last_error}
+            for i, r in enumerate(self.replicas)
+        ]
+
+
+# singleton instance
+replica_router = ReplicaRouter(settings.database_replica_urls)
+
+
+def pool_stats() -> dict:
+    """Utilization and checkout waits of every pool in this worker."""
+    engines = [engine, read_engine, background_engine] + [r.engine for r in replica_router.replicas]
+    stats = {}
+    for eng in engines:
+        pool = eng.sync_engine.pool
+        checked_out = pool.checkedout()
+        stats[pool.label] = {
+            "capacity": pool.capacity,
+            "checked_out": checked_out,
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "utilization": round(checked_out / pool.capacity, 3) if pool.capacity else None,
+            "timeouts": pool_metrics.counters.get(f"{pool.label}_timeouts", 0),
+            "checkout_wait": pool_metrics.histogram(pool.label).snapshot(),
+        }
+    return stats
+
+
+async def dispose_engines() -> None:
+    await replica_router.stop()
+    for eng in (engine, read_engine, background_engine):
+        await eng.dispose()
+
+
+async def wrote_recently(request: Request) -> bool:
+    """Whether this client wrote within ``read_your_writes_window``: for an
+    authenticated user, going by the marks ReadYourWritesMiddleware records
+    per user id; for anonymous clients, by the cookie it sets."""
+    user_id = principal_id(request.headers.get("authorization"))
+    if user_id:
+        return await write_tracker.wrote_recently(user_id)
+
+    until = request.cookies.get(settings.read_your_writes_cookie)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
 # Dependency to get DB session
 async def get_db():
     async with AsyncSessionLocal() as session:
@@ -33,4 +298,17 @@ async def get_db():
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+# Dependency to get a read-only DB session, on a replica when one is healthy
+async def get_read_db(request: Request):
+    session_factory = replica_router.session_factory(primary=await wrote_recently(request))
+    async with session_factory() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -1,14 +1,26 @@
 from operator import ge
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import OperationalError
 from contextlib import asynccontextmanager
 import logging
 
 from .config import settings
-from .database import engine, Base
+from .database import check_schema_revision, SchemaOutOfDateError, replica_router, dispose_engines, pool_stats
 from .api import auth, posts, users, communities, notifications, gemini
+from .api.dependencies import require_admin
 from .middleware.cors import setup_cors
+from .middleware.rate_limit import setup_rate_limiting
+from .middleware.read_your_writes import setup_read_your_writes
 from .core.errors import setup_exception_handlers
+from .core.serialization import FastJSONResponse
+from .core.security import shutdown_hash_executor
+from .services.notification_dispatcher import notification_dispatcher
+from .services.notification_partitions import notification_partition_manager
+from .services.token_revocation import token_revocation_sync
+from .services.availability import availability_service
+from .services.ai_usage import ai_usage_meter
+from .services.provisioning import user_provisioner
 
 # Configure logging
 logging.basicConfig(
@@ -23,19 +35,49 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Relay API server")
     
-    # Create database tables
+    # The schema is managed by Alembic; only check it is migrated to head
     try:
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        logger.info("Database tables created/verified")
-    except Exception as e:
-        logger.error(f"Database initialization error: {e}")
+        await check_schema_revision()
+        logger.info("Database schema is at the latest revision")
+    except SchemaOutOfDateError as e:
+        if settings.schema_check == "error":
+            raise
+        logger.error(str(e))
+    except (OSError, OperationalError) as e:
+        # Database unreachable: start anyway and let requests report it
+        logger.error(f"Database schema check failed: {e}")
+    
+    # Health-check read replicas; reads use the primary until one passes
+    replica_router.start()
+    
+    # Mirror revoked tokens into this worker
+    token_revocation_sync.start()
+    
+    # Build the username/email Bloom filter, if enabled
+    availability_service.start()
+    
+    # Persist AI usage counters and pick up other workers' usage
+    ai_usage_meter.start()
+    
+    # Keep notification partitions ahead of time and apply retention
+    notification_partition_manager.start()
+    
+    # Deliver queued notifications in the background
+    if settings.notification_dispatcher_enabled:
+        notification_dispatcher.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Relay API server")
-    await engine.dispose()
+    await notification_dispatcher.stop()
+    await notification_partition_manager.stop()
+    await token_revocation_sync.stop()
+    await availability_service.stop()
+    await ai_usage_meter.stop()
+    shutdown_hash_executor()
+    user_provisioner.shutdown()
+    await dispose_engines()
 
 
 # Create FastAPI app
@@ -46,9 +88,12 @@ app = FastAPI(
     docs_url="/docs" if settings.environment == "dev" else None,
     redoc_url="/redoc" if settings.environment == "dev" else None,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
-# Setup middleware
+# Setup middleware (added last = outermost, so CORS also wraps 429s)
+setup_read_your_writes(app)
+setup_rate_limiting(app)
 setup_cors(app)
 setup_exception_handlers(app)
 
@@ -74,6 +119,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db")
+async def database_health(current_user: dict = Depends(require_admin)):
+    # Pool utilization and checkout waits in this worker, plus replica health
+    return {"pools": pool_stats(), "replicas": replica_router.stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .cors import setup_cors
+from .rate_limit import setup_rate_limiting
 
-__all__ = ["setup_cors"]
\ No newline at end of file
+__all__ = ["setup_cors", "setup_rate_limiting"]
\ No newline at end of file
@@ -0,0 +1,231 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..config import settings
+from ..core.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+EXEMPT_PATHS = ("/health", "/docs", "/redoc", "/openapi.json")
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Token bucket of ``limit`` requests refilled evenly over ``period``
+    seconds, applied to requests matching ``path_prefix``/``methods``."""
+    name: str
+    limit: int
+    period: float
+    path_prefix: str = "/"
+    methods: Tuple[str, ...] = ()
+    key: str = "principal"  # "principal" (verified bearer token, else IP) or "ip"
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.period
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        return path.startswith(self.path_prefix)
+
+
+class InMemoryRateLimitBackend:
+    """Per-process buckets; correct for a single worker only.
+
+    At most ``max_keys`` buckets are kept, least recently used evicted
+    first; an evicted client starts again with a full bucket.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (tokens, last update), least recently used first
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(policy.limit), now))
+        tokens = min(float(policy.limit), tokens + (now - updated) * policy.rate)
+
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            allowed, retry_after = True, 0.0
+        else:
+            self._buckets[key] = (tokens, now)
+            allowed, retry_after = False, (1 - tokens) / policy.rate
+
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return allowed, retry_after
+
+
+# KEYS[1] = bucket; ARGV = capacity, refill rate per second, now (seconds)
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """Buckets shared by every gunicorn worker through Redis."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(TOKEN_BUCKET_LUA)
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> Tuple[bool, float]:
+        try:
+            allowed, tokens = await self._script(
+                keys=[key], args=[policy.limit, policy.rate, time.time()]
+            )
+        except Exception as e:
+            # Fail open: losing rate limiting beats failing every request
+            logger.warning(f"Rate limit backend unavailable: {e}")
+            return True, 0.0
+
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / policy.rate
+
+
+def default_policies() -> List[RateLimitPolicy]:
+    # First match wins, so the specific auth policies precede the catch-all
+    return [
+        RateLimitPolicy(
+            name="login",
+            limit=settings.rate_limit_login_requests,
+            period=settings.rate_limit_login_period,
+            path_prefix="/auth/login",
+            methods=("POST",),
+            key="ip",
+        ),
+        RateLimitPolicy(
+            name="register",
+            limit=settings.rate_limit_login_requests,
+            period=settings.rate_limit_login_period,
+            path_prefix="/auth/register",
+            methods=("POST",),
+            key="ip",
+        ),
+        RateLimitPolicy(
+            name="default",
+            limit=settings.rate_limit_requests,
+            period=settings.rate_limit_period,
+        ),
+    ]
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware so a rejected request never reaches routing,
+    dependency injection, a DB session or body validation."""
+
+    def __init__(self, app: ASGIApp, policies: Sequence[RateLimitPolicy], backend):
+        self.app = app
+        self.policies = list(policies)
+        self.backend = backend
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        policy = self._match(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = f"rl:{policy.name}:{self._client_key(scope, policy)}"
+        allowed, retry_after = await self.backend.hit(key, policy)
+
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        await self._reject(send, policy, retry_after)
+
+    def _match(self, method: str, path: str) -> Optional[RateLimitPolicy]:
+        for policy in self.policies:
+            if policy.matches(method, path):
+                return policy
+        return None
+
+    def _client_key(self, scope: Scope, policy: RateLimitPolicy) -> str:
+        headers = dict(scope["headers"])
+
+        if policy.key == "principal":
+            authorization = headers.get(b"authorization", b"")
+            if authorization.lower().startswith(b"bearer "):
+                # Only a token that verifies names a principal; anything
+                # else is limited by IP, so minting junk tokens doesn't buy
+                # fresh buckets. verify_token caches decoded tokens.
+                payload = verify_token(authorization[7:].decode("latin-1").strip())
+                if payload and payload.get("user_id"):
+                    return "user:" + payload["user_id"]
+
+        if settings.rate_limit_trust_forwarded:
+            forwarded = headers.get(b"x-forwarded-for")
+            if forwarded:
+                return "ip:" + forwarded.split(b",")[0].strip().decode("latin-1")
+
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    async def _reject(self, send: Send, policy: RateLimitPolicy, retry_after: float) -> None:
+        body = json.dumps({
+            "error": {
+                "code": "RATE_LIMITED",
+                "message": "Too many requests, please slow down",
+                "details": [],
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+            }
+        }).encode()
+
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, int(retry_after + 0.999))).encode()),
+                (b"x-ratelimit-limit", str(policy.limit).encode()),
+                (b"x-ratelimit-policy", policy.name.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def setup_rate_limiting(app: FastAPI):
+    """Configure rate limiting middleware."""
+    if not settings.rate_limit_enabled:
+        return
+
+    if settings.rate_limit_backend == "redis":
+        backend = RedisRateLimitBackend(settings.redis_url)
+    else:
+        backend = InMemoryRateLimitBackend()
+
+    app.add_middleware(RateLimitMiddleware, policies=default_policies(), backend=backend)
@@ -0,0 +1,56 @@
+import time
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from ..core.write_tracker import principal_id, write_tracker
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReadYourWritesMiddleware:
+    """Marks a client that just wrote so its reads stay on the primary.
+
+    A successful unsafe request by an authenticated user is recorded in
+    ``write_tracker`` against the user id, so every device and tab of that
+    user skips the replicas for ``read_your_writes_window`` seconds, which
+    covers replication lag for everything they changed. Anonymous clients
+    get a short-lived cookie holding the same deadline instead; one that
+    forges it only costs itself replica reads.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        user_id = principal_id(dict(scope["headers"]).get(b"authorization", b"").decode("latin-1"))
+
+        async def send_with_mark(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                if user_id:
+                    await write_tracker.mark(user_id)
+                else:
+                    window = settings.read_your_writes_window
+                    cookie = (
+                        f"{settings.read_your_writes_cookie}={time.time() + window:.0f}; "
+                        f"Max-Age={window}; Path=/; HttpOnly; Secure; SameSite=None"
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"set-cookie", cookie.encode("latin-1"))
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_mark)
+
+
+def setup_read_your_writes(app: FastAPI):
+    """Configure read-your-writes stickiness; only needed with replicas."""
+    if not settings.database_replica_urls:
+        return
+
+    app.add_middleware(ReadYourWritesMiddleware)
@@ -2,6 +2,9 @@ from .user import User
 from .post import Post
 from .comment import Comment
 from .community import Community
-from .notification import Notification
+from .notification import Notification, NotificationOutbox, NotificationFanout
+from .token import RevokedToken
+from .stats import UserStats
+from .ai_usage import AIUsage
 
-__all__ = ["User", "Post", "Comment", "Community", "Notification"]
\ No newline at end of file
+__all__ = ["User", "Post", "Comment", "Community", "Notification", "NotificationOutbox", "NotificationFanout", "RevokedToken", "UserStats", "AIUsage"]
\ No newline at end of file
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Integer
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+import uuid
+from datetime import date, datetime
+from ..database import Base
+
+
+class AIUsage(Base):
+    """AI requests, upstream calls and tokens per user per UTC day, flushed
+    from each worker's in-memory counters."""
+    __tablename__ = "ai_usage"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    requests: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    upstream_calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<AIUsage {self.day} {self.user_id}>"
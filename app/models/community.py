@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum, Integer, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, Enum, Integer, ForeignKey, Boolean, UniqueConstraint, Index, false
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -49,10 +49,15 @@ class CommunityMember(Base):
     community_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("communities.id"), nullable=False)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False)
+    notifications_muted: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
     joined_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     community = relationship("Community", back_populates="members")
     user = relationship("User")
     
-    __table_args__ = (UniqueConstraint('community_id', 'user_id', name='unique_community_member'),)
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint('community_id', 'user_id', name='unique_community_member'),
+        # Keyset order used when fanning notifications out to members
+        Index('ix_community_members_community_id_id', 'community_id', 'id'),
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import String, DateTime, Enum, Boolean, ForeignKey
+from sqlalchemy import String, DateTime, Enum, Boolean, ForeignKey, Integer, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -16,6 +16,13 @@ class NotificationType(str, enum.Enum):
     COMMUNITY_INVITE = "COMMUNITY_INVITE"
 
 
+class FanoutStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
 class Notification(Base):
     __tablename__ = "notifications"
 
@@ -26,15 +33,15 @@ class Notification(Base):
 
     # Target relationships
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    post_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("posts.id"), nullable=True)
-    comment_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("comments.id"), nullable=True)
+    post_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), nullable=True)
+    comment_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
     community_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("communities.id"), nullable=True)
 
     # Metadata
     meta: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # Additional data
 
-    # Timestamps
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Timestamps (also the partition key, hence part of the primary key)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
 
     # Relationships
     user = relationship("User")
@@ -42,5 +49,69 @@ class Notification(Base):
     comment = relationship("Comment")
     community = relationship("Community")
 
+    # Range-partitioned by month; partitions are created and retired by
+    # services.notification_partitions
+    __table_args__ = (
+        Index("ix_notifications_user_created", "user_id", text("created_at DESC")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    def __repr__(self):
+        return f"<Notification {self.type}: {self.message[:50]}...>"
+
+
+class NotificationOutbox(Base):
+    """Notification intent written in the same transaction as the triggering
+    write and delivered to ``notifications`` by the background dispatcher."""
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    type: Mapped[NotificationType] = mapped_column(Enum(NotificationType), nullable=False)
+    message: Mapped[str] = mapped_column(String(500), nullable=False)
+
+    # Target relationships (copied verbatim onto the delivered notification)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    post_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    comment_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    community_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    meta: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+    # Delivery bookkeeping
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<NotificationOutbox {self.type} -> {self.user_id}>"
+
+
+class NotificationFanout(Base):
+    """Background job that notifies every member of a community, in chunks,
+    with its progress persisted so it survives restarts."""
+    __tablename__ = "notification_fanouts"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    type: Mapped[NotificationType] = mapped_column(Enum(NotificationType), nullable=False)
+    message: Mapped[str] = mapped_column(String(500), nullable=False)
+    meta: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+    community_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("communities.id"), nullable=False)
+    post_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), nullable=True, index=True)
+    actor_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+
+    # Progress
+    status: Mapped[FanoutStatus] = mapped_column(Enum(FanoutStatus), default=FanoutStatus.PENDING, nullable=False)
+    cursor: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)  # last community_members.id processed
+    total_members: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    notified: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+    finished_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     def __repr__(self):
-        return f"<Notification {self.type}: {self.message[:50]}...>"
\ No newline at end of file
+        return f"<NotificationFanout {self.type} community={self.community_id} {self.status}>"
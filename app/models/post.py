@@ -38,7 +38,7 @@ class Post(Base):
 
     # ─── Author ──────────────────────────────────────────────────────────
     author_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
     )
     author = relationship("User", back_populates="posts")
 
@@ -149,7 +149,7 @@ class PostSave(Base):
         UUID(as_uuid=True), ForeignKey("posts.id"), nullable=False
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
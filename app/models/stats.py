@@ -0,0 +1,25 @@
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+import uuid
+from datetime import datetime
+from ..database import Base
+
+
+class UserStats(Base):
+    """Per-user counters maintained on post/comment/save/upvote writes and
+    periodically reconciled against the source tables."""
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    post_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    comment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    saved_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    upvotes_received: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<UserStats {self.user_id}>"
@@ -0,0 +1,32 @@
+from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+import uuid
+from datetime import datetime
+from typing import Optional
+from ..database import Base
+import enum
+
+
+class RevocationScope(str, enum.Enum):
+    TOKEN = "TOKEN"    # a single token, by its jti
+    FAMILY = "FAMILY"  # every token issued from one login (the "fam" claim)
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # jti for TOKEN scope, family id for FAMILY scope
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    scope: Mapped[str] = mapped_column(String(10), nullable=False, default=RevocationScope.TOKEN.value)
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    reason: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+
+    # Rows can be purged once every token they cover has expired
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    # Insert time, not transaction start, so it is a usable sync cursor
+    revoked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.clock_timestamp(), index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken {self.scope} {self.jti}>"
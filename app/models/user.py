@@ -1,4 +1,4 @@
-from sqlalchemy import String, DateTime, Enum, JSON, Boolean
+from sqlalchemy import String, DateTime, Enum, JSON, Boolean, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
@@ -66,5 +66,10 @@ class User(Base):
     created_communities = relationship("Community", back_populates="creator", cascade="all, delete-orphan")
     
     
+    __table_args__ = (
+        # LIKE 'prefix%' lookups for availability checks and suffix allocation
+        Index("ix_users_username_pattern", "username", postgresql_ops={"username": "text_pattern_ops"}),
+    )
+    
     def __repr__(self):
         return f"<User {self.username}>"
\ No newline at end of file
@@ -44,6 +44,22 @@ class RegisterRequest(BaseModel):
         return v
 
 
+class UsernameAvailability(BaseModel):
+    username: str
+    available: bool
+    suggestion: Optional[str] = None
+
+
+class EmailAvailability(BaseModel):
+    email: str
+    available: bool
+
+
+class AvailabilityResponse(BaseModel):
+    username: Optional[UsernameAvailability] = None
+    email: Optional[EmailAvailability] = None
+
+
 class UserCreate(BaseModel):
     username: str
     email: EmailStr
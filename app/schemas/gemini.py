@@ -1,4 +1,6 @@
 from pydantic import BaseModel, Field
+from datetime import date
+from typing import List, Optional
 
 
 class RefinePostRequest(BaseModel):
@@ -17,3 +19,41 @@ class GenerateTitleRequest(BaseModel):
 
 class GenerateTitleResponse(BaseModel):
     title: str
+
+
+class BatchDraft(BaseModel):
+    id: Optional[str] = Field(default=None, max_length=100)  # echoed back to match results
+    text: str = Field(..., min_length=1)
+    post_type: str = Field(..., min_length=1)
+
+
+class BatchRefineRequest(BaseModel):
+    drafts: List[BatchDraft] = Field(..., min_length=1)
+    refine: bool = True
+    title: bool = True
+
+
+class AIBudget(BaseModel):
+    used: int
+    limit: int
+
+
+class AIUserUsage(BaseModel):
+    day: date
+    requests: AIBudget
+    tokens: AIBudget
+    upstream_calls: int
+
+
+class AIGlobalUsage(BaseModel):
+    day: date
+    upstream_calls: AIBudget
+    tokens: AIBudget
+    requests_admitted: int
+    rejected: int
+    enforced: bool
+
+
+class AIUsageReport(BaseModel):
+    user: AIUserUsage
+    global_usage: Optional[AIGlobalUsage] = None  # admins only
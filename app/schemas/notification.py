@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 from uuid import UUID
-from ..models.notification import NotificationType
+from ..models.notification import NotificationType, FanoutStatus
 
 
 class NotificationCreate(BaseModel):
@@ -27,4 +27,20 @@ class NotificationResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class NotificationFanoutResponse(BaseModel):
+    id: UUID
+    type: NotificationType
+    status: FanoutStatus
+    community_id: UUID
+    post_id: Optional[UUID]
+    total_members: Optional[int]
+    processed: int
+    notified: int
+    created_at: datetime
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
@@ -33,6 +33,8 @@ class PostCreate(PostBase):
 
     is_pinned: bool = False
 
+    community_id: Optional[UUID] = None
+
     @field_validator("event_time")
     @classmethod
     def validate_event_time(cls, v):
@@ -67,6 +69,7 @@ class PostResponse(PostBase):
     is_pinned: bool
     is_saved: bool = False
     is_upvoted: bool = False
+    community_id: Optional[UUID] = None
 
     event_date: Optional[date] = None
     event_time: Optional[str] = None
@@ -67,4 +67,49 @@ class UserStats(BaseModel):
     post_count: int
     upvote_count: int
     comment_count: int
-    saved_count: int
\ No newline at end of file
+    saved_count: int
+
+
+class UserProvisionRow(BaseModel):
+    """One row of a bulk provisioning CSV."""
+    email: EmailStr
+    display_name: str = Field(min_length=2, max_length=100)
+    college: College
+    department: str = Field(min_length=2, max_length=100)
+    username: Optional[str] = Field(default=None, max_length=50)
+    password: Optional[str] = Field(default=None, min_length=6)
+    role: UserRole = Field(default=UserRole.STUDENT)
+
+    @field_validator("email", mode="after")
+    @classmethod
+    def validate_email(cls, v):
+        if not v.endswith("@stu.cu.edu.ng"):
+            raise ValueError("only Student emails are allowed")
+        return v
+
+    @field_validator("role", mode="after")
+    @classmethod
+    def validate_role(cls, v):
+        if v == UserRole.ADMIN:
+            raise ValueError("admins cannot be bulk provisioned")
+        return v
+
+
+class ProvisionedUser(BaseModel):
+    line: int
+    email: str
+    username: str
+    # Only set when the CSV row had no password
+    temporary_password: Optional[str] = None
+
+
+class ProvisioningIssue(BaseModel):
+    line: int
+    email: Optional[str] = None
+    message: str
+
+
+class ProvisioningReport(BaseModel):
+    created: List[ProvisionedUser]
+    skipped: List[ProvisioningIssue]
+    errors: List[ProvisioningIssue]
@@ -1,5 +1,6 @@
 from .auth import AuthService
 from .post_service import PostService
 from .gemini_service import GeminiService
+from .notification_dispatcher import NotificationDispatcher
 
-__all__ = ["AuthService", "PostService", "GeminiService"]
\ No newline at end of file
+__all__ = ["AuthService", "PostService", "GeminiService", "NotificationDispatcher"]
\ No newline at end of file
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import logging
+from typing import Optional
+
+from ..config import settings
+from ..core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a prompt template changes so old outputs are never served
+PROMPT_VERSION = "1"
+
+
+class AICache:
+    """Content-addressed cache of model outputs.
+
+    Keys hash the prompt version, the task, the post type and the input
+    text, so identical requests from any user share an entry. Lookups try
+    the per-worker LRU first, then Redis (shared by all workers, survives
+    restarts) when ``ai_cache_backend`` is "redis". Each entry remembers
+    how long the upstream call took, which is what a hit saves.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl: Optional[int] = None,
+        redis_url: Optional[str] = None,
+    ):
+        self.ttl = ttl or settings.ai_cache_ttl
+        self.local = TTLCache(maxsize=maxsize or settings.ai_cache_size, ttl=self.ttl)
+        self._redis = None
+        if redis_url:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(redis_url)
+
+        self.redis_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def key(kind: str, post_type: str, text: str) -> str:
+        digest = hashlib.sha256(
+            "\0".join((PROMPT_VERSION, kind, post_type, text)).encode()
+        ).hexdigest()
+        return f"ai:{kind}:{digest}"
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self.local.get(key)
+
+        if entry is None and self._redis is not None:
+            try:
+                raw = await self._redis.get(key)
+            except Exception as e:
+                logger.warning(f"AI cache backend unavailable: {e}")
+                raw = None
+
+            if raw is not None:
+                entry = tuple(json.loads(raw))
+                self.local.set(key, entry)
+                self.redis_hits += 1
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, latency = entry
+        self.saved_seconds += latency
+        return value
+
+    async def set(self, key: str, value: str, latency: float) -> None:
+        entry = (value, latency)
+        self.local.set(key, entry)
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, json.dumps(entry), ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"AI cache backend unavailable: {e}")
+
+    def stats(self) -> dict:
+        local = self.local.stats()
+        hits = local["hits"] + self.redis_hits
+        lookups = hits + self.misses
+        return {
+            "backend": "redis" if self._redis is not None else "memory",
+            "size": local["size"],
+            "maxsize": local["maxsize"],
+            "local_hits": local["hits"],
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "saved_upstream_seconds": round(self.saved_seconds, 3),
+        }
+
+
+def build_ai_cache() -> Optional[AICache]:
+    if not settings.ai_cache_enabled:
+        return None
+
+    redis_url = settings.redis_url if settings.ai_cache_backend == "redis" else None
+    return AICache(redis_url=redis_url)
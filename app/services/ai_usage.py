@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import BackgroundSessionLocal
+from ..core.errors import QuotaExceededError
+from ..crud.ai_usage import get_ai_usage_crud
+
+logger = logging.getLogger(__name__)
+
+# The user that upstream AI calls made in this context are charged to. Set
+# when a request is admitted; tasks it starts (coalesced calls, hedges,
+# batch drafts, response streams) inherit it.
+current_ai_user: ContextVar[Optional[str]] = ContextVar("current_ai_user", default=None)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    # About four characters per token for English text
+    return (len(text) + 3) // 4 if text else 0
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+@dataclass
+class Usage:
+    requests: int = 0
+    upstream_calls: int = 0
+    tokens: int = 0
+
+    def __add__(self, other: "Usage") -> "Usage":
+        return Usage(
+            self.requests + other.requests,
+            self.upstream_calls + other.upstream_calls,
+            self.tokens + other.tokens,
+        )
+
+    def as_tuple(self) -> Tuple[int, int, int]:
+        return self.requests, self.upstream_calls, self.tokens
+
+
+class AIUsageMeter:
+    """Per-user and global daily AI budgets.
+
+    Usage is counted in memory, so admitting a request costs no I/O beyond
+    loading a user's total the first time this worker sees them each day.
+    Every ``interval`` seconds the new counts are added to ``ai_usage`` and
+    the totals of all workers are read back; a budget can therefore be
+    overshot by what other workers used since their last flush.
+
+    Requests are counted when admitted; upstream calls and tokens when the
+    model is actually called, so cache hits, coalesced callers and local
+    titles cost nothing. Not thread-safe; event loop only.
+    """
+
+    def __init__(self, session_factory=BackgroundSessionLocal, interval: Optional[float] = None):
+        self.session_factory = session_factory
+        self.interval = interval or settings.ai_usage_flush_interval
+        self.day = _today()
+
+        # Today's totals from the table (every worker), what is being
+        # flushed right now, and what this worker counted since
+        self._persisted: Dict[str, Usage] = {}
+        self._flushing: Dict[Tuple[date, str], Usage] = {}
+        self._pending: Dict[Tuple[date, str], Usage] = {}
+        self._global_persisted = Usage()
+        self._global_flushing = Usage()
+        self._global_pending = Usage()
+
+        self.rejected = 0
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _roll_over(self) -> None:
+        today = _today()
+        if today == self.day:
+            return
+
+        # Unflushed counts keep their own day and are still written out
+        self.day = today
+        self._persisted.clear()
+        self._global_persisted = self._global_flushing = self._global_pending = Usage()
+
+    def usage(self, user_id: str) -> Usage:
+        key = (self.day, user_id)
+        return (
+            self._persisted.get(user_id, Usage())
+            + self._flushing.get(key, Usage())
+            + self._pending.get(key, Usage())
+        )
+
+    def global_usage(self) -> Usage:
+        return self._global_persisted + self._global_flushing + self._global_pending
+
+    def _count(self, user_id: Optional[str], usage: Usage) -> None:
+        self._global_pending = self._global_pending + usage
+        if user_id:
+            key = (self.day, user_id)
+            self._pending[key] = self._pending.get(key, Usage()) + usage
+
+    def _reject(self, message: str, scope: str, resource: str, limit: int) -> None:
+        self.rejected += 1
+        resets_at = datetime.combine(self.day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        raise QuotaExceededError(message, details=[{
+            "scope": scope,
+            "resource": resource,
+            "limit": limit,
+            "resets_at": resets_at.isoformat(),
+        }])
+
+    async def _load(self, db: AsyncSession, user_id: str) -> None:
+        if user_id in self._persisted:
+            return
+
+        day = self.day
+        counts = await get_ai_usage_crud().get(db, day, uuid.UUID(user_id))
+        if day == self.day:
+            self._persisted.setdefault(user_id, Usage(*counts))
+
+    async def admit(self, db: AsyncSession, user_id: str, requests: int = 1) -> None:
+        """Count ``requests`` AI requests for a user, raising
+        QuotaExceededError instead if that would break a budget. Upstream
+        calls made for the rest of the request are charged to this user."""
+        self._roll_over()
+
+        if settings.ai_quota_enabled:
+            await self._load(db, user_id)
+            used = self.usage(user_id)
+            if used.requests + requests > settings.ai_user_daily_requests:
+                self._reject("Daily AI request limit reached", "user", "requests", settings.ai_user_daily_requests)
+            self.check_budget(user_id)
+
+        self._count(user_id, Usage(requests=requests))
+        current_ai_user.set(user_id)
+
+    def check_budget(self, user_id: Optional[str] = None) -> None:
+        """Raise QuotaExceededError if the user's token budget or the
+        global budget is spent. Called before every upstream call."""
+        if not settings.ai_quota_enabled:
+            return
+        self._roll_over()
+
+        user_id = user_id or current_ai_user.get()
+        if user_id and self.usage(user_id).tokens >= settings.ai_user_daily_tokens:
+            self._reject("Daily AI token limit reached", "user", "tokens", settings.ai_user_daily_tokens)
+
+        total = self.global_usage()
+        if total.upstream_calls >= settings.ai_global_daily_requests:
+            self._reject("AI is over its daily capacity", "global", "requests", settings.ai_global_daily_requests)
+        if total.tokens >= settings.ai_global_daily_tokens:
+            self._reject("AI is over its daily capacity", "global", "tokens", settings.ai_global_daily_tokens)
+
+    def charge(self, tokens: int, upstream_calls: int = 1) -> None:
+        """Record an upstream call against the current user and the global
+        budget."""
+        self._roll_over()
+        self._count(current_ai_user.get(), Usage(upstream_calls=upstream_calls, tokens=tokens))
+
+    async def run_once(self) -> int:
+        """Write this worker's new usage and refresh every worker's totals;
+        returns how many rows were written."""
+        self._roll_over()
+        day = self.day
+        ai_usage_crud = get_ai_usage_crud()
+
+        self._flushing, self._pending = self._pending, {}
+        self._global_flushing, self._global_pending = self._global_pending, Usage()
+        deltas = {
+            (d, uuid.UUID(user_id)): usage.as_tuple()
+            for (d, user_id), usage in self._flushing.items()
+            if any(usage.as_tuple())
+        }
+
+        try:
+            async with self.session_factory() as db:
+                try:
+                    await ai_usage_crud.add_many(db, deltas)
+                    await db.commit()
+                except Exception:
+                    # Hand the counts back so the next flush retries them
+                    for key, usage in self._flushing.items():
+                        self._pending[key] = self._pending.get(key, Usage()) + usage
+                    self._global_pending = self._global_pending + self._global_flushing
+                    self._flushing, self._global_flushing = {}, Usage()
+                    raise
+
+                user_ids = set(self._persisted) | {u for (d, u) in self._flushing if d == day}
+                totals = await ai_usage_crud.get_many(db, day, [uuid.UUID(u) for u in user_ids])
+                global_totals = await ai_usage_crud.totals(db, day)
+        except Exception:
+            # Written but not read back: fold what was written into the totals
+            if self._flushing or any(self._global_flushing.as_tuple()):
+                for (d, user_id), usage in self._flushing.items():
+                    if d == self.day:
+                        self._persisted[user_id] = self._persisted.get(user_id, Usage()) + usage
+                if day == self.day:
+                    self._global_persisted = self._global_persisted + self._global_flushing
+                self._flushing, self._global_flushing = {}, Usage()
+            raise
+
+        if day == self.day:
+            for user_id in user_ids:
+                self._persisted[user_id] = Usage(*totals.get(uuid.UUID(user_id), (0, 0, 0)))
+            self._global_persisted = Usage(*global_totals)
+        self._flushing, self._global_flushing = {}, Usage()
+        return len(deltas)
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"AI usage flush failed: {e}")
+
+    def start(self) -> asyncio.Task:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        # Setting the event ends the wait early, so run() makes a final flush
+        self._stopping.set()
+
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+            self._task = None
+
+    async def report(self, db: AsyncSession, user_id: str) -> dict:
+        self._roll_over()
+        await self._load(db, user_id)
+        used = self.usage(user_id)
+        return {
+            "day": self.day,
+            "requests": {"used": used.requests, "limit": settings.ai_user_daily_requests},
+            "tokens": {"used": used.tokens, "limit": settings.ai_user_daily_tokens},
+            "upstream_calls": used.upstream_calls,
+        }
+
+    def global_report(self) -> dict:
+        self._roll_over()
+        used = self.global_usage()
+        return {
+            "day": self.day,
+            "upstream_calls": {"used": used.upstream_calls, "limit": settings.ai_global_daily_requests},
+            "tokens": {"used": used.tokens, "limit": settings.ai_global_daily_tokens},
+            "requests_admitted": used.requests,
+            "rejected": self.rejected,
+            "enforced": settings.ai_quota_enabled,
+        }
+
+
+# singleton instance
+ai_usage_meter = AIUsageMeter()
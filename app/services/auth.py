@@ -1,12 +1,22 @@
 from typing import Optional, Dict, Any
+from fastapi import status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 from ..crud.user import get_user_crud
-from ..core.security import create_access_token, create_refresh_token, verify_password
+from ..core.security import create_access_token, create_refresh_token, verify_password, verify_token, build_token_data
+from ..core.errors import APIError, UnauthorizedError
+from ..crud.token import get_revoked_token_crud
+from ..models.token import RevocationScope
+from .availability import availability_service
+from .token_revocation import revoke_token, revoke_family
 from ..schemas.auth import RegisterRequest
 from ..schemas.user import UserCreate
-from ..models.user import UserRole
+from ..models.user import User, UserRole
+
+# Retries when a concurrent registration wins the chosen username
+REGISTER_ATTEMPTS = 3
 
 
 class AuthService:
@@ -21,7 +31,7 @@ class AuthService:
             return None
         
         # Create tokens
-        token_data = {"user_id": str(user.id), "username": user.username}
+        token_data = build_token_data(user)
         access_token = create_access_token(token_data)
         refresh_token = create_refresh_token(token_data)
         
@@ -34,43 +44,60 @@ class AuthService:
             }
         }
     
+    @staticmethod
+    async def create_account(
+        db: AsyncSession, register_data: RegisterRequest, role: UserRole = UserRole.STUDENT
+    ) -> User:
+        """
+        Create a user with a username derived from the email. Raises
+        ValueError if the email is already registered, and a 409 APIError
+        if concurrent registrations keep taking the chosen username.
+        """
+        user_crud = get_user_crud()
+        
+        for attempt in range(REGISTER_ATTEMPTS):
+            # Email check and username suffix in a single query
+            email_taken, username = await availability_service.resolve_registration(db, register_data.email)
+            if email_taken:
+                raise ValueError("Email already registered")
+            
+            user_create = UserCreate(
+                username=username,
+                email=register_data.email,
+                display_name=register_data.display_name,
+                password=register_data.password,
+                role=role,
+                avatar_url=register_data.avatar_url,
+                bio=register_data.bio,
+                college=register_data.college,
+                department=register_data.department,
+                interests=register_data.interests or [],
+            )
+            
+            try:
+                user = await user_crud.create(db, obj_in=user_create)
+            except IntegrityError:
+                # A concurrent registration took the email or username
+                await db.rollback()
+                if attempt == REGISTER_ATTEMPTS - 1:
+                    raise APIError(
+                        code="USERNAME_CONFLICT",
+                        message="Could not reserve a username, please retry",
+                        status_code=status.HTTP_409_CONFLICT,
+                    )
+                continue
+            
+            availability_service.record(user.username, user.email)
+            return user
+    
     @staticmethod
     async def register(
         db: AsyncSession, register_data: RegisterRequest
     ) -> Dict[str, Any]:
-        user_crud = get_user_crud()
-        
-        # Check if email exists
-        existing = await user_crud.get_by_email(db, register_data.email)
-        if existing:
-            raise ValueError("Email already registered")
-        
-        # Generate username
-        username = register_data.email.split("@")[0]
-        existing_username = await user_crud.get_by_username(db, username)
-        
-        if existing_username:
-            import random
-            username = f"{username}{random.randint(100, 999)}"
-        
-        # Create user
-        user_create = UserCreate(
-            username=username,
-            email=register_data.email,
-            display_name=register_data.display_name,
-            password=register_data.password,
-            role=UserRole.STUDENT,
-            avatar_url=register_data.avatar_url,
-            bio=register_data.bio,
-            college=register_data.college,
-            department=register_data.department,
-            interests=register_data.interests or [],
-        )
-        
-        user = await user_crud.create(db, obj_in=user_create)
+        user = await AuthService.create_account(db, register_data)
         
         # Create tokens
-        token_data = {"user_id": str(user.id), "username": user.username}
+        token_data = build_token_data(user)
         access_token = create_access_token(token_data)
         refresh_token = create_refresh_token(token_data)
         
@@ -84,23 +111,44 @@ class AuthService:
         }
     
     @staticmethod
-    async def refresh_access_token(
+    async def rotate_refresh_token(
         db: AsyncSession, refresh_token: str
-    ) -> Optional[Dict[str, Any]]:
-        from ..core.security import verify_token
+    ) -> Dict[str, Any]:
+        """
+        Exchange a refresh token for a new pair. Each refresh token is
+        single-use: presenting one that was already rotated means it leaked,
+        so the whole login family is revoked.
+        """
+        # The database is authoritative here, not the in-memory mirror
+        payload = verify_token(refresh_token, token_type="refresh", check_revoked=False)
+        if not payload or "jti" not in payload:
+            raise UnauthorizedError("Invalid refresh token")
         
-        payload = verify_token(refresh_token, token_type="refresh")
-        if not payload:
-            return None
+        revoked_token_crud = get_revoked_token_crud()
+        revoked = await revoked_token_crud.get_revoked(
+            db, jti=payload["jti"], family=payload.get("fam")
+        )
+        if any(r.scope == RevocationScope.FAMILY.value for r in revoked):
+            raise UnauthorizedError("Invalid refresh token")
+        
+        # Atomic: of two concurrent uses, only one wins the insert
+        rotated = not revoked and await revoke_token(db, payload, reason="rotated")
+        if not rotated:
+            await revoke_family(db, payload, reason="refresh_reuse")
+            await db.commit()
+            raise UnauthorizedError("Refresh token reuse detected")
         
         user_crud = get_user_crud()
         user = await user_crud.get(db, uuid.UUID(payload["user_id"]))
         
         if not user:
-            return None
+            await db.rollback()
+            raise UnauthorizedError("User not found")
         
-        # Create new tokens
-        token_data = {"user_id": str(user.id), "username": user.username}
+        await db.commit()
+        
+        # Create new tokens in the same family
+        token_data = build_token_data(user, family=payload.get("fam"))
         new_access_token = create_access_token(token_data)
         new_refresh_token = create_refresh_token(token_data)
         
@@ -108,4 +156,21 @@ class AuthService:
             "access_token": new_access_token,
             "refresh_token": new_refresh_token,
             "token_type": "bearer",
-        }
\ No newline at end of file
+        }
+    
+    @staticmethod
+    async def refresh_access_token(
+        db: AsyncSession, refresh_token: str
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            return await AuthService.rotate_refresh_token(db, refresh_token)
+        except UnauthorizedError:
+            return None
+    
+    @staticmethod
+    async def logout(db: AsyncSession, payload: Dict[str, Any]) -> None:
+        # Revoke the presented access token and, through its family, every
+        # refresh token issued from the same login
+        await revoke_token(db, payload, reason="logout")
+        await revoke_family(db, payload, reason="logout")
+        await db.commit()
\ No newline at end of file
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import BackgroundSessionLocal
+from ..crud.user import get_user_crud
+from ..models.user import User
+from ..utils.bloom import BloomFilter
+from ..utils.helpers import suffixed_username, username_base
+
+logger = logging.getLogger(__name__)
+
+# Room for registrations between rebuilds before the error rate degrades
+BLOOM_HEADROOM = 1.5
+
+
+class AvailabilityService:
+    """Username/email availability for as-you-type checks and registration.
+
+    Each check is one indexed query. With ``availability_bloom_enabled`` an
+    in-memory Bloom filter of every username and email answers most checks
+    for free names without touching the database. The filter is rebuilt every
+    ``availability_bloom_refresh_interval`` seconds, so names registered
+    through another worker can be reported free until then; registration
+    never trusts the filter and always asks the database.
+    """
+
+    def __init__(self, session_factory=BackgroundSessionLocal, enabled: Optional[bool] = None):
+        self.session_factory = session_factory
+        self.enabled = settings.availability_bloom_enabled if enabled is None else enabled
+        self.bloom: Optional[BloomFilter] = None
+        self.bloom_built_at: Optional[float] = None
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _maybe_present(self, key: str) -> bool:
+        # No filter means "ask the database"
+        return self.bloom is None or key in self.bloom
+
+    def record(self, username: str, email: str) -> None:
+        """Add a newly created account to this worker's filter."""
+        if self.bloom is not None:
+            self.bloom.add(f"u:{username}")
+            self.bloom.add(f"e:{email}")
+
+    async def check_username(self, db: AsyncSession, username: str) -> Dict[str, Any]:
+        if not self._maybe_present(f"u:{username}"):
+            return {"username": username, "available": True, "suggestion": None}
+
+        user_crud = get_user_crud()
+        _, taken, next_suffix = await user_crud.get_availability(db, base=username)
+
+        return {
+            "username": username,
+            "available": not taken,
+            "suggestion": suffixed_username(username, next_suffix) if taken else None,
+        }
+
+    async def check_email(self, db: AsyncSession, email: str) -> Dict[str, Any]:
+        if not self._maybe_present(f"e:{email}"):
+            return {"email": email, "available": True}
+
+        user_crud = get_user_crud()
+        taken = await user_crud.get_by_email(db, email) is not None
+        return {"email": email, "available": not taken}
+
+    async def resolve_registration(self, db: AsyncSession, email: str) -> Tuple[bool, str]:
+        """Returns ``(email_taken, username)`` for a new account, where
+        ``username`` is derived from the email with the next free suffix."""
+        base = username_base(email)
+
+        user_crud = get_user_crud()
+        email_taken, username_taken, next_suffix = await user_crud.get_availability(db, base=base, email=email)
+
+        return email_taken, suffixed_username(base, next_suffix) if username_taken else base
+
+    async def rebuild(self) -> int:
+        user_crud = get_user_crud()
+        started = time.monotonic()
+
+        async with self.session_factory() as db:
+            count = (await db.execute(select(func.count(User.id)))).scalar_one()
+
+            bloom = BloomFilter(
+                capacity=int(max(count, 1000) * 2 * BLOOM_HEADROOM),
+                error_rate=settings.availability_bloom_error_rate,
+            )
+            async for username, email in user_crud.stream_identities(db):
+                bloom.add(f"u:{username}")
+                bloom.add(f"e:{email}")
+
+        # Swap in whole so checks never see a half-built filter
+        self.bloom = bloom
+        self.bloom_built_at = time.time()
+        logger.info(f"Availability filter rebuilt with {count} users in {time.monotonic() - started:.2f}s")
+        return count
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.rebuild()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Availability filter rebuild failed: {e}")
+
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=settings.availability_bloom_refresh_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> Optional[asyncio.Task]:
+        if not self.enabled:
+            return None
+
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping.set()
+
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+            self._task = None
+
+
+# singleton instance
+availability_service = AvailabilityService()
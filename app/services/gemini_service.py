@@ -1,25 +1,21 @@
-from typing import Optional
+from functools import partial
+from typing import AsyncIterator, Optional
+import asyncio
+import logging
 import os
-import google.generativeai as genai
+import time
 from ..config import settings
+from ..core.circuit_breaker import CircuitBreaker, CircuitState
+from ..core.metrics import Metrics
+from ..core.singleflight import SingleFlight
+from .ai_cache import AICache, build_ai_cache
+from .ai_usage import ai_usage_meter, estimate_tokens
+from .gemini_stub import StubGenerativeModel
+from .title_generator import title_generator
 
+logger = logging.getLogger(__name__)
 
-class GeminiService:
-    def __init__(self):
-        api_key = settings.gemini_api_key or os.getenv("GEMINI_API_KEY")
-        if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel("gemini-pro")
-            self.enabled = True
-        else:
-            self.enabled = False
-
-    async def refine_post_content(self, text: str, post_type: str) -> str:
-        if not self.enabled:
-            return text
-
-        try:
-            prompt = f"""
+REFINE_PROMPT = """
 You are an elite campus editor for 'Relay', a minimalist university discovery app.
 Refine the following text for a {post_type} post.
 
@@ -31,36 +27,319 @@ Rules:
 
 Original Text:
 "{text}"
-            """
+"""
+
+TITLE_PROMPT = """
+Generate a concise, professional title for a {post_type} post.
+Max 60 characters.
+
+Content:
+"{content}"
+
+Title:
+"""
+
+
+def _api_key() -> Optional[str]:
+    return settings.gemini_api_key or os.getenv("GEMINI_API_KEY")
+
+
+def model_configured() -> bool:
+    return settings.gemini_stub or bool(_api_key())
+
+
+def build_model():
+    """The configured model: the local stub, Gemini, or None without a key."""
+    if settings.gemini_stub:
+        return StubGenerativeModel()
+
+    api_key = _api_key()
+    if not api_key:
+        return None
+
+    # The SDK takes a few hundred ms to import; only pay for it when used
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(settings.gemini_model)
+
+
+def response_tokens(response, prompt: str) -> int:
+    """Tokens billed for a call: the model's own count when the SDK reports
+    one, else an estimate from the prompt and the answer."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None and getattr(usage, "total_token_count", None):
+        return usage.total_token_count
+    return estimate_tokens(prompt) + estimate_tokens(response_text(response))
+
+
+def response_text(response, strip: bool = True) -> Optional[str]:
+    # .text raises when the candidate was blocked or has no parts
+    try:
+        text = response.text
+    except (ValueError, AttributeError):
+        return None
+    if not text:
+        return None
+    return text.strip() if strip else text
+
+
+class GeminiService:
+    """Async access to the generative model.
+
+    Calls use the model's native async API, so the event loop never blocks
+    on the network. At most ``gemini_max_concurrency`` calls are in flight
+    per worker and each is bounded by ``gemini_timeout`` (queueing for a
+    slot included). Failures and timeouts fall back to local output;
+    cancellation (e.g. the client went away) propagates to the upstream call.
+
+    A circuit breaker skips the model entirely after repeated failed or
+    slow calls, and with ``gemini_hedge_after`` a call still pending after
+    that many seconds is raced against a duplicate.
+    """
+
+    def __init__(
+        self,
+        model=None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[AICache] = None,
+        hedge_after: Optional[float] = None,
+    ):
+        # The model is built on first use; see ``model``
+        self._model = model
+        self.enabled = model is not None or model_configured()
+        self.cache = cache if cache is not None else build_ai_cache()
+        self.inflight = SingleFlight()
+        self.timeout = timeout or settings.gemini_timeout
+        self.hedge_after = hedge_after if hedge_after is not None else settings.gemini_hedge_after
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.gemini_breaker_failure_threshold,
+            slow_call_threshold=settings.gemini_breaker_slow_call,
+            reset_timeout=settings.gemini_breaker_reset_timeout,
+        )
+        self.metrics = Metrics()
+        self._slots = asyncio.Semaphore(max_concurrency or settings.gemini_max_concurrency)
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = build_model()
+        return self._model
 
-            response = self.model.generate_content(prompt)
-            return response.text.strip() if response.text else text
+    async def _call(self, prompt: str):
+        async with self._slots:
+            start = time.perf_counter()
+            response = None
+            try:
+                response = await self.model.generate_content_async(prompt)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.metrics.observe("upstream_error", time.perf_counter() - start)
+                raise
+            finally:
+                # Every call that reached the model counts, answered or not
+                ai_usage_meter.charge(response_tokens(response, prompt))
 
+            latency = time.perf_counter() - start
+            self.metrics.observe("upstream", latency)
+            return response, latency
+
+    async def _hedged_call(self, prompt: str):
+        primary = asyncio.ensure_future(self._call(prompt))
+        attempts = [primary]
+        try:
+            # Only hedge a healthy dependency; a probe must stay a single call
+            if not self.hedge_after or self.breaker.state != CircuitState.CLOSED:
+                return await primary
+
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+            if not done:
+                self.metrics.incr("hedges")
+                attempts.append(asyncio.ensure_future(self._call(prompt)))
+
+            pending = set(attempts)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is not primary:
+                            self.metrics.incr("hedge_wins")
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+
+    async def generate(self, prompt: str) -> Optional[str]:
+        """One bounded upstream call; None on failure, timeout or an open
+        circuit."""
+        if not self.breaker.allow():
+            self.metrics.incr("short_circuited")
+            return None
+
+        start = time.perf_counter()
+        try:
+            response, latency = await asyncio.wait_for(self._hedged_call(prompt), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            self.metrics.incr("timeouts")
+            logger.warning(f"Gemini call timed out after {self.timeout:.1f}s")
+            return None
+        except asyncio.CancelledError:
+            self.breaker.record_abandoned()
+            raise
         except Exception as e:
-            print(f"Gemini refinement failed: {e}")
+            self.breaker.record_failure()
+            self.metrics.incr("errors")
+            logger.warning(f"Gemini call failed after {time.perf_counter() - start:.2f}s: {e}")
+            return None
+        finally:
+            self.metrics.observe("call", time.perf_counter() - start)
+
+        self.breaker.record_success(latency)
+        self.metrics.incr("successes")
+        return response_text(response)
+
+    async def generate_cached(self, kind: str, post_type: str, text: str, prompt: str) -> Optional[str]:
+        """``generate`` behind the content-addressed cache. Only real model
+        output is cached, never a fallback."""
+        key = AICache.key(kind, post_type, text)
+
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        ai_usage_meter.check_budget()
+
+        # Identical misses in flight at the same time share one upstream call
+        return await self.inflight.do(key, partial(self._generate_and_store, key, prompt))
+
+    async def _generate_and_store(self, key: str, prompt: str) -> Optional[str]:
+        start = time.perf_counter()
+        result = await self.generate(prompt)
+        if result and self.cache is not None:
+            await self.cache.set(key, result, time.perf_counter() - start)
+        return result
+
+    async def refine_post_content(self, text: str, post_type: str) -> str:
+        if not self.enabled:
             return text
 
-    async def generate_post_title(self, content: str, post_type: str) -> str:
+        refined = await self.generate_cached(
+            "refine", post_type, text, REFINE_PROMPT.format(post_type=post_type, text=text)
+        )
+        return refined or text
+
+    async def stream_refine(self, text: str, post_type: str) -> AsyncIterator[str]:
+        """Yield refined text in pieces as the model produces them.
+
+        Cached results and fallbacks come out as a single piece. A slot is
+        held for the whole stream and every wait (slot, first response,
+        next chunk) is bounded by the timeout. Closing the generator early,
+        e.g. when the client disconnects, abandons the upstream stream.
+        Streams are not coalesced; the finished text still fills the cache.
+        """
         if not self.enabled:
-            return content[:50].strip() + "..."
+            yield text
+            return
 
-        try:
-            prompt = f"""
-Generate a concise, professional title for a {post_type} post.
-Max 60 characters.
+        key = AICache.key("refine", post_type, text)
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
 
-Content:
-"{content[:500]}"
+        ai_usage_meter.check_budget()
 
-Title:
-            """
+        if not self.breaker.allow():
+            self.metrics.incr("short_circuited")
+            yield text
+            return
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.breaker.record_abandoned()
+            logger.warning("Gemini stream gave up waiting for a slot")
+            yield text
+            return
+
+        start = time.perf_counter()
+        prompt = REFINE_PROMPT.format(post_type=post_type, text=text)
+        parts = []
+        first_chunk = None
+        try:
+            response = await asyncio.wait_for(
+                self.model.generate_content_async(prompt, stream=True),
+                timeout=self.timeout,
+            )
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                except StopAsyncIteration:
+                    break
 
-            response = self.model.generate_content(prompt)
-            return response.text.strip() if response.text else content[:50].strip() + "..."
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                    self.metrics.observe("stream_first_chunk", first_chunk)
 
+                piece = response_text(chunk, strip=False)
+                if piece:
+                    # Leading whitespace of the whole answer is noise
+                    if not parts:
+                        piece = piece.lstrip()
+                    parts.append(piece)
+                    yield piece
+        except asyncio.CancelledError:
+            self.breaker.record_abandoned()
+            raise
+        except GeneratorExit:
+            self.breaker.record_abandoned()
+            raise
         except Exception as e:
-            print(f"Gemini title generation failed: {e}")
-            return content[:50].strip() + "..."
+            self.breaker.record_failure()
+            self.metrics.incr("errors")
+            logger.warning(f"Gemini stream failed after {time.perf_counter() - start:.2f}s: {e!r}")
+            if not parts:
+                yield text
+            return
+        finally:
+            self._slots.release()
+            ai_usage_meter.charge(estimate_tokens(prompt) + estimate_tokens("".join(parts)))
+
+        # Judge a stream's health by how soon it started, not how long it ran
+        self.breaker.record_success(first_chunk or 0.0)
+        self.metrics.incr("successes")
+        self.metrics.observe("stream", time.perf_counter() - start)
+
+        refined = "".join(parts).strip()
+        if not refined:
+            yield text
+        elif self.cache is not None:
+            await self.cache.set(key, refined, time.perf_counter() - start)
+
+    async def generate_post_title(self, content: str, post_type: str) -> str:
+        # Short posts get a local extractive title; the model adds little there
+        if not self.enabled or len(content.split()) <= settings.ai_title_local_max_words:
+            self.metrics.incr("titles_local")
+            return title_generator.generate(content, post_type)
+
+        content = content[:500]
+        title = await self.generate_cached(
+            "title", post_type, content, TITLE_PROMPT.format(post_type=post_type, content=content)
+        )
+        if not title:
+            self.metrics.incr("titles_local_fallback")
+            return title_generator.generate(content, post_type)
+        return title
 
 
 # ✅ singleton instance
@@ -0,0 +1,60 @@
+import asyncio
+import re
+from typing import AsyncIterator, Callable, Optional
+
+from ..config import settings
+
+_QUOTED = re.compile(r'"(.*)"', re.DOTALL)
+
+
+def echo_quoted(prompt: str) -> str:
+    """Default stub reply: the quoted user content of the prompt."""
+    matches = _QUOTED.findall(prompt)
+    return matches[-1].strip() if matches else prompt.strip()
+
+
+class StubResponse:
+    def __init__(self, text: str, chunks: Optional[list] = None, delay: float = 0.0):
+        self.text = text
+        self._chunks = chunks or []
+        self._delay = delay
+
+    async def __aiter__(self) -> AsyncIterator["StubResponse"]:
+        for chunk in self._chunks:
+            await asyncio.sleep(self._delay)
+            yield StubResponse(chunk)
+
+
+class StubGenerativeModel:
+    """Stand-in for ``genai.GenerativeModel`` with the same async surface.
+
+    Enabled with ``gemini_stub`` so the AI endpoints can be exercised (and
+    load tested) without network access or quota. ``responder`` maps a
+    prompt to the reply; ``latency`` is spread over the stream when
+    ``stream=True``.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[str], str] = echo_quoted,
+        latency: Optional[float] = None,
+        fail: Optional[Exception] = None,
+    ):
+        self.responder = responder
+        self.latency = settings.gemini_stub_latency if latency is None else latency
+        self.fail = fail
+        self.calls = 0
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        self.calls += 1
+        if self.fail is not None:
+            raise self.fail
+
+        text = self.responder(prompt)
+
+        if stream:
+            words = re.findall(r"\S+\s*", text) or [text]
+            return StubResponse(text, chunks=words, delay=self.latency / len(words))
+
+        await asyncio.sleep(self.latency)
+        return StubResponse(text)
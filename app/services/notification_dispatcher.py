@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from typing import Optional
+
+from ..config import settings
+from ..database import BackgroundSessionLocal
+from ..crud.notification import get_notification_crud
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """Drains ``notification_outbox`` into ``notifications`` in batches and
+    advances community fan-out jobs one chunk at a time.
+
+    Runs inside the API's lifespan or as a standalone worker
+    (``python -m app.services.notification_dispatcher``).
+    """
+
+    def __init__(
+        self,
+        session_factory=BackgroundSessionLocal,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        fanout_chunk_size: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.notification_outbox_batch_size
+        self.poll_interval = poll_interval or settings.notification_outbox_poll_interval
+        self.max_attempts = max_attempts or settings.notification_outbox_max_attempts
+        self.fanout_chunk_size = fanout_chunk_size or settings.notification_fanout_chunk_size
+        self._pending = False
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    def wake(self) -> None:
+        # Called after a request commits outbox rows so delivery doesn't
+        # have to wait for the next poll.
+        self._wakeup.set()
+
+    async def run_once(self) -> int:
+        delivered = await self.deliver_outbox()
+        delivered += await self.advance_fanout()
+        return delivered
+
+    async def deliver_outbox(self) -> int:
+        notification_crud = get_notification_crud()
+
+        async with self.session_factory() as db:
+            entries = await notification_crud.claim_outbox_batch(
+                db, limit=self.batch_size, max_attempts=self.max_attempts
+            )
+            if not entries:
+                return 0
+
+            # A full batch means there is probably more waiting
+            self._pending = self._pending or len(entries) >= self.batch_size
+
+            try:
+                async with db.begin_nested():
+                    delivered = await notification_crud.deliver_outbox_batch(db, entries=entries)
+            except Exception:
+                # One bad row (e.g. a deleted post) must not block the batch;
+                # retry row by row and park the failures.
+                delivered = 0
+                for entry in entries:
+                    try:
+                        async with db.begin_nested():
+                            delivered += await notification_crud.deliver_outbox_batch(db, entries=[entry])
+                    except Exception as e:
+                        entry.attempts += 1
+                        entry.last_error = str(e)[:500]
+                        logger.warning(f"Notification outbox entry {entry.id} failed: {e}")
+
+            await db.commit()
+            return delivered
+
+    async def advance_fanout(self) -> int:
+        notification_crud = get_notification_crud()
+
+        async with self.session_factory() as db:
+            job = await notification_crud.claim_fanout_job(db, max_attempts=self.max_attempts)
+            if not job:
+                return 0
+            job_id = job.id
+
+            try:
+                async with db.begin_nested():
+                    notified = await notification_crud.fan_out_chunk(
+                        db, job=job, chunk_size=self.fanout_chunk_size
+                    )
+                self._pending = True
+            except Exception as e:
+                await notification_crud.record_fanout_failure(
+                    db, job_id=job_id, error=str(e), max_attempts=self.max_attempts
+                )
+                logger.warning(f"Notification fan-out {job_id} failed: {e}")
+                notified = 0
+
+            # Each chunk commits on its own so progress is visible and a
+            # restart resumes from the stored cursor
+            await db.commit()
+            return notified
+
+    async def run(self) -> None:
+        logger.info("Notification dispatcher started")
+
+        while not self._stopping:
+            self._pending = False
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification dispatch error: {e}")
+
+            if self._pending:
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+        logger.info("Notification dispatcher stopped")
+
+    def start(self) -> asyncio.Task:
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+            self._task = None
+
+
+# singleton instance
+notification_dispatcher = NotificationDispatcher()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(notification_dispatcher.run())
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import BackgroundSessionLocal
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "notifications"
+DEFAULT_PARTITION = "notifications_default"
+PARTITION_NAME = re.compile(r"^notifications_p(\d{4})_(\d{2})$")
+
+# Arbitrary constant so only one worker runs maintenance at a time
+ADVISORY_LOCK_KEY = 72_270_001
+
+
+def add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y_%m}"
+
+
+class NotificationPartitionManager:
+    """Keeps monthly ``notifications`` partitions ahead of time and retires
+    old ones: read rows are purged after ``notification_read_retention_months``
+    and whole partitions are dropped (or moved to an archive schema) after
+    ``notification_retention_months``.
+    """
+
+    def __init__(
+        self,
+        session_factory=BackgroundSessionLocal,
+        months_ahead: Optional[int] = None,
+        read_retention_months: Optional[int] = None,
+        retention_months: Optional[int] = None,
+        archive_schema: Optional[str] = None,
+        interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.months_ahead = months_ahead if months_ahead is not None else settings.notification_partition_months_ahead
+        self.read_retention_months = read_retention_months or settings.notification_read_retention_months
+        self.retention_months = retention_months or settings.notification_retention_months
+        self.archive_schema = archive_schema or settings.notification_archive_schema
+        self.interval = interval or settings.notification_maintenance_interval
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def list_partitions(self, db: AsyncSession) -> Dict[date, str]:
+        result = await db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:parent AS regclass)"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+
+        partitions = {}
+        for (name,) in result.all():
+            match = PARTITION_NAME.match(name)
+            if match:
+                partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+        return partitions
+
+    async def ensure_partitions(self, db: AsyncSession) -> List[str]:
+        await db.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+
+        existing = await self.list_partitions(db)
+        this_month = datetime.now(timezone.utc).date().replace(day=1)
+
+        created = []
+        for offset in range(self.months_ahead + 1):
+            month = add_months(this_month, offset)
+            if month in existing:
+                continue
+
+            name = partition_name(month)
+            await db.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                )
+            )
+            created.append(name)
+
+        return created
+
+    async def apply_retention(self, db: AsyncSession) -> Dict[str, Any]:
+        this_month = datetime.now(timezone.utc).date().replace(day=1)
+        read_cutoff = add_months(this_month, -self.read_retention_months)
+        hard_cutoff = add_months(this_month, -self.retention_months)
+
+        purged_rows = 0
+        retired = []
+
+        for month, name in sorted((await self.list_partitions(db)).items()):
+            upper = add_months(month, 1)
+
+            if upper <= hard_cutoff:
+                await db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+                if self.archive_schema:
+                    await db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{self.archive_schema}"'))
+                    await db.execute(text(f'ALTER TABLE {name} SET SCHEMA "{self.archive_schema}"'))
+                else:
+                    await db.execute(text(f"DROP TABLE {name}"))
+                retired.append(name)
+            elif upper <= read_cutoff:
+                # Partition-local delete: never touches the recent partitions
+                result = await db.execute(text(f"DELETE FROM {name} WHERE read"))
+                purged_rows += result.rowcount or 0
+
+        return {"retired_partitions": retired, "purged_read_rows": purged_rows}
+
+    async def run_once(self) -> Dict[str, Any]:
+        async with self.session_factory() as db:
+            locked = (
+                await db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            ).scalar()
+            if not locked:
+                return {"skipped": True}
+
+            created = await self.ensure_partitions(db)
+            retention = await self.apply_retention(db)
+            await db.commit()
+
+        report = {"created_partitions": created, **retention}
+        if created or retention["retired_partitions"] or retention["purged_read_rows"]:
+            logger.info(f"Notification partition maintenance: {report}")
+        return report
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification partition maintenance failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> asyncio.Task:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping.set()
+
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+            self._task = None
+
+
+# singleton instance
+notification_partition_manager = NotificationPartitionManager()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    print(asyncio.run(notification_partition_manager.run_once()))
@@ -0,0 +1,185 @@
+import asyncio
+import csv
+import io
+import logging
+import multiprocessing
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..core.security import get_password_hash
+from ..crud.user import get_user_crud
+from ..models.user import User
+from ..schemas.user import UserProvisionRow
+from ..utils.helpers import next_free_username, username_base
+from .availability import availability_service
+
+logger = logging.getLogger(__name__)
+
+CSV_COLUMNS = ("email", "display_name", "college", "department", "username", "password", "role")
+REQUIRED_COLUMNS = ("email", "display_name", "college", "department")
+
+
+def parse_csv(text: str, max_rows: Optional[int] = None) -> Tuple[List[Tuple[int, UserProvisionRow]], List[Dict[str, Any]]]:
+    """Validate a provisioning CSV. Returns ``(line, row)`` pairs and the
+    issues for rows that failed validation or repeat an earlier email."""
+    reader = csv.DictReader(io.StringIO(text))
+    columns = [c.strip().lower() for c in reader.fieldnames or []]
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+    reader.fieldnames = columns
+    rows, errors, seen = [], [], set()
+
+    # Line 1 is the header
+    for line, record in enumerate(reader, start=2):
+        if max_rows and len(rows) + len(errors) >= max_rows:
+            raise ValueError(f"CSV has more than {max_rows} rows")
+
+        values = {k: (record.get(k) or "").strip() for k in CSV_COLUMNS}
+        data = {k: v for k, v in values.items() if v}
+        email = values["email"] or None
+
+        try:
+            row = UserProvisionRow(**data)
+        except PydanticValidationError as e:
+            message = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            errors.append({"line": line, "email": email, "message": message})
+            continue
+
+        if row.email.lower() in seen:
+            errors.append({"line": line, "email": row.email, "message": "Duplicate email in file"})
+            continue
+
+        seen.add(row.email.lower())
+        rows.append((line, row))
+
+    return rows, errors
+
+
+class UserProvisioner:
+    """Creates users from validated CSV rows in batches.
+
+    Per batch: one query for emails that already exist, one prefix query for
+    taken usernames (suffixes are allocated in memory), Argon2 hashing spread
+    over a process pool, and a single multi-row INSERT.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, hash_processes: Optional[int] = None):
+        self.batch_size = batch_size or settings.provisioning_batch_size
+        self.hash_processes = hash_processes or settings.provisioning_hash_processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Built on first use and reused: spawning the workers (a fresh
+        # interpreter each) costs more than a small batch of hashes.
+        # Spawned, not forked: forking a process that runs an event loop
+        # and holds DB connections is unsafe.
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.hash_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def provision(self, db: AsyncSession, rows: List[Tuple[int, UserProvisionRow]]) -> Dict[str, list]:
+        report = {"created": [], "skipped": [], "errors": []}
+        if not rows:
+            return report
+
+        pool = self._get_pool()
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            await self._provision_batch(db, batch, pool, report)
+
+        return report
+
+    async def _provision_batch(
+        self,
+        db: AsyncSession,
+        batch: List[Tuple[int, UserProvisionRow]],
+        pool: ProcessPoolExecutor,
+        report: Dict[str, list],
+    ) -> None:
+        user_crud = get_user_crud()
+
+        existing = await user_crud.get_existing_emails(db, [row.email for _, row in batch])
+        pending = []
+        for line, row in batch:
+            if row.email in existing:
+                report["skipped"].append({"line": line, "email": row.email, "message": "Email already registered"})
+            else:
+                pending.append((line, row))
+
+        if not pending:
+            return
+
+        # Resolve every username in the batch against a single query
+        bases = {line: row.username or username_base(row.email) for line, row in pending}
+        # Suffixed candidates of a long base are trimmed, so look up by the
+        # same prefix username_base keeps
+        taken = await user_crud.get_taken_usernames(db, (username_base(b) for b in bases.values()))
+
+        values, passwords, created = [], [], {}
+        for line, row in pending:
+            username = next_free_username(bases[line], taken)
+            taken.add(username)
+
+            temporary_password = None if row.password else secrets.token_urlsafe(9)
+            values.append({
+                "username": username,
+                "email": row.email,
+                "display_name": row.display_name,
+                "role": row.role,
+                "college": row.college,
+                "department": row.department,
+                "interests": [],
+                "is_verified": False,
+            })
+            passwords.append(row.password or temporary_password)
+            created[row.email] = {
+                "line": line,
+                "email": row.email,
+                "username": username,
+                "temporary_password": temporary_password,
+            }
+
+        loop = asyncio.get_running_loop()
+        hashes = await asyncio.gather(*[
+            loop.run_in_executor(pool, get_password_hash, password) for password in passwords
+        ])
+        for v, hashed in zip(values, hashes):
+            v["hashed_password"] = hashed
+
+        # Rows that lost a race with a concurrent registration are skipped
+        # rather than failing the batch
+        result = await db.execute(
+            insert(User).values(values).on_conflict_do_nothing().returning(User.email)
+        )
+        inserted = set(result.scalars().all())
+        await db.commit()
+
+        for email, entry in created.items():
+            if email in inserted:
+                availability_service.record(entry["username"], email)
+                report["created"].append(entry)
+            else:
+                report["skipped"].append({"line": entry["line"], "email": email, "message": "Email or username taken concurrently"})
+
+        logger.info(f"Provisioned {len(inserted)} of {len(batch)} users in batch")
+
+
+# singleton instance
+user_provisioner = UserProvisioner()
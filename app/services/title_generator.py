@@ -0,0 +1,192 @@
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from ..models.enums import PostType
+
+MAX_TITLE_LENGTH = 60
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9'&@#$%/+.-]*[A-Za-z0-9%])?")
+# Emoji, pictographs and other symbols that don't belong in a title
+_SYMBOLS = re.compile(
+    "[\U0001F000-\U0001FAFF\U00002600-\U000027BF\U0001F900-\U0001F9FF‍️]+"
+)
+_TRAILING = re.compile(r"[\s,;:.!?-]+$")
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from
+further get got had has have having he her here hers him his how i if in into is it its
+just let me more most my no nor not now of off on once only or other our ours out over own
+please same she should so some such than that the their theirs them then there these they
+this those through to too under until up very was we were what when where which while who
+whom why will with would you your yours hey hi hello guys everyone anyone someone dm
+""".split())
+
+# Words that signal what a post of each type is about
+TYPE_CUES: Dict[PostType, frozenset] = {
+    PostType.EVENT: frozenset("event workshop seminar meetup conference talk party hackathon concert session webinar festival tournament competition summit".split()),
+    PostType.OPPORTUNITY: frozenset("internship scholarship job role position grant fellowship apply application hiring opening vacancy program".split()),
+    PostType.MARKETPLACE: frozenset("sale selling sell buy price offer brand new used condition laptop phone books".split()),
+    PostType.LOST_AND_FOUND: frozenset("lost found missing wallet phone id card keys bag".split()),
+    PostType.CLUB: frozenset("club society members recruitment join meeting chapter team".split()),
+    PostType.BOUNTY: frozenset("bounty reward help needed wanted looking task pay paid".split()),
+    PostType.NEWS: frozenset("announcement update news notice release launch results".split()),
+    PostType.LINK: frozenset("link article video resource guide tutorial read watch".split()),
+    PostType.IDEA: frozenset("idea proposal project startup build concept".split()),
+}
+
+# Title frames per type; {phrase} is the extracted key phrase
+TEMPLATES: Dict[PostType, str] = {
+    PostType.MARKETPLACE: "For Sale: {phrase}",
+    PostType.OPPORTUNITY: "Opportunity: {phrase}",
+    PostType.BOUNTY: "Bounty: {phrase}",
+    PostType.CLUB: "{phrase}",
+    PostType.EVENT: "{phrase}",
+    PostType.NEWS: "{phrase}",
+    PostType.LINK: "{phrase}",
+    PostType.IDEA: "Idea: {phrase}",
+    PostType.CASUAL: "{phrase}",
+}
+
+# Used when the content has nothing to build a title from
+DEFAULT_TITLES: Dict[PostType, str] = {
+    PostType.OPPORTUNITY: "New opportunity",
+    PostType.IDEA: "New idea",
+    PostType.LINK: "Shared link",
+    PostType.EVENT: "Upcoming event",
+    PostType.MARKETPLACE: "Item for sale",
+    PostType.LOST_AND_FOUND: "Lost and found",
+    PostType.NEWS: "Campus news",
+    PostType.CLUB: "Club update",
+    PostType.BOUNTY: "New bounty",
+}
+DEFAULT_TITLE = "Untitled post"
+
+# Words the template already says, left out of keyword phrases
+TEMPLATE_WORDS: Dict[PostType, frozenset] = {
+    PostType.MARKETPLACE: frozenset("sale selling sell".split()),
+    PostType.OPPORTUNITY: frozenset(["opportunity"]),
+    PostType.BOUNTY: frozenset(["bounty"]),
+    PostType.IDEA: frozenset(["idea"]),
+    PostType.LOST_AND_FOUND: frozenset("lost found".split()),
+}
+
+
+def parse_post_type(post_type: str) -> Optional[PostType]:
+    try:
+        return PostType(post_type.strip().upper().replace(" ", "_").replace("&", "AND"))
+    except ValueError:
+        return None
+
+
+def _clean(text: str) -> str:
+    return " ".join(_SYMBOLS.sub(" ", text).split())
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    cut = text[:limit + 1].rsplit(" ", 1)[0]
+    return _TRAILING.sub("", cut[:limit])
+
+
+class TitleGenerator:
+    """Extractive titles from post content, without a model.
+
+    Words are scored by frequency, position (earlier is better),
+    capitalisation (likely names) and cue words for the post type. The best
+    of the first few sentences becomes the title when it fits; otherwise the
+    top keywords are kept in their original order. Per-type templates frame
+    the phrase (e.g. "For Sale: ..."). Runs in microseconds.
+    """
+
+    def __init__(self, max_length: int = MAX_TITLE_LENGTH, max_sentences: int = 3):
+        self.max_length = max_length
+        self.max_sentences = max_sentences
+
+    def _score_words(self, words: List[str], cues: frozenset) -> Dict[str, float]:
+        counts = Counter(w.lower() for w in words)
+        scores: Dict[str, float] = {}
+        total = len(words)
+
+        for position, word in enumerate(words):
+            key = word.lower()
+            if key in STOPWORDS or key in scores:
+                continue
+
+            score = counts[key]
+            score += 1.5 * (1 - position / total)  # earlier words lead
+            if word[0].isupper() and position > 0:
+                score += 1.0  # likely a name, venue or product
+            if any(c.isdigit() for c in word):
+                score += 0.5  # dates, prices, room numbers
+            if key in cues:
+                score += 2.0
+            scores[key] = score
+
+        return scores
+
+    def _best_sentence(self, sentences: List[str], scores: Dict[str, float]) -> Tuple[str, float]:
+        best, best_score = "", 0.0
+        for sentence in sentences[:self.max_sentences]:
+            words = _WORD.findall(sentence)
+            if not words:
+                continue
+            # Density, so a long sentence doesn't win just by being long
+            score = sum(scores.get(w.lower(), 0.0) for w in words) / (len(words) ** 0.5)
+            if score > best_score:
+                best, best_score = sentence, score
+        return best, best_score
+
+    def _keyword_phrase(self, words: List[str], scores: Dict[str, float], limit: int, skip: frozenset) -> str:
+        ranked = sorted((k for k in scores if k not in skip), key=scores.get, reverse=True)
+        chosen, length = set(), 0
+        for key in ranked:
+            if length + len(key) + 1 > limit:
+                break
+            chosen.add(key)
+            length += len(key) + 1
+
+        phrase, seen = [], set()
+        for word in words:
+            key = word.lower()
+            if key in chosen and key not in seen:
+                phrase.append(word)
+                seen.add(key)
+        return " ".join(phrase)
+
+    def generate(self, content: str, post_type: str) -> str:
+        text = _clean(content)
+        kind = parse_post_type(post_type)
+        words = _WORD.findall(text)
+        if not words:
+            # Empty, or only punctuation and symbols
+            return DEFAULT_TITLES.get(kind, DEFAULT_TITLE)
+
+        template = TEMPLATES.get(kind, "{phrase}")
+        if kind == PostType.LOST_AND_FOUND:
+            template = "Found: {phrase}" if re.search(r"\bfound\b", text, re.I) else "Lost: {phrase}"
+
+        limit = self.max_length - len(template.replace("{phrase}", ""))
+        scores = self._score_words(words, TYPE_CUES.get(kind, frozenset()))
+
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+        sentence, _ = self._best_sentence(sentences, scores)
+        sentence = _TRAILING.sub("", sentence)
+
+        if sentence and len(sentence) <= limit:
+            phrase = sentence
+        else:
+            phrase = self._keyword_phrase(words, scores, limit, TEMPLATE_WORDS.get(kind, frozenset())) or _truncate(text, limit)
+
+        phrase = _truncate(phrase, limit)
+        if not phrase:
+            return DEFAULT_TITLES.get(kind, DEFAULT_TITLE)
+        phrase = phrase[0].upper() + phrase[1:]
+        return template.format(phrase=phrase)
+
+
+# singleton instance
+title_generator = TitleGenerator()
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import BackgroundSessionLocal
+from ..core.revocation import revocation_list
+from ..crud.token import get_revoked_token_crud
+from ..models.token import RevocationScope
+
+logger = logging.getLogger(__name__)
+
+# revoked_at is taken at insert (clock_timestamp()), so a row can commit
+# after newer ones only by its insert-to-commit time; re-read that much
+SYNC_OVERLAP = timedelta(seconds=5)
+PURGE_EVERY = 720  # syncs between purges of expired rows
+
+
+def _user_id(payload: Dict[str, Any]) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(payload["user_id"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def revoke_token(db: AsyncSession, payload: Dict[str, Any], reason: str) -> bool:
+    """Revoke one token by its jti. Caller commits."""
+    revoked_token_crud = get_revoked_token_crud()
+
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    inserted = await revoked_token_crud.revoke(
+        db,
+        jti=payload["jti"],
+        scope=RevocationScope.TOKEN,
+        expires_at=expires_at,
+        user_id=_user_id(payload),
+        reason=reason,
+    )
+
+    revocation_list.add_token(payload["jti"], expires_at.timestamp())
+    return inserted
+
+
+async def revoke_family(db: AsyncSession, payload: Dict[str, Any], reason: str) -> None:
+    """Revoke every token issued from the same login. Caller commits."""
+    family = payload.get("fam")
+    if not family:
+        return
+
+    revoked_token_crud = get_revoked_token_crud()
+
+    # A family lives as long as its newest refresh token can
+    expires_at = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+    await revoked_token_crud.revoke(
+        db,
+        jti=family,
+        scope=RevocationScope.FAMILY,
+        expires_at=expires_at,
+        user_id=_user_id(payload),
+        reason=reason,
+    )
+
+    revocation_list.add_family(family, expires_at.timestamp())
+
+
+class TokenRevocationSync:
+    """Mirrors revocations made by other workers into ``revocation_list``."""
+
+    def __init__(self, session_factory=BackgroundSessionLocal, interval: Optional[float] = None):
+        self.session_factory = session_factory
+        self.interval = interval or settings.token_revocation_sync_interval
+        self._last_sync: Optional[datetime] = None
+        self._syncs = 0
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        revoked_token_crud = get_revoked_token_crud()
+
+        async with self.session_factory() as db:
+            since = self._last_sync - SYNC_OVERLAP if self._last_sync else None
+            rows = await revoked_token_crud.get_revoked_since(db, since)
+
+            self._syncs += 1
+            if self._syncs % PURGE_EVERY == 0:
+                await revoked_token_crud.purge_expired(db)
+                await db.commit()
+
+        for row in rows:
+            expires_at = row.expires_at.timestamp()
+            if row.scope == RevocationScope.FAMILY.value:
+                revocation_list.add_family(row.jti, expires_at)
+            else:
+                revocation_list.add_token(row.jti, expires_at)
+
+        revocation_list.prune()
+        # The cursor stays on the database clock, so worker clock skew
+        # can't skip rows
+        if rows:
+            newest = max(row.revoked_at for row in rows)
+            self._last_sync = max(newest, self._last_sync) if self._last_sync else newest
+        return len(rows)
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Token revocation sync failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> asyncio.Task:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping.set()
+
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+            self._task = None
+
+
+# singleton instance
+token_revocation_sync = TokenRevocationSync()
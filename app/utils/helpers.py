@@ -1,7 +1,7 @@
 import random
 import string
 from datetime import datetime
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Set
 import uuid
 
 
@@ -11,6 +11,39 @@ def generate_username(base: str) -> str:
     return f"{base}{suffix}"
 
 
+USERNAME_MAX_LENGTH = 50  # users.username column
+
+
+def username_base(email: str, max_length: int = 44) -> str:
+    """Username derived from an email's local part, leaving room for a
+    numeric suffix within the 50-character column."""
+    return email.split("@")[0][:max_length]
+
+
+def suffixed_username(base: str, n: int, max_length: int = USERNAME_MAX_LENGTH) -> str:
+    """``base`` followed by ``n``, with ``base`` trimmed so the result fits
+    in ``max_length``."""
+    return f"{base[:max_length - len(str(n))]}{n}"
+
+
+def next_free_username(base: str, taken: Set[str], max_length: int = USERNAME_MAX_LENGTH) -> str:
+    """``base`` if it is free, else ``base`` with the smallest free numeric
+    suffix, trimmed so the result fits in ``max_length``."""
+    base = base[:max_length]
+    if base not in taken:
+        return base
+    
+    n = 1
+    while suffixed_username(base, n, max_length) in taken:
+        n += 1
+    return suffixed_username(base, n, max_length)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so ``value`` matches literally (escape char ``\\``)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def format_datetime(dt: datetime) -> str:
     """Format datetime for display."""
     now = datetime.utcnow()
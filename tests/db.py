@@ -0,0 +1,73 @@
+"""Helpers for tests that run against Postgres (see ``postgres_url``)."""
+import uuid
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.models.community import Community, CommunityMember, CommunityType
+from app.models.enums import PostType
+from app.models.post import Post
+from app.models.user import College, User
+
+
+@asynccontextmanager
+async def rollback_session(url: str):
+    """A session whose commits are savepoints inside one transaction that is
+    rolled back at the end, so tests leave no rows behind."""
+    engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+            try:
+                yield session
+            finally:
+                await session.close()
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+async def make_user(db: AsyncSession, **fields) -> User:
+    name = f"test_{uuid.uuid4().hex[:12]}"
+    user = User(**{
+        "username": name,
+        "email": f"{name}@stu.cu.edu.ng",
+        "display_name": "Test User",
+        "hashed_password": "not-a-hash",
+        "college": College.CST,
+        "department": "Computer Science",
+        **fields,
+    })
+    db.add(user)
+    await db.flush()
+    return user
+
+
+async def make_post(db: AsyncSession, author: User, **fields) -> Post:
+    post = Post(**{
+        "type": PostType.CASUAL,
+        "title": "A test post",
+        "content": "Content of a test post.",
+        "author_id": author.id,
+        **fields,
+    })
+    db.add(post)
+    await db.flush()
+    return post
+
+
+async def make_community(db: AsyncSession, creator: User, members=(), muted=()) -> Community:
+    community = Community(
+        name=f"community_{uuid.uuid4().hex[:12]}",
+        description="A test community",
+        type=CommunityType.INTEREST,
+        creator_id=creator.id,
+    )
+    db.add(community)
+    await db.flush()
+    for user in members:
+        db.add(CommunityMember(community_id=community.id, user_id=user.id, notifications_muted=user in muted))
+    await db.flush()
+    return community
@@ -0,0 +1,122 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.config import settings
+from app.core.errors import QuotaExceededError
+from app.services.ai_usage import AIUsageMeter, Usage, current_ai_user
+
+from .db import make_user, rollback_session
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "ai_quota_enabled", True)
+    monkeypatch.setattr(settings, "ai_user_daily_requests", 3)
+    monkeypatch.setattr(settings, "ai_user_daily_tokens", 1000)
+    monkeypatch.setattr(settings, "ai_global_daily_requests", 100)
+    monkeypatch.setattr(settings, "ai_global_daily_tokens", 10_000)
+
+
+def known_user(meter: AIUsageMeter) -> str:
+    # Today's total already loaded, so admitting doesn't touch the database
+    user_id = str(uuid.uuid4())
+    meter._persisted[user_id] = Usage()
+    return user_id
+
+
+def test_requests_over_the_daily_limit_are_rejected(limits):
+    async def main():
+        meter = AIUsageMeter(session_factory=None)
+        user_id = known_user(meter)
+
+        for _ in range(3):
+            await meter.admit(None, user_id)
+        with pytest.raises(QuotaExceededError) as e:
+            await meter.admit(None, user_id)
+
+        assert e.value.details[0]["scope"] == "user"
+        assert meter.usage(user_id).requests == 3
+        assert meter.rejected == 1
+
+    asyncio.run(main())
+
+
+def test_tokens_are_charged_to_the_admitted_user(limits):
+    async def main():
+        meter = AIUsageMeter(session_factory=None)
+        user_id = known_user(meter)
+
+        await meter.admit(None, user_id)
+        assert current_ai_user.get() == user_id
+        meter.charge(600)
+        meter.check_budget()
+        meter.charge(600)
+
+        with pytest.raises(QuotaExceededError):
+            meter.check_budget()
+        assert meter.usage(user_id) == Usage(requests=1, upstream_calls=2, tokens=1200)
+
+    asyncio.run(main())
+
+
+def test_global_budget_applies_to_everyone(limits, monkeypatch):
+    monkeypatch.setattr(settings, "ai_global_daily_tokens", 500)
+
+    async def main():
+        meter = AIUsageMeter(session_factory=None)
+        first, second = known_user(meter), known_user(meter)
+
+        await meter.admit(None, first)
+        meter.charge(500)
+
+        with pytest.raises(QuotaExceededError) as e:
+            await meter.admit(None, second)
+        assert e.value.details[0]["scope"] == "global"
+
+    asyncio.run(main())
+
+
+def test_disabled_quota_counts_but_never_rejects(limits, monkeypatch):
+    monkeypatch.setattr(settings, "ai_quota_enabled", False)
+
+    async def main():
+        meter = AIUsageMeter(session_factory=None)
+        user_id = str(uuid.uuid4())
+
+        for _ in range(5):
+            await meter.admit(None, user_id)
+        assert meter.global_usage().requests == 5
+
+    asyncio.run(main())
+
+
+def test_flush_persists_usage_and_reads_back_every_workers_totals(postgres_url, limits):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            user = await make_user(db)
+            user_id = str(user.id)
+
+            # Two workers sharing the table
+            first = AIUsageMeter(session_factory=lambda: db)
+            second = AIUsageMeter(session_factory=lambda: db)
+
+            await first.admit(db, user_id)
+            first.charge(100)
+            await second.admit(db, user_id)
+            second.charge(50)
+
+            assert await first.run_once() == 1
+            assert await second.run_once() == 1
+            await first.run_once()
+
+            for meter in (first, second):
+                assert meter.usage(user_id) == Usage(requests=2, upstream_calls=2, tokens=150)
+
+            # The third request of the day is refused by either worker
+            await first.admit(db, user_id)
+            with pytest.raises(QuotaExceededError):
+                await first.admit(db, user_id)
+
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from app.core.errors import APIError
+from app.models.user import College
+from app.schemas.auth import RegisterRequest
+from app.services import auth as auth_service
+from app.services.auth import REGISTER_ATTEMPTS, AuthService
+
+from .db import make_user, rollback_session
+
+
+def test_losing_every_username_race_is_a_conflict(postgres_url, monkeypatch):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            taken = (await make_user(db)).username
+            await db.commit()
+
+            resolved = []
+
+            async def always_taken(db, email):
+                # As if another registration won the name every time
+                resolved.append(email)
+                return False, taken
+
+            monkeypatch.setattr(auth_service.availability_service, "resolve_registration", always_taken)
+            register_data = RegisterRequest(
+                email="new.student@stu.cu.edu.ng",
+                password="correct horse",
+                display_name="New Student",
+                department="Computer Science",
+                college=College.CST,
+            )
+
+            with pytest.raises(APIError) as e:
+                await AuthService.create_account(db, register_data)
+            assert (e.value.status_code, e.value.code) == (409, "USERNAME_CONFLICT")
+            assert len(resolved) == REGISTER_ATTEMPTS
+
+    asyncio.run(main())
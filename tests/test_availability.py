@@ -0,0 +1,45 @@
+import asyncio
+
+from app.services.availability import AvailabilityService
+from app.utils.helpers import USERNAME_MAX_LENGTH
+
+from .db import make_user, rollback_session
+
+
+def test_suggestions_for_long_names_fit_the_column(postgres_url):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            service = AvailabilityService(session_factory=lambda: db, enabled=False)
+            name = "a" * USERNAME_MAX_LENGTH
+            await make_user(db, username=name)
+
+            suggestions = []
+            for _ in range(10):
+                suggestion = (await service.check_username(db, name))["suggestion"]
+                suggestions.append(suggestion)
+                await make_user(db, username=suggestion)
+
+            assert all(len(s) == USERNAME_MAX_LENGTH for s in suggestions)
+            assert suggestions[0] == "a" * 49 + "1"
+            assert suggestions[-1] == "a" * 48 + "10"
+            assert len(set(suggestions)) == 10
+
+    asyncio.run(main())
+
+
+def test_registration_takes_the_next_suffix(postgres_url):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            service = AvailabilityService(session_factory=lambda: db, enabled=False)
+            email = "ada.obi@stu.cu.edu.ng"
+            assert await service.resolve_registration(db, email) == (False, "ada.obi")
+
+            await make_user(db, username="ada.obi")
+            await make_user(db, username="ada.obi7")
+            await make_user(db, username="ada.obie")  # same prefix, not a suffix
+            assert await service.resolve_registration(db, email) == (False, "ada.obi8")
+
+            await make_user(db, username="ada.obi8", email=email)
+            assert (await service.resolve_registration(db, email))[0]
+
+    asyncio.run(main())
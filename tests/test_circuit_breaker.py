@@ -0,0 +1,59 @@
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+
+
+def open_breaker(**kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=3, **kwargs)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = open_breaker(reset_timeout=60)
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+    assert breaker.times_opened == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_slow_success_counts_as_a_failure():
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_threshold=1.0)
+    breaker.record_success(2.0)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = open_breaker(reset_timeout=0)
+
+    assert breaker.allow()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow()  # the probe is still in flight
+
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = open_breaker(reset_timeout=0)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.times_opened == 2
+
+
+def test_abandoned_probe_frees_the_slot():
+    breaker = open_breaker(reset_timeout=0)
+    assert breaker.allow()
+    breaker.record_abandoned()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
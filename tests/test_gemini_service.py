@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+
+from app.api import gemini as gemini_api
+from app.services.ai_cache import AICache
+from app.services.gemini_service import GeminiService
+from app.services.gemini_stub import StubGenerativeModel
+
+
+class TrackingStub(StubGenerativeModel):
+    """Stub that records how many calls run at once and which were cancelled."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.active = 0
+        self.max_active = 0
+        self.cancelled = 0
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            return await super().generate_content_async(prompt, stream=stream)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+
+
+def make_service(model, **kwargs) -> GeminiService:
+    kwargs.setdefault("timeout", 2.0)
+    return GeminiService(model=model, cache=AICache(), hedge_after=0, **kwargs)
+
+
+def test_calls_are_bounded_by_max_concurrency():
+    async def main():
+        model = TrackingStub(latency=0.02)
+        service = make_service(model, max_concurrency=3)
+
+        results = await asyncio.gather(*(service.generate(f'"draft {i}"') for i in range(12)))
+
+        assert results == [f"draft {i}" for i in range(12)]
+        assert model.calls == 12
+        assert model.max_active == 3
+
+    asyncio.run(main())
+
+
+def test_timeout_falls_back_to_the_original_text():
+    async def main():
+        model = TrackingStub(latency=1.0)
+        service = make_service(model, timeout=0.05)
+
+        assert await service.refine_post_content("Meet at the library at 5", "EVENT") == "Meet at the library at 5"
+        assert service.metrics.counters["timeouts"] == 1
+        assert model.cancelled == 1  # the upstream call doesn't outlive the timeout
+
+    asyncio.run(main())
+
+
+def test_model_error_falls_back_and_is_not_cached():
+    async def main():
+        model = TrackingStub(latency=0, fail=RuntimeError("quota exceeded"))
+        service = make_service(model)
+
+        assert await service.refine_post_content("Selling a desk lamp", "MARKETPLACE") == "Selling a desk lamp"
+        assert service.metrics.counters["errors"] == 1
+
+        # A fallback is never cached, so the next request asks the model again
+        model.fail = None
+        assert await service.refine_post_content("Selling a desk lamp", "MARKETPLACE") != ""
+        assert model.calls == 2
+
+    asyncio.run(main())
+
+
+class FakeRequest:
+    """Just enough of a Request for run_cancellable."""
+
+    def __init__(self, disconnect_after: int):
+        self.polls = 0
+        self.disconnect_after = disconnect_after
+
+    async def is_disconnected(self) -> bool:
+        self.polls += 1
+        return self.polls >= self.disconnect_after
+
+
+def test_run_cancellable_cancels_the_upstream_call_on_disconnect(monkeypatch):
+    monkeypatch.setattr(gemini_api, "DISCONNECT_POLL_INTERVAL", 0.01)
+
+    async def main():
+        model = TrackingStub(latency=5.0)
+        service = make_service(model, timeout=10.0)
+
+        with pytest.raises(gemini_api.ClientDisconnected):
+            await gemini_api.run_cancellable(
+                FakeRequest(disconnect_after=2),
+                service.refine_post_content("Anyone up for chess tonight?", "CASUAL"),
+            )
+        # Cancellation reaches the model through the coalesced call and the
+        # timeout wrapper, a few loop iterations later
+        for _ in range(100):
+            if not model.active:
+                break
+            await asyncio.sleep(0.001)
+
+        assert model.cancelled == 1
+        assert model.active == 0
+        # The client leaving says nothing about the model's health
+        assert service.breaker.consecutive_failures == 0
+
+    asyncio.run(main())
+
+
+def test_run_cancellable_returns_the_result_while_connected(monkeypatch):
+    monkeypatch.setattr(gemini_api, "DISCONNECT_POLL_INTERVAL", 0.01)
+
+    async def main():
+        service = make_service(TrackingStub(latency=0.05))
+        refined = await gemini_api.run_cancellable(
+            FakeRequest(disconnect_after=10**6),
+            service.refine_post_content("Chess club meets Fridays", "CLUB"),
+        )
+        assert refined == "Chess club meets Fridays"
+
+    asyncio.run(main())
+
+
+class SlowFirstStub(StubGenerativeModel):
+    """The first call hangs; later ones answer at once."""
+    slow_cancelled = False
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        if self.calls == 0:
+            self.calls += 1
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                self.slow_cancelled = True
+                raise
+        return await super().generate_content_async(prompt, stream=stream)
+
+
+def test_slow_call_is_hedged_and_the_loser_cancelled():
+    async def main():
+        model = SlowFirstStub(latency=0)
+        service = GeminiService(model=model, cache=AICache(), timeout=2.0, hedge_after=0.02)
+
+        assert await service.generate('"hedge me"') == "hedge me"
+        assert model.calls == 2
+        assert service.metrics.counters["hedges"] == 1
+        assert service.metrics.counters["hedge_wins"] == 1
+        await asyncio.sleep(0)
+        assert model.slow_cancelled
+
+    asyncio.run(main())
+
+
+def test_open_circuit_skips_the_model():
+    async def main():
+        model = TrackingStub(latency=0, fail=RuntimeError("upstream down"))
+        service = make_service(model)
+        threshold = service.breaker.failure_threshold
+
+        for i in range(threshold + 3):
+            assert await service.generate(f'"try {i}"') is None
+
+        assert model.calls == threshold
+        assert service.metrics.counters["short_circuited"] == 3
+
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.crud.notification import get_notification_crud
+from app.models.notification import FanoutStatus, Notification, NotificationFanout, NotificationType
+from app.services.notification_dispatcher import NotificationDispatcher
+
+from .db import make_community, make_user, rollback_session
+
+
+async def start_fanout(db, community, actor) -> NotificationFanout:
+    job = await get_notification_crud().enqueue_fanout(
+        db,
+        community_id=community.id,
+        actor_id=actor.id,
+        type=NotificationType.NEW_POST,
+        message="New post in your community",
+    )
+    await db.commit()
+    return job
+
+
+def test_fanout_notifies_members_in_chunks(postgres_url):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            actor = await make_user(db)
+            readers = [await make_user(db) for _ in range(3)]
+            muted = await make_user(db)
+            community = await make_community(db, actor, members=[actor, *readers, muted], muted=[muted])
+            job = await start_fanout(db, community, actor)
+
+            dispatcher = NotificationDispatcher(session_factory=lambda: db, fanout_chunk_size=2)
+            notified = [await dispatcher.advance_fanout() for _ in range(4)]
+            assert sum(notified) == 3
+            assert notified[-1] == 0  # nothing left to claim
+
+            job = await db.get(NotificationFanout, job.id)
+            assert job.status == FanoutStatus.DONE
+            assert (job.total_members, job.processed, job.notified) == (5, 5, 3)
+
+            result = await db.execute(
+                select(Notification.user_id).filter(Notification.community_id == community.id)
+            )
+            assert set(result.scalars()) == {u.id for u in readers}
+
+    asyncio.run(main())
+
+
+def test_failed_chunks_are_counted_until_the_job_fails(postgres_url, monkeypatch):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            actor = await make_user(db)
+            community = await make_community(db, actor, members=[await make_user(db)])
+            job = await start_fanout(db, community, actor)
+
+            async def broken_chunk(*args, **kwargs):
+                raise RuntimeError("chunk failed")
+
+            monkeypatch.setattr(type(get_notification_crud()), "fan_out_chunk", broken_chunk)
+            dispatcher = NotificationDispatcher(session_factory=lambda: db, max_attempts=2)
+
+            assert await dispatcher.advance_fanout() == 0
+            job = await db.get(NotificationFanout, job.id, populate_existing=True)
+            assert (job.status, job.attempts, job.last_error) == (FanoutStatus.PENDING, 1, "chunk failed")
+
+            assert await dispatcher.advance_fanout() == 0
+            job = await db.get(NotificationFanout, job.id, populate_existing=True)
+            assert (job.status, job.attempts) == (FanoutStatus.FAILED, 2)
+
+            # A failed job is no longer claimed
+            assert await dispatcher.advance_fanout() == 0
+            job = await db.get(NotificationFanout, job.id, populate_existing=True)
+            assert job.attempts == 2
+
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.crud.notification import get_notification_crud
+from app.models.notification import Notification, NotificationOutbox, NotificationType
+from app.services.notification_dispatcher import NotificationDispatcher
+
+from .db import make_post, make_user, rollback_session
+
+
+async def count(db, model, *filters) -> int:
+    result = await db.execute(select(func.count()).select_from(model).filter(*filters))
+    return result.scalar_one()
+
+
+def test_outbox_rows_are_delivered_once(postgres_url):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            users = [await make_user(db) for _ in range(3)]
+            notification_crud = get_notification_crud()
+            for user in users:
+                await notification_crud.enqueue_notification(
+                    db, user_id=user.id, type=NotificationType.SYSTEM, message="Welcome"
+                )
+            await db.commit()
+
+            dispatcher = NotificationDispatcher(session_factory=lambda: db, batch_size=2)
+            assert await dispatcher.deliver_outbox() == 2
+            assert await dispatcher.deliver_outbox() == 1
+            assert await dispatcher.deliver_outbox() == 0
+
+            user_ids = [u.id for u in users]
+            assert await count(db, NotificationOutbox, NotificationOutbox.user_id.in_(user_ids)) == 0
+            assert await count(db, Notification, Notification.user_id.in_(user_ids)) == 3
+
+    asyncio.run(main())
+
+
+def test_a_bad_row_does_not_block_the_batch(postgres_url):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            author = await make_user(db)
+            reader = await make_user(db)
+            post = await make_post(db, author)
+
+            notification_crud = get_notification_crud()
+            await notification_crud.enqueue_notification(
+                db, user_id=reader.id, type=NotificationType.SYSTEM, message="Good"
+            )
+            # The post is gone by the time this is delivered
+            bad = await notification_crud.enqueue_notification(
+                db, user_id=author.id, type=NotificationType.UPVOTE, message="Upvoted", post_id=post.id
+            )
+            await db.commit()
+            await db.delete(post)
+            await db.commit()
+
+            dispatcher = NotificationDispatcher(session_factory=lambda: db, max_attempts=5)
+            assert await dispatcher.deliver_outbox() == 1
+
+            # The dispatcher closed the session, so read the row back
+            parked = await db.get(NotificationOutbox, bad.id)
+            assert parked.attempts == 1
+            assert parked.last_error
+            assert await count(db, Notification, Notification.user_id == reader.id) == 1
+
+    asyncio.run(main())
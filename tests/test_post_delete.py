@@ -0,0 +1,40 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.crud.notification import get_notification_crud
+from app.crud.post import get_post_crud
+from app.models.comment import Comment
+from app.models.notification import Notification, NotificationType
+
+from .db import make_post, make_user, rollback_session
+
+
+def test_deleting_a_post_removes_its_notifications(postgres_url):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            author = await make_user(db)
+            reader = await make_user(db)
+            post = await make_post(db, author)
+            comment = Comment(content="Nice one", post_id=post.id, author_id=reader.id)
+            db.add(comment)
+            await db.flush()
+
+            notification_crud = get_notification_crud()
+            await notification_crud.create_notification(
+                db, user_id=author.id, type=NotificationType.REPLY,
+                message="New comment", post_id=post.id, comment_id=comment.id,
+            )
+            await notification_crud.create_notification(
+                db, user_id=reader.id, type=NotificationType.NEW_POST,
+                message="New post", post_id=post.id,
+            )
+
+            assert await get_post_crud().remove(db, id=post.id) is not None
+
+            remaining = await db.execute(
+                select(func.count()).select_from(Notification).filter(Notification.post_id == post.id)
+            )
+            assert remaining.scalar_one() == 0
+
+    asyncio.run(main())
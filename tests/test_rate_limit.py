@@ -0,0 +1,97 @@
+import asyncio
+import uuid
+
+from app.core.security import create_access_token
+from app.middleware.rate_limit import InMemoryRateLimitBackend, RateLimitMiddleware, RateLimitPolicy
+
+POLICY = RateLimitPolicy(name="default", limit=2, period=60)
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def make_middleware(policies=(POLICY,)) -> RateLimitMiddleware:
+    return RateLimitMiddleware(ok_app, policies=policies, backend=InMemoryRateLimitBackend())
+
+
+async def request(middleware, *, token: str = None, ip: str = "10.0.0.1", method: str = "GET", path: str = "/posts"):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    scope = {"type": "http", "method": method, "path": path, "headers": headers, "client": (ip, 1234)}
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, None, send)
+    return messages[0]
+
+
+def access_token(user_id: str) -> str:
+    return create_access_token({"user_id": user_id, "username": "rate_limited", "fam": str(uuid.uuid4())})
+
+
+def test_requests_over_the_limit_get_429_with_retry_after():
+    async def main():
+        middleware = make_middleware()
+        statuses = [(await request(middleware))["status"] for _ in range(3)]
+        assert statuses == [200, 200, 429]
+
+        rejected = await request(middleware)
+        headers = dict(rejected["headers"])
+        assert int(headers[b"retry-after"]) >= 1
+        assert headers[b"x-ratelimit-policy"] == b"default"
+
+    asyncio.run(main())
+
+
+def test_verified_tokens_are_limited_per_user_across_ips():
+    async def main():
+        middleware = make_middleware()
+        token = access_token(str(uuid.uuid4()))
+
+        assert (await request(middleware, token=token, ip="10.0.0.1"))["status"] == 200
+        assert (await request(middleware, token=token, ip="10.0.0.2"))["status"] == 200
+        assert (await request(middleware, token=token, ip="10.0.0.3"))["status"] == 429
+
+    asyncio.run(main())
+
+
+def test_unverified_tokens_fall_back_to_the_client_ip():
+    # Fresh junk tokens must not each buy a full bucket
+    async def main():
+        middleware = make_middleware()
+        statuses = [
+            (await request(middleware, token=f"junk-{i}"))["status"]
+            for i in range(3)
+        ]
+        assert statuses == [200, 200, 429]
+        assert len(middleware.backend._buckets) == 1
+
+    asyncio.run(main())
+
+
+def test_ip_policy_ignores_tokens():
+    login = RateLimitPolicy(name="login", limit=1, period=60, path_prefix="/auth/login", methods=("POST",), key="ip")
+
+    async def main():
+        middleware = make_middleware((login, POLICY))
+        first = await request(middleware, token=access_token(str(uuid.uuid4())), method="POST", path="/auth/login")
+        second = await request(middleware, token=access_token(str(uuid.uuid4())), method="POST", path="/auth/login")
+        assert (first["status"], second["status"]) == (200, 429)
+
+    asyncio.run(main())
+
+
+def test_in_memory_backend_evicts_the_least_recently_used_bucket():
+    async def main():
+        backend = InMemoryRateLimitBackend(max_keys=2)
+        await backend.hit("a", POLICY)
+        await backend.hit("b", POLICY)
+        await backend.hit("a", POLICY)
+        await backend.hit("c", POLICY)
+
+        assert list(backend._buckets) == ["a", "c"]
+
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+import asyncio
+import uuid
+
+import pytest
+from starlette.requests import Request
+
+from app import database
+from app.config import settings
+from app.core.security import create_access_token
+from app.core.write_tracker import InMemoryWriteTracker
+from app.middleware import read_your_writes
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = InMemoryWriteTracker(window=settings.read_your_writes_window)
+    monkeypatch.setattr(read_your_writes, "write_tracker", tracker)
+    monkeypatch.setattr(database, "write_tracker", tracker)
+    return tracker
+
+
+def app_returning(status: int):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+def scope_for(method: str, token: str = None, cookie: str = None) -> dict:
+    headers = []
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    if cookie:
+        headers.append((b"cookie", cookie.encode()))
+    return {"type": "http", "method": method, "path": "/posts", "headers": headers, "query_string": b""}
+
+
+async def write(token: str = None, status: int = 201) -> dict:
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await ReadYourWritesMiddleware(app_returning(status))(scope_for("POST", token), None, send)
+    return dict(messages[0]["headers"])
+
+
+def access_token(user_id: str) -> str:
+    return create_access_token({"user_id": user_id, "username": "writer", "fam": str(uuid.uuid4())})
+
+
+def test_a_users_write_keeps_all_their_reads_on_the_primary(tracker):
+    async def main():
+        user_id = str(uuid.uuid4())
+        headers = await write(access_token(user_id))
+        assert b"set-cookie" not in headers
+
+        # A second login (another device) is sticky too, without any cookie
+        assert await database.wrote_recently(Request(scope_for("GET", access_token(user_id))))
+        assert not await database.wrote_recently(Request(scope_for("GET", access_token(str(uuid.uuid4())))))
+
+    asyncio.run(main())
+
+
+def test_failed_writes_are_not_marked(tracker):
+    async def main():
+        user_id = str(uuid.uuid4())
+        await write(access_token(user_id), status=422)
+        assert not await tracker.wrote_recently(user_id)
+
+    asyncio.run(main())
+
+
+def test_anonymous_clients_fall_back_to_the_cookie(tracker):
+    async def main():
+        headers = await write()
+        cookie = headers[b"set-cookie"].decode().split(";")[0]
+        assert cookie.startswith(settings.read_your_writes_cookie + "=")
+
+        assert await database.wrote_recently(Request(scope_for("GET", cookie=cookie)))
+        assert not await database.wrote_recently(Request(scope_for("GET")))
+
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", fn) for _ in range(5)))
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.stats() == {"in_flight": 0, "executed": 1, "coalesced": 4}
+
+    asyncio.run(main())
+
+
+def test_every_caller_gets_the_error_and_it_is_not_cached():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(*(flight.do("key", fn) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert calls == 1
+
+        with pytest.raises(ValueError):
+            await flight.do("key", fn)
+        assert calls == 2
+
+    asyncio.run(main())
+
+
+def test_cancelled_caller_detaches_without_cancelling_the_others():
+    async def main():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return "result"
+
+        first = asyncio.create_task(flight.do("key", fn))
+        second = asyncio.create_task(flight.do("key", fn))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "result"
+        assert first.cancelled()
+
+    asyncio.run(main())
+
+
+def test_last_caller_leaving_cancels_the_shared_call():
+    async def main():
+        flight = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fn():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(flight.do("key", fn))
+        await started.wait()
+        caller.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert len(flight) == 0
+
+    asyncio.run(main())
+
+
+def test_caller_arriving_after_the_last_one_left_starts_a_fresh_call():
+    # A client that disconnects and retries straight away must not join
+    # the call being torn down and get its CancelledError
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        first = asyncio.create_task(flight.do("key", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)  # first has left; its call is still being cancelled
+
+        assert await flight.do("key", fn) == 2
+        assert first.cancelled()
+
+    asyncio.run(main())
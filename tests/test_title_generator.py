@@ -0,0 +1,30 @@
+import pytest
+
+from app.services.title_generator import DEFAULT_TITLE, DEFAULT_TITLES, TitleGenerator
+from app.models.enums import PostType
+
+
+@pytest.fixture
+def generator():
+    return TitleGenerator()
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "   ",
+    " ".join(["-"] * 40),
+    "... !!! ??? ,,, ;;;",
+    "🎉🎉🎉",
+])
+def test_content_without_words_gets_the_type_default(generator, content):
+    assert generator.generate(content, "EVENT") == DEFAULT_TITLES[PostType.EVENT]
+
+
+def test_unknown_type_without_words_gets_the_generic_default(generator):
+    assert generator.generate("- - - -", "something else") == DEFAULT_TITLE
+
+
+def test_title_from_content(generator):
+    title = generator.generate("Selling my barely used laptop, great condition.", "MARKETPLACE")
+    assert title.startswith("For Sale: ")
+    assert len(title) <= generator.max_length
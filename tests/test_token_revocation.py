@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.errors import UnauthorizedError
+from app.core.revocation import revocation_list
+from app.core.security import (
+    build_token_data,
+    create_access_token,
+    create_refresh_token,
+    token_cache,
+    verify_token,
+)
+from app.models.token import RevocationScope, RevokedToken
+from app.services.auth import AuthService
+from app.services.token_revocation import SYNC_OVERLAP, TokenRevocationSync
+
+from .db import make_user, rollback_session
+
+
+def test_revoked_jti_is_rejected_on_a_cache_hit():
+    token = create_access_token({"user_id": str(uuid.uuid4()), "username": "cached", "fam": str(uuid.uuid4())})
+    payload = verify_token(token)
+    assert payload is not None
+    assert token_cache.get(hashlib.sha256(token.encode()).digest()) is not None
+
+    revocation_list.add_token(payload["jti"], payload["exp"])
+    assert verify_token(token) is None
+
+
+def test_reusing_a_rotated_refresh_token_revokes_the_family(postgres_url):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            user = await make_user(db)
+            first_refresh = create_refresh_token(build_token_data(user))
+
+            rotated = await AuthService.rotate_refresh_token(db, first_refresh)
+
+            with pytest.raises(UnauthorizedError):
+                await AuthService.rotate_refresh_token(db, first_refresh)
+
+            # Every token from the login is now dead, including the fresh pair
+            with pytest.raises(UnauthorizedError):
+                await AuthService.rotate_refresh_token(db, rotated["refresh_token"])
+            assert verify_token(rotated["access_token"]) is None
+
+    asyncio.run(main())
+
+
+def test_sync_picks_up_rows_committed_out_of_order(postgres_url):
+    async def main():
+        async with rollback_session(postgres_url) as db:
+            expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+
+            def revoked(revoked_at=None) -> RevokedToken:
+                row = RevokedToken(jti=uuid.uuid4().hex, scope=RevocationScope.TOKEN.value, expires_at=expires_at)
+                if revoked_at is not None:
+                    row.revoked_at = revoked_at
+                db.add(row)
+                return row
+
+            sync = TokenRevocationSync(session_factory=lambda: db)
+            first = revoked()
+            await db.commit()
+            await sync.run_once()
+            assert revocation_list.is_revoked(first.jti)
+            cursor = sync._last_sync
+
+            # Inserted before the cursor but committed after the last sync
+            late = revoked(revoked_at=cursor - SYNC_OVERLAP / 2)
+            await db.commit()
+            assert not revocation_list.is_revoked(late.jti)
+
+            await sync.run_once()
+            assert revocation_list.is_revoked(late.jti)
+            assert sync._last_sync == cursor
+
+    asyncio.run(main())